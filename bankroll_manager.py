@@ -1,5 +1,6 @@
 """Bankroll management and bet sizing recommendations."""
 
+import math
 from typing import Dict, Tuple
 from statistics import CardCounting
 
@@ -18,12 +19,13 @@ class BankrollManager:
         # Recalculate base unit (but don't go below original)
         self.base_unit = max(self.initial_bankroll / 100, self.current_bankroll / 100)
     
-    def get_kelly_bet(self, advantage: float, bankroll: float = None) -> float:
+    def get_kelly_bet(self, advantage: float, bankroll: float = None, variance: float = 1.26) -> float:
         """Calculate optimal bet using Kelly Criterion.
         
         Args:
             advantage: Player advantage as decimal (e.g., 0.01 = 1%)
             bankroll: Current bankroll (defaults to current_bankroll)
+            variance: Variance of a one-unit round (~1.26 for blackjack overall)
         
         Returns:
             Optimal bet size
@@ -36,8 +38,6 @@ class BankrollManager:
         
         # Kelly formula: f = (bp - q) / b
         # Simplified for blackjack: f = advantage / variance
-        # Using variance of ~1.26 for blackjack
-        variance = 1.26
         kelly_fraction = advantage / variance
         
         # Conservative: use 1/4 Kelly to reduce risk
@@ -52,11 +52,14 @@ class BankrollManager:
         Args:
             true_count: Current true count
             base_bet: Base betting unit
-            card_counter: Optional card counter for advanced calculations
+            card_counter: Optional card counter; with count_stats, the measured best 1-10 ramp is used
         
         Returns:
             Recommended bet size
         """
+        if card_counter is not None and card_counter.count_stats is not None:
+            return base_bet * card_counter.count_stats.bet_units(true_count, 10)
+
         if true_count <= 0:
             return base_bet  # Bet minimum when count is negative or neutral
         
@@ -85,16 +88,19 @@ class BankrollManager:
         """
         return max(self.base_unit, self.current_bankroll * (percentage / 100))
     
-    def calculate_risk_of_ruin(self, bet_size: float, win_rate: float = 0.48, 
-                              rtp: float = 0.995) -> float:
+    def calculate_risk_of_ruin(self, bet_size: float, win_rate: float = 0.48,
+                              rtp: float = 0.995, variance: float = 1.26) -> float:
         """Calculate risk of ruin (probability of losing entire bankroll).
         
-        Simplified calculation.
+        Closed-form estimate for flat bets of bet_size over unlimited play:
+        RoR = exp(-2 * advantage * bankroll / (variance * bet_size)). For a
+        bet ramp, percentile bands and time horizons, use bankroll_simulator.
         
         Args:
             bet_size: Size of each bet
-            win_rate: Win rate (default 48% for basic strategy)
-            rtp: Return to player (default 99.5%)
+            win_rate: Win rate (default 48% for basic strategy; not used by the estimate)
+            rtp: Return to player as a fraction (default 0.995, i.e. 99.5%)
+            variance: Variance of a one-unit round (~1.26 for blackjack overall)
         
         Returns:
             Risk of ruin as percentage
@@ -102,20 +108,12 @@ class BankrollManager:
         if bet_size >= self.current_bankroll:
             return 100.0  # Betting entire bankroll = 100% risk
         
-        # Simplified risk of ruin calculation
-        # ROR ≈ ((1 - advantage) / (1 + advantage)) ^ (bankroll / bet_size)
-        advantage = (rtp - 100) / 100  # Convert to decimal
-        
-        if advantage >= 0:
-            return 0.0  # Positive expectation = no risk of ruin
+        advantage = rtp - 1  # e.g. 0.995 -> -0.5%
+        if advantage <= 0:
+            return 100.0  # Without an edge, unlimited play goes broke eventually
         
-        try:
-            ratio = (1 - abs(advantage)) / (1 + abs(advantage))
-            exponent = self.current_bankroll / bet_size
-            ror = (ratio ** exponent) * 100
-            return min(100.0, max(0.0, ror))
-        except:
-            return 50.0  # Default if calculation fails
+        exponent = 2 * advantage * (self.current_bankroll / bet_size) / variance
+        return min(100.0, max(0.0, math.exp(-exponent) * 100))
     
     def get_bet_recommendation(self, true_count: float, base_bet: float,
                                card_counter: CardCounting = None) -> Dict[str, any]:
@@ -126,10 +124,15 @@ class BankrollManager:
         """
         count_bet = self.get_count_based_bet(true_count, base_bet, card_counter)
         
-        # Calculate advantage from true count
-        # Rough estimate: +1 TC ≈ +0.5% advantage
-        advantage = true_count * 0.005
-        kelly_bet = self.get_kelly_bet(advantage)
+        # Calculate advantage from true count: measured when the counter has
+        # count_stats, otherwise the rough estimate +1 TC ≈ +0.5% advantage
+        if card_counter is not None and card_counter.count_stats is not None:
+            advantage = card_counter.count_stats.advantage(true_count)
+            variance = card_counter.count_stats.variance_at(true_count)
+        else:
+            advantage = true_count * 0.005
+            variance = 1.26
+        kelly_bet = self.get_kelly_bet(advantage, variance=variance)
         
         # Recommended bet is minimum of count-based and Kelly
         recommended_bet = min(count_bet, kelly_bet)
@@ -137,8 +140,8 @@ class BankrollManager:
         # Ensure bet doesn't exceed bankroll
         recommended_bet = min(recommended_bet, self.current_bankroll)
         
-        # Calculate risk metrics
-        risk_of_ruin = self.calculate_risk_of_ruin(recommended_bet)
+        # Calculate risk metrics: ruin if this bet were kept up at this edge
+        risk_of_ruin = self.calculate_risk_of_ruin(recommended_bet, rtp=1 + advantage, variance=variance)
         
         return {
             'recommended_bet': recommended_bet,
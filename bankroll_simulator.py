@@ -0,0 +1,288 @@
+"""Monte Carlo risk of ruin and bankroll trajectories for a bet ramp.
+
+Each hand's result comes from the measured round outcomes in a count table
+(count_tables): a true count drawn by how often it comes up, then a result
+drawn from that count's outcome histogram, times the ramp's bet at that
+count. Hands are treated as independent, as in the usual risk-of-ruin
+formulas.
+
+Drawing 10^10 hands one at a time would take far too long. Instead the
+per-hand distribution is convolved, by FFT, into the exact distribution of
+a block of BLOCK_HANDS hands, and every trajectory advances one block per
+NumPy step. A path that ends a block above zero may still have dipped below
+it on the way. The Brownian-bridge chance of that is added, so ruin isn't
+undercounted by only looking at block ends:
+
+    python bankroll_simulator.py --decks 8 --penetration 0.75 --bankroll 400 --spread 12 \\
+        --trajectories 100000 --hands 100000
+"""
+
+import argparse
+import math
+import time
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from casino_rules import CasinoRules
+from constants import DEFAULT_NUM_DECKS
+from count_tables import (NUM_BUCKETS, NUM_OUTCOMES, OUTCOME_LIMIT, OUTCOME_SCALE, TC_LIMIT, TrueCountStats,
+                          build_count_stats, count_table_path, load_count_stats)
+from counting_systems import DEFAULT_COUNTING_SYSTEM
+
+GRID_STEP = 0.1  # Hand and block results are kept on a grid of this many units
+BLOCK_HANDS = 100  # Hands per simulation step
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def ramp_units(ramp: Dict[float, float]) -> list:
+    """Bet per true-count bucket for a ramp of {true count: units bet at that count or higher}.
+
+    Counts below the lowest entry bet one unit.
+    """
+    units = []
+    for bucket in range(NUM_BUCKETS):
+        true_count = bucket - TC_LIMIT
+        steps = [tc for tc in ramp if tc <= true_count]
+        units.append(ramp[max(steps)] if steps else 1.0)
+    return units
+
+
+def parse_ramp(text: str) -> Dict[float, float]:
+    """Ramp from text like "1:2,2:4,3:8" (two units from true count 1, four from 2, ...).
+
+    Raises:
+        ValueError: If the text isn't a ramp
+    """
+    ramp = {}
+    for entry in text.split(','):
+        true_count, _, units = entry.partition(':')
+        try:
+            ramp[float(true_count)] = float(units)
+        except ValueError:
+            raise ValueError(f"expected a ramp like 1:2,2:4,3:8, got {text!r}") from None
+    if any(units < 0 for units in ramp.values()):
+        raise ValueError("ramp bets can't be negative")
+    return ramp
+
+
+# --- Result distributions ---
+
+def hand_distribution(stats: TrueCountStats, units: Sequence[float]):
+    """Distribution of one hand's result in units for a bet per true-count bucket.
+
+    Each result is split between its two neighbouring GRID_STEP points so the
+    mean is exact.
+
+    Returns:
+        (probabilities, offset): probabilities[i] is the chance of winning (i + offset) * GRID_STEP units
+
+    Raises:
+        ValueError: If the count table has no outcome histogram
+    """
+    counts = np.array(stats.outcomes if stats.outcomes is not None else np.zeros((NUM_BUCKETS, NUM_OUTCOMES)))
+    rounds = counts.sum(axis=1, keepdims=True)
+    if not rounds.any():
+        raise ValueError("the count table has no outcome histogram; rebuild it with count_tables.py")
+    mass = np.array(stats.frequency)[:, None] * counts / np.maximum(rounds, 1)
+    results = (np.arange(NUM_OUTCOMES) - OUTCOME_LIMIT) / OUTCOME_SCALE
+    position = np.array(units, dtype=np.float64)[:, None] * results[None, :] / GRID_STEP
+    low = np.floor(position)
+    upper_share = position - low
+    low = low.astype(np.int64)
+    offset = int(low.min())
+    size = int(low.max()) - offset + 2
+    probabilities = (np.bincount((low - offset).ravel(), weights=(mass * (1 - upper_share)).ravel(), minlength=size)
+                     + np.bincount((low + 1 - offset).ravel(), weights=(mass * upper_share).ravel(), minlength=size))
+    return probabilities / probabilities.sum(), offset
+
+
+def block_distribution(probabilities, offset: int, hands: int, tail: float = 1e-13):
+    """Distribution of the summed result of `hands` independent hands, by FFT convolution.
+
+    Outcomes further out than `tail` in either direction are dropped.
+
+    Returns:
+        (probabilities, offset), as for hand_distribution()
+    """
+    length = hands * (len(probabilities) - 1) + 1
+    size = 1 << (length - 1).bit_length()
+    block = np.fft.irfft(np.fft.rfft(probabilities, size) ** hands, size)[:length]
+    block = np.maximum(block, 0.0)  # FFT rounding leaves tiny negative values in the far tails
+    cumulative = np.cumsum(block) / block.sum()
+    first = int(np.searchsorted(cumulative, tail))
+    last = int(np.searchsorted(cumulative, 1 - tail)) + 1
+    block = block[first:last]
+    return block / block.sum(), offset * hands + first
+
+
+def _alias_table(probabilities):
+    """Walker alias table, so one draw costs one random index and one random threshold."""
+    size = len(probabilities)
+    scaled = probabilities * size
+    threshold = np.ones(size)
+    alias = np.arange(size)
+    small = [i for i in range(size) if scaled[i] < 1]
+    large = [i for i in range(size) if scaled[i] >= 1]
+    while small and large:
+        low, high = small.pop(), large[-1]
+        threshold[low] = scaled[low]
+        alias[low] = high
+        scaled[high] -= 1 - scaled[low]
+        if scaled[high] < 1:
+            small.append(large.pop())
+    return threshold, alias
+
+
+# --- Simulation ---
+
+def simulate_bankroll(stats: TrueCountStats, units: Sequence[float], bankroll: float,
+                      num_trajectories: int = 100_000, num_hands: int = 100_000, block_hands: int = BLOCK_HANDS,
+                      num_checkpoints: int = 20, seed=None, percentiles: Sequence[float] = PERCENTILES) -> Dict:
+    """Simulate bankroll trajectories for a bet ramp.
+
+    Args:
+        stats: Count table with an outcome histogram
+        units: Bet per true-count bucket, in units of the minimum bet (e.g. ramp_units(),
+            or stats.best_ramp(spread)['units'])
+        bankroll: Starting bankroll in units; reaching zero is ruin
+        num_trajectories: Trajectories simulated side by side
+        num_hands: Hands per trajectory (rounded up to whole blocks)
+        block_hands: Hands per simulation step
+        num_checkpoints: Points in time at which percentile bands are recorded
+        seed: Random seed
+        percentiles: Percentile bands to record
+
+    Returns:
+        dict: 'ev' and 'sd' per hand in units, 'n0' (hands for the expected win to equal one
+        standard deviation; None without an edge), 'formula_ror' (unlimited-time risk of ruin
+        from EV and variance alone), 'risk_of_ruin' and its 'ror_error' (standard error) over the
+        simulated hands, 'hands' (simulated), 'checkpoints' (hand numbers), 'bands' (percentile ->
+        bankroll at each checkpoint), 'ruined' (fraction ruined by each checkpoint), 'doubled'
+        (fraction that reached twice the bankroll) and 'time_to_double' (percentile -> hands, None
+        if fewer than that share of trajectories doubled)
+    """
+    if bankroll <= 0:
+        raise ValueError("bankroll must be positive")
+    hand, hand_offset = hand_distribution(stats, units)
+    values = (np.arange(len(hand)) + hand_offset) * GRID_STEP
+    ev = float(hand @ values)
+    variance = float(hand @ (values * values)) - ev * ev
+    block, block_offset = block_distribution(hand, hand_offset, block_hands)
+    threshold, alias = _alias_table(block)
+    num_blocks = max(1, math.ceil(num_hands / block_hands))
+    checkpoint_blocks = sorted({max(1, round(num_blocks * (i + 1) / num_checkpoints)) for i in range(num_checkpoints)})
+    # Brownian-bridge crossing: a block from a to b > 0 dipped to zero on the way with probability
+    # exp(-2ab / block variance); beyond this exponent that chance is negligible and skipped
+    bridge_scale = 2 / (variance * block_hands) if variance > 0 else math.inf
+    bridge_limit = 40.0
+
+    rng = np.random.default_rng(seed)
+    balance = np.full(num_trajectories, float(bankroll))
+    alive = np.ones(num_trajectories, dtype=bool)
+    doubled_at = np.full(num_trajectories, np.inf)
+    bands = {p: [] for p in percentiles}
+    ruined = []
+    for step in range(1, num_blocks + 1):
+        draws = rng.integers(0, len(block), num_trajectories)
+        draws = np.where(rng.random(num_trajectories) < threshold[draws], draws, alias[draws])
+        after = balance + (draws + block_offset) * GRID_STEP
+        exponent = bridge_scale * balance * after
+        near = np.flatnonzero(alive & (after > 0) & (exponent < bridge_limit))
+        crossed = after <= 0
+        crossed[near] |= rng.random(near.size) < np.exp(-exponent[near])
+        alive &= ~crossed
+        balance = np.where(alive, after, 0.0)
+        doubled_at[alive & (balance >= 2 * bankroll) & np.isinf(doubled_at)] = step * block_hands
+        if step in checkpoint_blocks:
+            for p, value in zip(percentiles, np.percentile(balance, percentiles)):
+                bands[p].append(float(value))
+            ruined.append(1 - alive.mean())
+
+    risk = 1 - alive.mean()
+    doubled = np.sort(doubled_at)
+    time_to_double = {}
+    for p in (25, 50, 75):
+        value = doubled[min(int(math.ceil(p / 100 * num_trajectories)) - 1, num_trajectories - 1)]
+        time_to_double[p] = int(value) if np.isfinite(value) else None
+    return {
+        'ev': ev,
+        'sd': math.sqrt(max(variance, 0.0)),
+        'n0': variance / (ev * ev) if ev > 0 else None,
+        'formula_ror': math.exp(-2 * ev * bankroll / variance) if ev > 0 and variance > 0 else 1.0,
+        'risk_of_ruin': float(risk),
+        'ror_error': math.sqrt(risk * (1 - risk) / num_trajectories),
+        'hands': num_blocks * block_hands,
+        'checkpoints': [b * block_hands for b in checkpoint_blocks],
+        'bands': bands,
+        'ruined': [float(r) for r in ruined],
+        'doubled': float(np.isfinite(doubled_at).mean()),
+        'time_to_double': time_to_double,
+    }
+
+
+def format_report(report: Dict, bankroll: float) -> str:
+    n0 = f"{report['n0']:,.0f} hands" if report['n0'] is not None else "never (no edge)"
+    lines = [
+        f"EV per hand: {report['ev']:+.4f} units  SD per hand: {report['sd']:.3f} units  N0: {n0}",
+        f"Risk of ruin: {report['risk_of_ruin']:.2%} (SE {report['ror_error']:.2%}) within {report['hands']:,} hands; "
+        f"{report['formula_ror']:.2%} over unlimited play by formula",
+    ]
+    percentiles = list(report['bands'])
+    lines.append(f"{'Hands':>10}{'Ruined':>9}" + "".join(f"{f'P{p:g}':>10}" for p in percentiles))
+    for i, hands in enumerate(report['checkpoints']):
+        lines.append(f"{hands:>10,}{report['ruined'][i]:>9.2%}"
+                     + "".join(f"{report['bands'][p][i]:>10.0f}" for p in percentiles))
+    doubling = ", ".join(f"P{p}: {f'{hands:,} hands' if hands is not None else 'not reached'}"
+                         for p, hands in report['time_to_double'].items())
+    lines.append(f"Doubled to {2 * bankroll:g} units: {report['doubled']:.2%} of trajectories; time to double {doubling}")
+    return "\n".join(lines)
+
+
+# --- Command line ---
+
+def main(argv=None):
+    from batch_simulator import add_rules_arguments, build_rules
+    parser = argparse.ArgumentParser(description="Simulate risk of ruin and bankroll trajectories for a bet ramp.")
+    parser.add_argument("--bankroll", type=float, default=400, help="Starting bankroll in units (minimum bets)")
+    parser.add_argument("--spread", type=float, default=12, help="Use the best ramp within this spread")
+    parser.add_argument("--ramp", default=None, help='Bet ramp instead, e.g. "1:2,2:4,3:8,4:12" '
+                        "(units from each true count up; 1 unit below the first)")
+    parser.add_argument("--trajectories", type=int, default=100_000, help="Trajectories to simulate")
+    parser.add_argument("--hands", type=int, default=100_000, help="Hands per trajectory")
+    parser.add_argument("--checkpoints", type=int, default=20, help="Rows in the percentile table")
+    parser.add_argument("--rounds", type=int, default=None,
+                        help="Build the count table from this many simulated rounds if there isn't one yet")
+    parser.add_argument("--system", default=DEFAULT_COUNTING_SYSTEM, help="Counting system")
+    parser.add_argument("--decks", type=int, default=DEFAULT_NUM_DECKS, help="Number of decks in the shoe")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    add_rules_arguments(parser, default_penetration=0.75)
+    args = parser.parse_args(argv)
+
+    try:
+        ramp = parse_ramp(args.ramp) if args.ramp else None
+    except ValueError as error:
+        raise SystemExit(str(error))
+    rules = build_rules(args)
+    stats = load_count_stats(args.system, rules, args.decks)
+    if stats is None:
+        if args.rounds is None:
+            raise SystemExit(f"No count table at {count_table_path(args.system, rules, args.decks)}; "
+                             "build one with count_tables.py or pass --rounds")
+        stats = build_count_stats(args.system, args.rounds, rules, args.decks)
+    try:
+        units = ramp_units(ramp) if ramp else stats.best_ramp(args.spread)['units']
+        start = time.perf_counter()
+        report = simulate_bankroll(stats, units, args.bankroll, args.trajectories, args.hands,
+                                   num_checkpoints=args.checkpoints, seed=args.seed)
+    except ValueError as error:
+        raise SystemExit(str(error))
+    print(f"{stats.system_name}, {stats.rounds:,}-round count table; bets by true count: "
+          + " ".join(f"{tc:+d}:{units[tc + TC_LIMIT]:g}" for tc in range(-2, 7)))
+    print(format_report(report, args.bankroll))
+    print(f"Elapsed: {time.perf_counter() - start:.1f}s for {args.trajectories:,} trajectories x "
+          f"{report['hands']:,} hands")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""Command-line batch simulator.
+
+Plays rounds headlessly through TableEngine and reports expected value,
+standard error, throughput and final balances. Example:
+
+    python batch_simulator.py --rounds 1000000 --players 3 --h17 --betting Flat
+"""
+
+import argparse
+import math
+import random
+import time
+from typing import List, Optional
+
+from blackjack_strategy import BASIC_STRATEGY, PLAYING_STRATEGY_NAMES, RULE_AWARE_STRATEGY, BETTING_STRATEGIES
+from casino_rules import CasinoRules
+from session_stats import SessionStatistics
+from strategy_generator import generate_strategy
+from table_engine import TableEngine, Seat
+from constants import DEFAULT_NUM_DECKS
+
+DEFAULT_SIM_BALANCE = 1e12  # Large enough that flat betting never runs out
+
+
+class SimulationResult:
+    """Aggregated outcome of a batch simulation."""
+
+    def __init__(self):
+        self.rounds = 0
+        self.hands = 0  # Initial hands (one per seat per round)
+        self.total_net = 0.0
+        self.total_net_sq = 0.0
+        self.total_initial_bet = 0.0
+        self.elapsed = 0.0
+        self.stopped_early = False
+        self.seats = []
+        self.session_stats = SessionStatistics(keep_rounds=False)
+
+    def record_round(self, seats: List[Seat]):
+        self.rounds += 1
+        round_net = 0.0
+        for seat in seats:
+            net = seat.round_net
+            self.hands += 1
+            self.total_net += net
+            self.total_net_sq += net * net
+            self.total_initial_bet += seat.last_bet_amount
+            round_net += net
+        self.session_stats.record_round(self.rounds, [], round_net)
+
+    def merge(self, other: 'SimulationResult'):
+        """Add another result for the same table setup (e.g. a simulation shard) into this one.
+
+        Seats are matched by position; their balances combine as
+        starting balance plus the P/L of every shard.
+        """
+        self.rounds += other.rounds
+        self.hands += other.hands
+        self.total_net += other.total_net
+        self.total_net_sq += other.total_net_sq
+        self.total_initial_bet += other.total_initial_bet
+        self.elapsed += other.elapsed
+        self.stopped_early = self.stopped_early or other.stopped_early
+        self.session_stats.merge(other.session_stats)
+        if not self.seats:
+            self.seats = other.seats
+            return
+        for seat, other_seat in zip(self.seats, other.seats):
+            seat.balance += other_seat.balance - other_seat.starting_balance
+            seat.stats.merge(other_seat.stats)
+
+    def get_ev_per_hand(self) -> float:
+        """Mean net result per initial hand, in dollars."""
+        return self.total_net / self.hands if self.hands else 0.0
+
+    def get_standard_error(self) -> float:
+        """Standard error of get_ev_per_hand()."""
+        if self.hands < 2:
+            return 0.0
+        mean = self.total_net / self.hands
+        variance = (self.total_net_sq - self.hands * mean * mean) / (self.hands - 1)
+        return math.sqrt(max(variance, 0.0) / self.hands)
+
+    def get_ev_percent(self) -> float:
+        """Net result as a percentage of initial bets."""
+        if self.total_initial_bet == 0:
+            return 0.0
+        return self.total_net / self.total_initial_bet * 100
+
+    def get_rounds_per_second(self) -> float:
+        return self.rounds / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def build_rules(args) -> CasinoRules:
+    """Create CasinoRules from parsed command-line arguments."""
+    rules = CasinoRules()
+    rules.dealer_hits_soft_17 = args.h17
+    rules.dealer_peeks_for_blackjack = not args.no_peek
+    rules.surrender_available = not args.no_surrender
+    rules.double_after_split = not args.no_das
+    rules.resplit_aces = args.resplit_aces
+    rules.blackjack_pays_3to2 = not args.six_five
+    rules.max_splits = args.max_splits
+    rules.penetration = getattr(args, "penetration", None)
+    rules.cut_card_jitter = getattr(args, "cut_card_jitter", 0)
+    rules.continuous_shuffle = getattr(args, "csm", False)
+    return rules
+
+
+def add_rules_arguments(parser, penetration: bool = True, default_penetration: Optional[float] = None):
+    """Add the casino-rule options read by build_rules to an argparse parser.
+
+    Args:
+        parser: ArgumentParser to extend
+        penetration: Also add a single-valued --penetration option
+        default_penetration: Default for --penetration; None cuts one deck from the end,
+            as CasinoRules does
+    """
+    rules = parser.add_argument_group("casino rules")
+    rules.add_argument("--h17", action="store_true", help="Dealer hits soft 17")
+    rules.add_argument("--no-peek", action="store_true", help="Dealer doesn't peek for blackjack")
+    rules.add_argument("--no-surrender", action="store_true", help="Surrender not available")
+    rules.add_argument("--no-das", action="store_true", help="No double after split")
+    rules.add_argument("--resplit-aces", action="store_true", help="Allow resplitting aces")
+    rules.add_argument("--six-five", action="store_true", help="Blackjack pays 6:5")
+    rules.add_argument("--max-splits", type=int, default=4, help="Maximum number of splits per hand")
+    if penetration:
+        default = ("cut one deck from the end" if default_penetration is None
+                   else f"{default_penetration:g}")
+        rules.add_argument("--penetration", type=float, default=default_penetration, metavar="FRACTION",
+                           help=f"Fraction of the shoe dealt before the cut card (default: {default})")
+    return rules
+
+
+def run_simulation(num_rounds: int, num_players: int = 1, rules: Optional[CasinoRules] = None,
+                   num_decks: int = DEFAULT_NUM_DECKS, playing_strategy: str = "Basic",
+                   betting_strategy: str = "Flat", default_bet: float = 10,
+                   starting_balance: float = DEFAULT_SIM_BALANCE, skill_level: float = 1.0,
+                   seed=None) -> SimulationResult:
+    """Play num_rounds rounds headlessly and aggregate the results.
+
+    Stops early if any seat can no longer cover its bet.
+    """
+    seats = [Seat(i, starting_balance, default_bet, playing_strategy, betting_strategy, skill_level,
+                  track_history=False)
+             for i in range(num_players)]
+    engine = TableEngine(seats=seats, rules=rules, num_decks=num_decks, rng=random.Random(seed))
+    result = SimulationResult()
+    result.seats = seats
+
+    start = time.perf_counter()
+    for _ in range(num_rounds):
+        if not engine.play_round():
+            result.stopped_early = True
+            break
+        result.record_round(seats)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def format_report(result: SimulationResult) -> str:
+    lines = [
+        f"Rounds played:   {result.rounds:,}" + (" (stopped early: insufficient funds)" if result.stopped_early else ""),
+        f"Hands played:    {result.hands:,}",
+        f"EV per hand:     ${result.get_ev_per_hand():+.4f} (SE ${result.get_standard_error():.4f})",
+        f"EV per $ bet:    {result.get_ev_percent():+.3f}%",
+        f"Elapsed:         {result.elapsed:.2f}s ({result.get_rounds_per_second():,.0f} rounds/sec)",
+        "Final balances:",
+    ]
+    for seat in result.seats:
+        profit_loss = seat.balance - seat.starting_balance
+        lines.append(f"  Player {seat.player_index + 1}: ${seat.balance:,.2f} (P/L ${profit_loss:+,.2f})")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run headless blackjack simulations.")
+    parser.add_argument("--rounds", type=int, default=100000, help="Number of rounds to play")
+    parser.add_argument("--players", type=int, default=1, choices=range(1, 8), metavar="1-7",
+                        help="Number of players at the table")
+    parser.add_argument("--decks", type=int, default=DEFAULT_NUM_DECKS, help="Number of decks in the shoe")
+    parser.add_argument("--strategy", default="Basic", choices=PLAYING_STRATEGY_NAMES,
+                        help=f"Playing strategy; {RULE_AWARE_STRATEGY} is solved for the chosen rules and decks")
+    parser.add_argument("--betting", default="Flat", choices=list(BETTING_STRATEGIES.keys()),
+                        help="Betting strategy")
+    parser.add_argument("--bet", type=float, default=10, help="Default bet per player")
+    parser.add_argument("--balance", type=float, default=DEFAULT_SIM_BALANCE, help="Starting balance per player")
+    parser.add_argument("--skill", type=float, default=1.0, help="Skill level (0.0-1.0) for autoplay mistakes")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes; more than one runs a sharded parallel simulation")
+    parser.add_argument("--shards", type=int, default=None,
+                        help="Number of shards for parallel runs (defaults to --workers)")
+    parser.add_argument("--backend", default="engine", choices=["engine", "vectorized"],
+                        help="Simulation backend; 'vectorized' plays many shoes at once with NumPy "
+                             "(one player, Basic or Rule-Aware strategy, Flat betting)")
+    parser.add_argument("--shoes", type=int, default=10000,
+                        help="Shoes played in parallel by the vectorized backend")
+
+    add_rules_arguments(parser, penetration=False)
+
+    shoe = parser.add_argument_group("shoe")
+    shoe.add_argument("--penetration", type=float, nargs="+", default=[None], metavar="FRACTION",
+                      help="Fraction of the shoe dealt before the cut card (default: cut one deck from the end); "
+                           "several values run a penetration sweep")
+    shoe.add_argument("--cut-card-jitter", type=int, default=0, metavar="CARDS",
+                      help="Random +/- variation in cut-card placement")
+    shoe.add_argument("--csm", action="store_true", help="Continuous shuffling machine")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    penetrations = args.penetration
+    for i, penetration in enumerate(penetrations):
+        args.penetration = penetration
+        if len(penetrations) > 1:
+            print(("\n" if i else "") + f"=== Penetration {penetration:.0%} ===")
+        print(format_report(_run_from_args(args)))
+
+
+def _run_from_args(args) -> SimulationResult:
+    sim_kwargs = dict(
+        num_players=args.players,
+        rules=build_rules(args),
+        num_decks=args.decks,
+        playing_strategy=args.strategy,
+        betting_strategy=args.betting,
+        default_bet=args.bet,
+        starting_balance=args.balance,
+        skill_level=args.skill
+    )
+    if args.backend == "vectorized":
+        if (args.players != 1 or args.strategy not in ("Basic", RULE_AWARE_STRATEGY) or args.betting != "Flat" or
+                args.skill != 1.0):
+            raise SystemExit("The vectorized backend supports one player with Basic or Rule-Aware strategy "
+                             "and Flat betting")
+        from vectorized_simulator import run_vectorized_simulation
+        strategy = BASIC_STRATEGY
+        if args.strategy == RULE_AWARE_STRATEGY:
+            strategy = generate_strategy(sim_kwargs["rules"], args.decks)['chart']
+        result = run_vectorized_simulation(args.rounds, num_shoes=args.shoes, num_decks=args.decks,
+                                           rules=sim_kwargs["rules"], default_bet=args.bet, strategy=strategy,
+                                           seed=args.seed, starting_balance=args.balance)
+    elif args.workers > 1 or args.shards:
+        from parallel_simulator import run_parallel_simulation
+        result = run_parallel_simulation(args.rounds, num_shards=args.shards, workers=args.workers,
+                                         seed=args.seed, **sim_kwargs)
+    else:
+        result = run_simulation(args.rounds, seed=args.seed, **sim_kwargs)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,23 @@
 # strategies.py
 
+from enum import IntEnum
+
+from hand_states import NUM_STATES, STATE_TOTAL, STATE_SOFT, STATE_PAIR_VALUE, STATE_CAN_DOUBLE
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the batch API needs it
+    np = None
+
 RECOMMENDATION_MAP = {
     'H': "Hit",
     'S': "Stand",
     'D': "Double Down",
-    'P': "Split"
+    'P': "Split",
+    'Ds': "Double Down",
+    'R': "Surrender",
+    'Rs': "Surrender",
+    'Rp': "Surrender"
 }
 
 # --- Playing Strategies ---
@@ -60,31 +73,134 @@ PLAYING_STRATEGIES = {
     "Team Play": TEAM_STRATEGY
 }
 
+# Solved per table from its CasinoRules and deck count by strategy_generator
+RULE_AWARE_STRATEGY = "Rule-Aware"
+PLAYING_STRATEGY_NAMES = tuple(PLAYING_STRATEGIES) + (RULE_AWARE_STRATEGY,)
+
+
+# --- Compiled strategy tables ---
+
+class Action(IntEnum):
+    """Action codes stored in compiled strategy tables."""
+    HIT = 0
+    STAND = 1
+    DOUBLE = 2
+    SPLIT = 3
+    SURRENDER = 4
+
+
+# Indexed by Action: recommendation strings shown to the user, and TableEngine action names
+ACTION_LABELS = ("Hit", "Stand", "Double Down", "Split", "Surrender")
+ACTION_NAMES = ("hit", "stand", "double", "split", "surrender")
+ACTION_BY_LABEL = {label: Action(code) for code, label in enumerate(ACTION_LABELS)}
+
+# Chart codes -> (action on a hand's first decision, action once doubling and surrender are off the table).
+# 'D' doubles or else hits, 'Ds' doubles or else stands; 'R', 'Rs' and 'Rp' surrender or else hit, stand or split.
+CHART_CODES = {
+    'H': (Action.HIT, Action.HIT),
+    'S': (Action.STAND, Action.STAND),
+    'D': (Action.DOUBLE, Action.HIT),
+    'Ds': (Action.DOUBLE, Action.STAND),
+    'P': (Action.SPLIT, Action.SPLIT),
+    'R': (Action.SURRENDER, Action.HIT),
+    'Rs': (Action.SURRENDER, Action.STAND),
+    'Rp': (Action.SURRENDER, Action.SPLIT),
+}
+NUM_UPCARDS = 11  # Upcard index 1 (ace) to 10; 0 unused
 
-def get_recommendation(player_hand, dealer_upcard_value, strategy_name="Basic", ignore_pairs=False):
-    strategy = PLAYING_STRATEGIES.get(strategy_name, BASIC_STRATEGY)
-    action_code = 'H'
 
-    if not ignore_pairs and len(player_hand.cards) == 2 and player_hand.cards[0][0] == player_hand.cards[1][0]:
-        pair_value = player_hand.cards[0][0]
-        if pair_value > 10: pair_value = 10
+def _chart_action(strategy, total: int, soft: bool, pair_value: int, dealer_upcard_value: int,
+                  first_decision: bool = True) -> Action:
+    """Chart lookup for one hand; pair_value is 0 when pairs are ignored.
+
+    first_decision is False once doubling and surrendering are no longer
+    possible (after a hit, or on a split hand without those options).
+    """
+    action_code = 'H'
+    hand_type = 'soft' if soft else 'hard'
+    if pair_value:
         if pair_value in strategy['pairs']:
             action_code = strategy['pairs'][pair_value].get(dealer_upcard_value, 'H')
-    else:
-        is_soft = any(val == 1 for val, _ in player_hand.cards) and player_hand.hand_value > sum(
-            c[0] for c in player_hand.cards if c[0] != 1) + 1
-        if is_soft:
-            if player_hand.hand_value in strategy['soft']:
-                action_code = strategy['soft'][player_hand.hand_value].get(dealer_upcard_value, 'H')
-        elif player_hand.hand_value in strategy['hard']:
-            action_code = strategy['hard'][player_hand.hand_value].get(dealer_upcard_value, 'H')
-
-    if player_hand.hand_value >= 21:
+    elif total in strategy[hand_type]:
+        action_code = strategy[hand_type][total].get(dealer_upcard_value, 'H')
+    elif total >= 21:
         action_code = 'S'
-    elif player_hand.hand_value <= 8:
+    elif total <= 8:
         action_code = 'H'
+    elif total > max(strategy[hand_type]):
+        action_code = 'S'  # Totals above the chart always stand
+    first_action, later_action = CHART_CODES.get(action_code, (Action.HIT, Action.HIT))
+    return first_action if first_decision else later_action
+
+
+class CompiledStrategy:
+    """A playing strategy chart compiled into dense (hand state x dealer upcard) action tables.
+
+    There is one table for each combination of "pairs can be split" and
+    "doubling and surrender are allowed", so a decision is a single lookup
+    however the rules restrict the hand.
+    """
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.tables = {(ignore_pairs, allow_double): self._compile(strategy, ignore_pairs, allow_double)
+                       for ignore_pairs in (False, True) for allow_double in (True, False)}
+        if np is not None:
+            self.table_arrays = {key: np.array(table, dtype=np.int8).ravel() for key, table in self.tables.items()}
+
+    @staticmethod
+    def _compile(strategy, ignore_pairs: bool, allow_double: bool):
+        table = []
+        for state in range(NUM_STATES):
+            pair_value = 0 if ignore_pairs else STATE_PAIR_VALUE[state]
+            first_decision = allow_double and STATE_CAN_DOUBLE[state]
+            table.append(tuple([Action.HIT] + [
+                _chart_action(strategy, STATE_TOTAL[state], STATE_SOFT[state], pair_value, upcard, first_decision)
+                for upcard in range(1, NUM_UPCARDS)]))
+        return tuple(table)
 
-    return RECOMMENDATION_MAP.get(action_code, "Hit")
+    def lookup(self, state: int, dealer_upcard_value: int, ignore_pairs: bool = False,
+               allow_double: bool = True) -> Action:
+        """Action for one hand state (see hand_states) against a dealer upcard (1 = ace).
+
+        Args:
+            ignore_pairs: Play a pair by its total, when it can't be split
+            allow_double: False when the hand can no longer double or surrender
+        """
+        return self.tables[ignore_pairs, allow_double][state][dealer_upcard_value]
+
+    def lookup_batch(self, states, dealer_upcard_values, ignore_pairs: bool = False, allow_double: bool = True):
+        """Action codes for arrays of hand states and upcards (broadcast together), as one gather.
+
+        Returns:
+            np.ndarray of int8 Action codes
+        """
+        table = self.table_arrays[ignore_pairs, allow_double]
+        return table.take(np.asarray(states) * NUM_UPCARDS + dealer_upcard_values)
+
+
+COMPILED_STRATEGIES = {name: CompiledStrategy(strategy) for name, strategy in PLAYING_STRATEGIES.items()}
+
+
+def get_compiled_strategy(strategy) -> CompiledStrategy:
+    """Compiled tables for a strategy name from PLAYING_STRATEGIES, or a CompiledStrategy passed through."""
+    if isinstance(strategy, CompiledStrategy):
+        return strategy
+    return COMPILED_STRATEGIES.get(strategy) or COMPILED_STRATEGIES["Basic"]
+
+
+def get_action(player_hand, dealer_upcard_value, strategy_name="Basic", ignore_pairs=False,
+               allow_double=True) -> Action:
+    """Strategy action code for a hand, looked up in the compiled table.
+
+    strategy_name may also be a CompiledStrategy, e.g. a generated rule-aware chart.
+    """
+    compiled = get_compiled_strategy(strategy_name)
+    return compiled.lookup(player_hand.state, dealer_upcard_value, ignore_pairs, allow_double)
+
+
+def get_recommendation(player_hand, dealer_upcard_value, strategy_name="Basic", ignore_pairs=False):
+    return ACTION_LABELS[get_action(player_hand, dealer_upcard_value, strategy_name, ignore_pairs)]
 
 
 # --- Betting Strategies ---
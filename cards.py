@@ -0,0 +1,45 @@
+"""Compact integer card encoding.
+
+A card is a small int: rank_index * 4 + suit_index, so one deck is the codes
+0-51 and a shoe or hand fits in an array('B'). Blackjack values come from a
+lookup table and display strings are only built when the GUI renders a card.
+"""
+
+from array import array
+from functools import lru_cache
+
+SUITS = ('♠', '♥', '♦', '♣')
+RED_SUITS = (1, 2)  # Hearts and diamonds
+RANKS = ('A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K')
+CARDS_PER_DECK = 52
+
+# Blackjack value of every card code (ace = 1, tens and faces = 10)
+CARD_VALUES = bytes(min(rank_index + 1, 10) for rank_index in range(len(RANKS)) for _ in SUITS)
+
+# One deck of card codes, copied to build shoes
+DECK_TEMPLATE = array('B', range(CARDS_PER_DECK))
+
+
+@lru_cache(maxsize=None)
+def shoe_template(num_decks: int) -> bytes:
+    """Immutable unshuffled shoe of num_decks decks, built once per deck count."""
+    return DECK_TEMPLATE.tobytes() * num_decks
+
+
+def make_card(rank: str, suit: str) -> int:
+    """Card code for a rank ('A'-'K') and suit symbol."""
+    return RANKS.index(rank) * 4 + SUITS.index(suit)
+
+
+def card_value(card: int) -> int:
+    """Blackjack value of a card (ace = 1)."""
+    return CARD_VALUES[card]
+
+
+def card_label(card: int) -> str:
+    """Display string for a card, e.g. 'K♥'."""
+    return RANKS[card >> 2] + SUITS[card & 3]
+
+
+def is_red(card: int) -> bool:
+    return card & 3 in RED_SUITS
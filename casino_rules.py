@@ -23,6 +23,12 @@ class CasinoRules:
         # Other rules
         self.max_splits = 4  # Maximum number of splits allowed
         
+        # Shoe rules
+        self.penetration = None  # Fraction of the shoe dealt before the cut card; None = use cut_card_decks
+        self.cut_card_decks = 1.0  # Decks left behind the cut card when penetration is None
+        self.cut_card_jitter = 0  # Random +/- cards in cut-card placement, as a dealer's cut varies
+        self.continuous_shuffle = False  # Continuous shuffling machine: discards go back in every round
+        
     def get_dealer_stand_value(self, dealer_hand_value: int, is_soft: bool) -> bool:
         """Determine if dealer should stand based on rules."""
         if dealer_hand_value >= 18:
@@ -48,6 +54,34 @@ class CasinoRules:
         # Early surrender: before dealer checks
         return True
     
+    def get_cut_card_position(self, total_cards: int, rng=None) -> int:
+        """Number of cards left behind the cut card in a freshly shuffled shoe.
+        
+        The shoe is reshuffled before the first round that starts with fewer
+        cards than this; a round in progress when the cut card comes out is
+        always finished first.
+        
+        Args:
+            total_cards: Cards in the full shoe
+            rng: Random source (with randint) for cut_card_jitter; no jitter if None
+        """
+        if self.penetration is not None:
+            behind = round(total_cards * (1 - self.penetration))
+        else:
+            behind = round(self.cut_card_decks * 52)
+        if self.cut_card_jitter and rng is not None:
+            behind += rng.randint(-self.cut_card_jitter, self.cut_card_jitter)
+        return min(max(behind, 0), total_cards)
+    
+    def get_shoe_policy(self) -> dict:
+        """Every shoe rule (cut card and shuffling), for cache keys of results that depend on them."""
+        return dict(penetration=self.penetration, cut_card_decks=self.cut_card_decks,
+                    cut_card_jitter=self.cut_card_jitter, continuous_shuffle=self.continuous_shuffle)
+    
+    def get_penetration(self, total_cards: int) -> float:
+        """Fraction of a shoe of total_cards dealt before the cut card, without jitter."""
+        return 1 - self.get_cut_card_position(total_cards) / total_cards if total_cards else 0.0
+    
     def get_insurance_payout(self) -> float:
         """Get insurance payout (typically 2:1)."""
         return 2.0
@@ -1,5 +1,7 @@
 """Constants for the Blackjack Simulator application."""
 
+import os
+
 # Color constants
 BG_COLOR = "#087830"
 DARK_GREEN = "#065c25"
@@ -16,6 +18,10 @@ DEFAULT_NUM_DECKS = 8
 BLACKJACK_PAYOUT_MULTIPLIER = 1.5
 DEFAULT_AUTOPLAY_SPEED = 250  # milliseconds
 AUTOPLAY_RESULTS_DELAY = 2000  # milliseconds
+TURBO_REFRESH_INTERVAL = 100  # milliseconds between display refreshes in turbo autoplay
+TURBO_SLICE = 20  # milliseconds of play per event-loop turn in turbo autoplay
+SPLIT_SAMPLE_PASS = 50  # milliseconds of Monte Carlo split sampling per pass while a player decides
+SPLIT_SAMPLE_LIMIT = 5000  # milliseconds of split sampling per decision
 
 # Hand status constants
 STATUS_ACTIVE = "active"
@@ -26,3 +32,11 @@ STATUS_BLACKJACK = "blackjack"
 # Dealer rules
 DEALER_STAND_VALUE = 17
 
+# Strategy generator
+STRATEGY_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".blackjack_simulator", "strategies")
+
+# True-count tables
+COUNT_TABLE_DIR = os.path.join(os.path.expanduser("~"), ".blackjack_simulator", "count_tables")
+
+# Index generator
+INDEX_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".blackjack_simulator", "index_tables")
@@ -0,0 +1,258 @@
+"""Measured player EV by true count.
+
+A count table records, for one counting system and table setup, how often
+each true-count bucket comes up, the EV and variance of a round played at
+that count, and how often each result (to a tenth of a bet) came up there.
+Tables are built by simulation (counting_benchmark) and are stored as small
+binary files that load in well under a millisecond. The bankroll and count
+displays then use measured edges and bet ramps instead of rules of thumb:
+
+    python count_tables.py --system Hi-Lo --decks 6 --h17 --penetration 0.75 --rounds 50000000
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+from casino_rules import CasinoRules
+from constants import COUNT_TABLE_DIR, DEFAULT_NUM_DECKS
+from counting_systems import DEFAULT_COUNTING_SYSTEM, get_counting_system
+
+TC_LIMIT = 15  # True counts are bucketed by floor() and clipped to +/- this
+NUM_BUCKETS = 2 * TC_LIMIT + 1
+TABLE_VERSION = 2  # Bump when the simulation changes so stale tables are rebuilt
+OUTCOME_SCALE = 10  # Round results are histogrammed in tenths of a unit bet...
+OUTCOME_LIMIT = 100  # ...clipped to +/- this many tenths
+NUM_OUTCOMES = 2 * OUTCOME_LIMIT + 1
+
+# File layout: header, system name, then frequency, EV and variance as float64 arrays, then the outcome
+# histogram as NUM_BUCKETS rows of NUM_OUTCOMES float64 round counts
+_MAGIC = b"BJTC"
+_HEADER = struct.Struct("<4sHHQ16sH")  # magic, format version, buckets, rounds, setup key, name length
+
+_loaded: Dict[str, Optional['TrueCountStats']] = {}
+
+
+def count_table_key(system, rules: CasinoRules, num_decks: int) -> str:
+    """Stable short hash of everything a count table depends on."""
+    from strategy_generator import strategy_rules
+    system = get_counting_system(system)
+    key = dict(strategy_rules(rules, num_decks), **rules.get_shoe_policy(), system=system.name,
+               tags=list(system.tags), version=TABLE_VERSION)
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class TrueCountStats:
+    """Frequency, EV and variance of a one-unit round for each true-count bucket.
+
+    outcomes, when present, counts the rounds in each bucket by result:
+    outcomes[bucket][OUTCOME_LIMIT + tenths of a unit won], so the whole
+    distribution of a round's result is known, not just its mean and variance.
+    """
+
+    def __init__(self, system_name: str, key: str, rounds: int, frequency: Sequence[float], ev: Sequence[float],
+                 variance: Sequence[float], outcomes: Optional[Sequence[Sequence[float]]] = None):
+        self.system_name = system_name
+        self.key = key
+        self.rounds = rounds
+        self.frequency = list(frequency)
+        self.ev = list(ev)
+        self.variance = list(variance)
+        self.outcomes = [list(row) for row in outcomes] if outcomes is not None else None
+        self._ramps = {}
+
+    @classmethod
+    def from_totals(cls, system_name: str, key: str, rounds: Sequence[int], total: Sequence[float],
+                    total_sq: Sequence[float], outcomes: Optional[Sequence[Sequence[float]]] = None
+                    ) -> 'TrueCountStats':
+        """Stats from per-bucket round counts, summed net and summed squared net (and outcome histogram)."""
+        all_rounds = sum(rounds)
+        frequency, ev, variance = [], [], []
+        for count, net, net_sq in zip(rounds, total, total_sq):
+            mean = net / count if count else 0.0
+            frequency.append(count / all_rounds if all_rounds else 0.0)
+            ev.append(mean)
+            variance.append(max(net_sq / count - mean * mean, 0.0) if count else 0.0)
+        return cls(system_name, key, int(all_rounds), frequency, ev, variance, outcomes)
+
+    @staticmethod
+    def bucket(true_count: float) -> int:
+        """Bucket index of a true count: floor(), clipped to +/- TC_LIMIT, then offset from 0."""
+        return min(max(math.floor(true_count), -TC_LIMIT), TC_LIMIT) + TC_LIMIT
+
+    def _measured(self, true_count: float) -> int:
+        # Counts too rare to have come up in the simulation use the nearest bucket that did
+        index = self.bucket(true_count)
+        while not self.frequency[index] and index != TC_LIMIT:
+            index += 1 if index < TC_LIMIT else -1
+        return index
+
+    def advantage(self, true_count: float) -> float:
+        """Player's EV per unit bet for a round starting at this true count."""
+        return self.ev[self._measured(true_count)]
+
+    def variance_at(self, true_count: float) -> float:
+        return self.variance[self._measured(true_count)]
+
+    def best_ramp(self, spread: float) -> Dict[str, object]:
+        """The bet ramp within 1 to spread units that maximizes SCORE, and its results.
+
+        Bets follow Kelly, proportional to each bucket's EV over its second
+        moment and clipped to the spread; the scale is chosen by search.
+
+        Returns:
+            dict: 'units' per bucket, 'win_rate' and 'sd' per 100 hands in units, and 'score'
+            (win rate per 100 hands for a 10,000-unit bankroll at optimal bet sizing)
+        """
+        if spread in self._ramps:
+            return self._ramps[spread]
+        second_moment = [v + m * m for m, v in zip(self.ev, self.variance)]
+
+        def results(units):
+            win = sum(f * u * m for f, u, m in zip(self.frequency, units, self.ev))
+            variance = sum(f * u * u * s for f, u, s in zip(self.frequency, units, second_moment)) - win * win
+            score = 1e6 * win * win / variance if win > 0 and variance > 0 else 0.0
+            return {'units': units, 'win_rate': 100 * win, 'sd': 10 * math.sqrt(max(variance, 0.0)), 'score': score}
+
+        best = results([1.0] * NUM_BUCKETS)  # Flat betting, if no ramp wins
+        kelly = [m / s if m > 0 and s > 0 else 0.0 for m, s in zip(self.ev, second_moment)]
+        for step in range(300):
+            scale = 10 ** (-2 + 7 * step / 299)
+            candidate = results([min(max(scale * k, 1.0), spread) for k in kelly])
+            if candidate['score'] > best['score']:
+                best = candidate
+        self._ramps[spread] = best
+        return best
+
+    def bet_units(self, true_count: float, spread: float) -> float:
+        """Bet at this true count, in units of the minimum bet, on the best ramp for the spread."""
+        return self.best_ramp(spread)['units'][self.bucket(true_count)]
+
+    # --- Binary file ---
+
+    def save(self, path: str):
+        name = self.system_name.encode()
+        outcomes = self.outcomes if self.outcomes is not None else [[0.0] * NUM_OUTCOMES] * NUM_BUCKETS
+        arrays = [array('d', values) for values in (self.frequency, self.ev, self.variance)]
+        arrays.append(array('d', [count for row in outcomes for count in row]))
+        if sys.byteorder == "big":
+            for values in arrays:
+                values.byteswap()  # Files are little-endian everywhere
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, TABLE_VERSION, NUM_BUCKETS, self.rounds, self.key.encode(), len(name)))
+            f.write(name)
+            for values in arrays:
+                f.write(values.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'TrueCountStats':
+        """Read a table written by save().
+
+        Raises:
+            ValueError: If the file isn't a count table of this version
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{path} is not a count table")
+        magic, version, buckets, rounds, key, name_length = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != TABLE_VERSION or buckets != NUM_BUCKETS:
+            raise ValueError(f"{path} is not a version {TABLE_VERSION} count table")
+        offset = _HEADER.size + name_length
+        name = data[_HEADER.size:offset].decode()
+        arrays = []
+        for length in (NUM_BUCKETS, NUM_BUCKETS, NUM_BUCKETS, NUM_BUCKETS * NUM_OUTCOMES):
+            values = array('d')
+            values.frombytes(data[offset:offset + 8 * length])
+            if len(values) != length:
+                raise ValueError(f"{path} is truncated")
+            if sys.byteorder == "big":
+                values.byteswap()
+            arrays.append(values)
+            offset += 8 * length
+        outcomes = arrays.pop()
+        return cls(name, key.decode(), rounds, *arrays,
+                   [outcomes[i * NUM_OUTCOMES:(i + 1) * NUM_OUTCOMES] for i in range(NUM_BUCKETS)])
+
+
+def count_table_path(system, rules: CasinoRules, num_decks: int, cache_dir: str = COUNT_TABLE_DIR) -> str:
+    return os.path.join(cache_dir, f"{count_table_key(system, rules, num_decks)}.bin")
+
+
+def load_count_stats(system, rules: CasinoRules, num_decks: int,
+                     cache_dir: str = COUNT_TABLE_DIR) -> Optional[TrueCountStats]:
+    """The table built for this system and table setup, or None if there isn't one yet."""
+    path = count_table_path(system, rules, num_decks, cache_dir)
+    if path not in _loaded:
+        try:
+            _loaded[path] = TrueCountStats.load(path)
+        except (OSError, ValueError):
+            _loaded[path] = None
+    return _loaded[path]
+
+
+def build_count_stats(system, num_rounds: int, rules: Optional[CasinoRules] = None,
+                      num_decks: int = DEFAULT_NUM_DECKS, cache_dir: Optional[str] = COUNT_TABLE_DIR,
+                      **simulation) -> TrueCountStats:
+    """Simulate a count table and save it to the cache directory.
+
+    Args:
+        system: Counting system name or CountingSystem
+        num_rounds: Simulated rounds
+        rules: Casino rules, including penetration (defaults to CasinoRules())
+        num_decks: Decks in the shoe
+        cache_dir: Where tables are kept; None skips saving
+        **simulation: Passed to counting_benchmark.simulate_count_tables() (workers, seed, checkpoint, ...)
+    """
+    from counting_benchmark import simulate_count_tables  # NumPy is only needed to build tables
+    rules = rules if rules is not None else CasinoRules()
+    system = get_counting_system(system)
+    tables, _ = simulate_count_tables([system], num_rounds, rules, num_decks, **simulation)
+    table = tables[system.name]
+    stats = TrueCountStats.from_totals(system.name, count_table_key(system, rules, num_decks),
+                                       table.rounds.tolist(), table.total.tolist(), table.total_sq.tolist(),
+                                       table.outcomes.tolist())
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        path = count_table_path(system, rules, num_decks, cache_dir)
+        stats.save(path)
+        _loaded[path] = stats
+    return stats
+
+
+def format_table(stats: TrueCountStats, spread: float) -> List[str]:
+    ramp = stats.best_ramp(spread)['units']
+    lines = [f"{'TC':>4}{'Freq':>9}{'EV':>9}{'SD':>7}{'Bet':>6}"]
+    for index in range(NUM_BUCKETS):
+        if stats.frequency[index] >= 0.0005:
+            lines.append(f"{index - TC_LIMIT:>+4}{stats.frequency[index]:>9.2%}{stats.ev[index]:>+9.2%}"
+                         f"{math.sqrt(stats.variance[index]):>7.3f}{ramp[index]:>6.1f}")
+    return lines
+
+
+def main(argv=None):
+    from batch_simulator import add_rules_arguments, build_rules
+    parser = argparse.ArgumentParser(description="Build a true-count frequency and EV table by simulation.")
+    parser.add_argument("--system", default=DEFAULT_COUNTING_SYSTEM, help="Counting system")
+    parser.add_argument("--rounds", type=int, default=20_000_000, help="Rounds to simulate")
+    parser.add_argument("--spread", type=float, default=8, help="Bet spread for the ramp column")
+    parser.add_argument("--decks", type=int, default=DEFAULT_NUM_DECKS, help="Number of decks in the shoe")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    add_rules_arguments(parser, default_penetration=0.75)
+    args = parser.parse_args(argv)
+
+    rules = build_rules(args)
+    stats = build_count_stats(args.system, args.rounds, rules, args.decks, workers=args.workers, seed=args.seed)
+    print(f"{stats.system_name}: {stats.rounds:,} rounds, saved to {count_table_path(args.system, rules, args.decks)}")
+    print("\n".join(format_table(stats, args.spread)))
+
+
+if __name__ == "__main__":
+    main()
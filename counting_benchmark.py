@@ -0,0 +1,502 @@
+"""Counting-system comparison benchmark.
+
+Measures how well each counting system tracks the game for a rules setup,
+penetration and bet spread:
+
+- Betting, playing and insurance correlation (BC, PE, IC): how closely the
+  system's tags follow the exact effects of removing one card of each value
+  on the player's overall EV, on key playing decisions and on insurance.
+- Win rate per 100 hands and SCORE from simulation. Every system counts the
+  same simulated shoes, and results are kept per true-count bucket, so the
+  bet ramp is chosen after the run. It is the best ramp within the spread.
+
+The simulation is sharded across a process pool. Every finished shard is
+written to a checkpoint file, so an interrupted run resumes where it stopped:
+
+    python counting_benchmark.py --systems Hi-Lo KO Zen --rounds 200000000 --spread 12 \\
+        --penetration 0.8 --h17 --workers 8 --checkpoint zen_vs_hilo.json
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from blackjack_strategy import Action, CompiledStrategy
+from casino_rules import CasinoRules
+from constants import DEFAULT_NUM_DECKS
+from count_tables import NUM_BUCKETS, NUM_OUTCOMES, OUTCOME_LIMIT, OUTCOME_SCALE, TC_LIMIT, TrueCountStats
+from counting_systems import COUNTING_SYSTEMS, CountingSystem, get_counting_system
+from deck import DECK_COMPOSITION
+from ev_engine import ActionEVSolver
+from hand_states import BLACKJACK, state_after
+from index_plays import IndexedStrategy, IndexPlay
+from parallel_simulator import split_rounds
+from strategy_generator import generate_strategy, strategy_rules
+from vectorized_simulator import VectorizedSimulator
+
+CHECKPOINT_VERSION = 2  # Bump when shard results change meaning so old checkpoints are refused
+SHARD_ROUNDS = 5_000_000  # Default rounds per shard, i.e. per checkpoint step
+
+# Decisions whose effects of removal make up playing efficiency: the
+# Illustrious 18 plays other than insurance, as (player cards, upcard, action, alternative)
+PLAYING_DECISIONS = (
+    ((10, 6), 10, Action.STAND, Action.HIT), ((10, 5), 10, Action.STAND, Action.HIT),
+    ((10, 10), 5, Action.SPLIT, Action.STAND), ((10, 10), 6, Action.SPLIT, Action.STAND),
+    ((6, 4), 10, Action.DOUBLE, Action.HIT), ((10, 2), 3, Action.STAND, Action.HIT),
+    ((10, 2), 2, Action.STAND, Action.HIT), ((6, 5), 1, Action.DOUBLE, Action.HIT),
+    ((6, 3), 2, Action.DOUBLE, Action.HIT), ((6, 4), 1, Action.DOUBLE, Action.HIT),
+    ((5, 4), 7, Action.DOUBLE, Action.HIT), ((10, 6), 9, Action.STAND, Action.HIT),
+    ((10, 3), 2, Action.STAND, Action.HIT), ((10, 2), 4, Action.STAND, Action.HIT),
+    ((10, 2), 5, Action.STAND, Action.HIT), ((10, 2), 6, Action.STAND, Action.HIT),
+    ((10, 3), 3, Action.STAND, Action.HIT),
+)
+
+
+# --- Correlations from effects of removal ---
+
+def _without(composition: Sequence[int], *values: int) -> tuple:
+    counts = list(composition)
+    for value in values:
+        counts[value] -= 1
+    return tuple(counts)
+
+
+def _weighted_correlation(x: Sequence[float], y: Sequence[float]) -> float:
+    """Correlation over card values 1-10, with tens weighted by their four ranks."""
+    weights = np.array(DECK_COMPOSITION[1:11], dtype=np.float64)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x = x - np.average(x, weights=weights)
+    y = y - np.average(y, weights=weights)
+    denominator = math.sqrt(np.average(x * x, weights=weights) * np.average(y * y, weights=weights))
+    return float(np.average(x * y, weights=weights) / denominator) if denominator else 0.0
+
+
+def overall_ev(composition: Sequence[int], rules: CasinoRules, strategy: CompiledStrategy) -> float:
+    """Player's EV per unit bet for a full round dealt from composition, playing the strategy chart.
+
+    Every upcard and two-card hand is weighted by how likely it is; each
+    hand takes the chart's first action, valued by ev_engine.
+    """
+    blackjack_payout = rules.get_blackjack_payout_multiplier()
+    total_cards = sum(composition[1:11])
+    ev = 0.0
+    for upcard in range(1, 11):
+        if not composition[upcard]:
+            continue
+        after_upcard = _without(composition, upcard)
+        p_upcard = composition[upcard] / total_cards
+        remaining = total_cards - 1
+        for first in range(1, 11):
+            for second in range(first, 11):
+                if after_upcard[first] < 1 + (first == second) or after_upcard[second] < 1:
+                    continue
+                # Probability of being dealt this combination, in either order
+                weight = after_upcard[first] * (after_upcard[second] - (first == second))
+                weight *= (1 if first == second else 2) / (remaining * (remaining - 1))
+                solver = ActionEVSolver(upcard, _without(after_upcard, first, second), rules)
+                state = state_after([first, second])
+                if state == BLACKJACK:
+                    hand_ev = blackjack_payout * (1 - solver.dealer_blackjack)
+                else:
+                    evs = solver.action_evs(state, can_split=rules.max_splits > 0,
+                                            can_surrender=rules.surrender_available)
+                    action = strategy.lookup(state, upcard)
+                    hand_ev = evs.get(action, max(evs.values()))
+                ev += p_upcard * weight * hand_ev
+    return ev
+
+
+def _decision_gain(composition: Sequence[int], rules: CasinoRules, cards, upcard: int, action: Action,
+                   alternative: Action) -> float:
+    evs = ActionEVSolver(upcard, composition, rules).action_evs(
+        state_after(list(cards)), dealer_checked=rules.dealer_peeks_for_blackjack)
+    return evs[action] - evs[alternative]
+
+
+def effects_of_removal(rules: CasinoRules, num_decks: int, strategy: CompiledStrategy,
+                       pool: Optional[ProcessPoolExecutor] = None) -> Dict[str, list]:
+    """Change in EV from removing one card of each value (index 0 = ace ... 9 = ten).
+
+    Returns:
+        dict: 'betting' for the overall EV, 'insurance' for the insurance bet and
+        'playing' with one list per PLAYING_DECISIONS entry (change in its EV gain)
+    """
+    shoe = tuple(count * num_decks for count in DECK_COMPOSITION)
+    compositions = [shoe] + [_without(shoe, value) for value in range(1, 11)]
+    if pool is not None:
+        futures = [pool.submit(overall_ev, composition, rules, strategy) for composition in compositions]
+        evs = [future.result() for future in futures]
+    else:
+        evs = [overall_ev(composition, rules, strategy) for composition in compositions]
+    betting = [ev - evs[0] for ev in evs[1:]]
+
+    # Insurance pays 2:1 against the dealer's ace, so its EV is 3 x P(ten) - 1
+    def insurance_ev(composition):
+        return 3 * composition[10] / sum(composition[1:11]) - 1
+    after_ace = _without(shoe, 1)
+    insurance = [insurance_ev(_without(after_ace, value)) - insurance_ev(after_ace) for value in range(1, 11)]
+
+    playing = []
+    for cards, upcard, action, alternative in PLAYING_DECISIONS:
+        base = _without(shoe, upcard, *cards)
+        gain = _decision_gain(base, rules, cards, upcard, action, alternative)
+        playing.append([_decision_gain(_without(base, value), rules, cards, upcard, action, alternative) - gain
+                        for value in range(1, 11)])
+    return {'betting': betting, 'insurance': insurance, 'playing': playing}
+
+
+def system_correlations(system: CountingSystem, removal: Dict[str, list]) -> Dict[str, float]:
+    """BC, PE and IC of a system from effects_of_removal().
+
+    Each is the correlation of the tags with the effects of removal; PE is
+    the average over PLAYING_DECISIONS, each of which is put the way a rising
+    count favors.
+    """
+    tags = system.tags
+    return {
+        'BC': _weighted_correlation(tags, removal['betting']),
+        'PE': float(np.mean([_weighted_correlation(tags, effects) for effects in removal['playing']])),
+        'IC': _weighted_correlation(tags, removal['insurance']),
+    }
+
+
+# --- Simulation ---
+
+class TrueCountTable:
+    """Rounds, summed net, summed squared net and a histogram of net (flat one-unit bets) per true-count bucket."""
+
+    def __init__(self):
+        self.rounds = np.zeros(NUM_BUCKETS, dtype=np.int64)
+        self.total = np.zeros(NUM_BUCKETS)
+        self.total_sq = np.zeros(NUM_BUCKETS)
+        self.outcomes = np.zeros((NUM_BUCKETS, NUM_OUTCOMES), dtype=np.int64)
+
+    @staticmethod
+    def buckets(true_counts):
+        """Bucket index of each true count: floor(), clipped to +/- TC_LIMIT, then offset from 0."""
+        return np.clip(np.floor(true_counts), -TC_LIMIT, TC_LIMIT).astype(np.int64) + TC_LIMIT
+
+    def add(self, true_counts, net):
+        buckets = self.buckets(true_counts)
+        self.rounds += np.bincount(buckets, minlength=NUM_BUCKETS)
+        self.total += np.bincount(buckets, weights=net, minlength=NUM_BUCKETS)
+        self.total_sq += np.bincount(buckets, weights=net * net, minlength=NUM_BUCKETS)
+        outcomes = np.clip(np.rint(net * OUTCOME_SCALE), -OUTCOME_LIMIT, OUTCOME_LIMIT).astype(np.int64)
+        outcomes += OUTCOME_LIMIT
+        self.outcomes += np.bincount(buckets * NUM_OUTCOMES + outcomes,
+                                     minlength=NUM_BUCKETS * NUM_OUTCOMES).reshape(NUM_BUCKETS, NUM_OUTCOMES)
+
+    def merge(self, other: 'TrueCountTable'):
+        self.rounds += other.rounds
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.outcomes += other.outcomes
+
+    def to_dict(self) -> dict:
+        return {'rounds': self.rounds.tolist(), 'total': self.total.tolist(), 'total_sq': self.total_sq.tolist(),
+                'outcomes': self.outcomes.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'TrueCountTable':
+        table = cls()
+        table.rounds[:] = data['rounds']
+        table.total[:] = data['total']
+        table.total_sq[:] = data['total_sq']
+        table.outcomes[:] = data['outcomes']
+        return table
+
+
+class CountingSimulator(VectorizedSimulator):
+    """VectorizedSimulator that also reports every system's true count at the start of each round.
+
+    Each shoe's running count before every card is precomputed once per
+    shuffle as a cumulative sum of its tags, so reading the counts costs one
+    gather per system per round and nothing per card.
+
+    With index plays, decisions follow the first system's true count as the
+    player sees it at that moment (every card dealt so far but the dealer's
+    hole card), and insurance is taken at insurance_index.
+    """
+
+    def __init__(self, systems: Sequence[CountingSystem], *args, index_plays: Optional[Sequence[IndexPlay]] = None,
+                 insurance_index: Optional[float] = None, **kwargs):
+        self.systems = list(systems)
+        super().__init__(*args, **kwargs)
+        self.indexed = IndexedStrategy(self.strategy, index_plays, insurance_index) if index_plays else None
+        self._imbalance = np.array([system.imbalance for system in self.systems], dtype=np.float64)[:, None]
+        self._running = np.zeros((len(self.systems), self.num_shoes, self.num_cards + 1), dtype=np.float32)
+        self._refresh_counts(self.lanes)
+        self.round_start = self.positions.copy()
+
+    def _refresh_counts(self, rows):
+        shoes = self.shoes[rows]
+        for i, system in enumerate(self.systems):
+            self._running[i, rows, 1:] = np.cumsum(system.weights_array.take(shoes), axis=1)
+
+    def _reshuffle_depleted(self):
+        depleted = super()._reshuffle_depleted()
+        if depleted.size:
+            self._refresh_counts(depleted)
+        self.round_start = self.positions.copy()  # Each round's counts are taken before its first card
+        return depleted
+
+    def _true_counts(self, rows, seen, hidden=None):
+        """First system's true count on the listed shoes after their first seen cards.
+
+        hidden holds the tag of one of those cards that the player hasn't seen, if any.
+        """
+        seen = np.minimum(seen, self.num_cards)
+        running = self._running[0, rows, seen]
+        if hidden is not None:
+            running, seen = running - hidden, seen - 1
+        return (running - self._imbalance[0] * seen / 52.0) / (np.maximum(self.num_cards - seen, 1) / 52.0)
+
+    def _strategy_lookup(self, rows):
+        if self.indexed is None:
+            return super()._strategy_lookup(rows)
+        # The hole card is the fourth card of the round and stays face down while the player decides
+        hole = self.shoes[rows, (self.round_start[rows] + 3) % self.num_cards]
+        true_counts = self._true_counts(rows, self.positions[rows], self.systems[0].weights_array.take(hole))[:, None]
+        return lambda states, upcards, **options: self.indexed.lookup_batch(states, upcards, true_counts, **options)
+
+    def play_counted_round(self):
+        """Play one round on every shoe.
+
+        Returns:
+            (net, true_counts): net result per shoe in units of the initial bet, and each
+            system's balanced-equivalent true count per shoe before the deal (systems x shoes)
+        """
+        net = self.play_round()
+        if self.indexed is not None and self.indexed.insurance_index is not None and self.rules.insurance_available:
+            # Insurance is decided on the player's two cards and the upcard; half a bet, won on a ten in the hole
+            start = self.round_start
+            upcard = self.shoes[self.lanes, (start + 2) % self.num_cards]
+            hole = self.shoes[self.lanes, (start + 3) % self.num_cards]
+            insured = (upcard == 1) & (self._true_counts(self.lanes, start + 3) >= self.indexed.insurance_index)
+            insurance_net = np.where(hole == 10, 0.5 * self.rules.get_insurance_payout(), -0.5)
+            net = net + np.where(insured, insurance_net, 0.0)
+        positions = np.minimum(self.round_start, self.num_cards)
+        running = self._running[:, self.lanes, positions]
+        decks_remaining = np.maximum(self.num_cards - positions, 1) / 52.0
+        return net, (running - self._imbalance * positions / 52.0) / decks_remaining
+
+
+def _run_shard(num_rounds: int, seed, setup: dict) -> Dict[str, dict]:
+    systems = setup['systems']
+    num_shoes = max(1, min(setup['num_shoes'], num_rounds))
+    simulator = CountingSimulator(systems, num_shoes, setup['num_decks'], setup['rules'], setup['strategy'],
+                                  seed=seed, index_plays=setup.get('index_plays'),
+                                  insurance_index=setup.get('insurance_index'))
+    tables = [TrueCountTable() for _ in systems]
+    for _ in range(math.ceil(num_rounds / num_shoes)):
+        net, true_counts = simulator.play_counted_round()
+        for table, system_counts in zip(tables, true_counts):
+            table.add(system_counts, net)
+    return {system.name: table.to_dict() for system, table in zip(systems, tables)}
+
+
+def best_ramp(table: TrueCountTable, spread: float) -> Dict[str, object]:
+    """TrueCountStats.best_ramp() for a table, plus 'flat_ev' per unit bet."""
+    stats = TrueCountStats.from_totals("", "", table.rounds.tolist(), table.total.tolist(), table.total_sq.tolist())
+    result = dict(stats.best_ramp(spread))
+    result['flat_ev'] = float(table.total.sum() / max(table.rounds.sum(), 1))
+    return result
+
+
+# --- Checkpointed parallel run ---
+
+def _setup_key(setup: dict, num_rounds: int, num_shards: int, seed) -> dict:
+    rules = setup['rules']
+    key = {
+        'version': CHECKPOINT_VERSION,
+        'systems': {system.name: list(system.tags) for system in setup['systems']},
+        'rules': dict(strategy_rules(rules, setup['num_decks']), **rules.get_shoe_policy()),
+        'num_shoes': setup['num_shoes'],
+        'rounds': num_rounds,
+        'shards': num_shards,
+        'seed': seed,
+    }
+    if setup.get('index_plays'):
+        key['index_plays'] = [list(play.as_tuple()) for play in setup['index_plays']]
+        key['insurance_index'] = setup['insurance_index']
+    return key
+
+
+def _save_checkpoint(path: str, data: dict):
+    temporary = path + ".tmp"
+    with open(temporary, 'w') as f:
+        json.dump(data, f)
+    os.replace(temporary, path)  # A run killed mid-write leaves the previous checkpoint intact
+
+
+def simulate_count_tables(systems: Sequence, num_rounds: int, rules: Optional[CasinoRules] = None,
+                          num_decks: int = DEFAULT_NUM_DECKS, num_shoes: int = 4096,
+                          num_shards: Optional[int] = None, workers: Optional[int] = None, seed=None,
+                          checkpoint: Optional[str] = None, progress=None, removal: bool = False,
+                          index_plays: Optional[Sequence[IndexPlay]] = None,
+                          insurance_index: Optional[float] = None) -> Tuple[Dict[str, TrueCountTable], Optional[dict]]:
+    """Simulate flat-bet results per true-count bucket for every system on the same shoes.
+
+    Args:
+        systems: Names from COUNTING_SYSTEMS or CountingSystem objects
+        num_rounds: Simulated rounds, shared by every system
+        rules: Casino rules, including penetration (defaults to CasinoRules())
+        num_decks: Decks in the shoe
+        num_shoes: Shoes played in lockstep in each worker
+        num_shards: Independent shards (defaults to one per SHARD_ROUNDS rounds)
+        workers: Worker processes (defaults to the CPU count)
+        seed: Base seed; a random one is chosen if None (and kept in the checkpoint)
+        checkpoint: JSON file recording finished shards; an existing one for the same setup is resumed
+        progress: Called with (finished shards, total shards) as shards complete
+        removal: Also compute effects_of_removal() (with the same pool and checkpoint)
+        index_plays: Deviations from the chart, keyed on the first system's true count
+        insurance_index: True count at which insurance is taken, with index_plays; None never takes it
+
+    Returns:
+        (tables, removal): system name -> TrueCountTable, and effects_of_removal() or None
+    """
+    rules = rules if rules is not None else CasinoRules()
+    systems = [get_counting_system(system) for system in systems]
+    workers = workers or os.cpu_count() or 1
+    num_shards = num_shards or max(1, math.ceil(num_rounds / SHARD_ROUNDS))
+    strategy = CompiledStrategy(generate_strategy(rules, num_decks)['chart'])
+    setup = {'systems': systems, 'rules': rules, 'num_decks': num_decks, 'num_shoes': num_shoes,
+             'strategy': strategy.strategy}
+    if index_plays:
+        setup.update(index_plays=tuple(index_plays), insurance_index=insurance_index)
+
+    state = None
+    if checkpoint and os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            state = json.load(f)
+        seed = state['setup']['seed'] if seed is None else seed
+        if state['setup'] != _setup_key(setup, num_rounds, num_shards, seed):
+            raise ValueError(f"{checkpoint} is a checkpoint for a different benchmark setup")
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 63)
+    if state is None:
+        state = {'setup': _setup_key(setup, num_rounds, num_shards, seed), 'removal': None, 'shards': {}}
+
+    def finished(shard_index, result):
+        state['shards'][str(shard_index)] = result
+        if checkpoint:
+            _save_checkpoint(checkpoint, state)
+        if progress:
+            progress(len(state['shards']), num_shards)
+
+    shard_rounds = split_rounds(num_rounds, num_shards)
+    pending = [i for i in range(num_shards) if str(i) not in state['shards']]
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        if removal and state['removal'] is None:
+            state['removal'] = effects_of_removal(rules, num_decks, strategy, pool)
+            if checkpoint:
+                _save_checkpoint(checkpoint, state)
+        if pool is None:
+            for i in pending:
+                finished(i, _run_shard(shard_rounds[i], [seed, i], setup))
+        else:
+            futures = {pool.submit(_run_shard, shard_rounds[i], [seed, i], setup): i for i in pending}
+            for future in as_completed(futures):
+                finished(futures[future], future.result())
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    tables = {}
+    for system in systems:
+        table = tables[system.name] = TrueCountTable()
+        for i in range(num_shards):  # Shard order keeps floating-point sums identical on every run
+            table.merge(TrueCountTable.from_dict(state['shards'][str(i)][system.name]))
+    return tables, state['removal']
+
+
+def run_counting_benchmark(systems: Sequence, num_rounds: int, rules: Optional[CasinoRules] = None,
+                           num_decks: int = DEFAULT_NUM_DECKS, spread: float = 8, num_shoes: int = 4096,
+                           num_shards: Optional[int] = None, workers: Optional[int] = None, seed=None,
+                           checkpoint: Optional[str] = None, progress=None) -> Dict[str, Dict[str, object]]:
+    """Compare counting systems on one rules setup.
+
+    Takes the arguments of simulate_count_tables(), plus spread: the largest
+    bet in units of the smallest.
+
+    Returns:
+        dict: system name -> system_correlations() merged with best_ramp(), plus 'rounds'
+    """
+    systems = [get_counting_system(system) for system in systems]
+    tables, removal = simulate_count_tables(systems, num_rounds, rules, num_decks, num_shoes, num_shards, workers,
+                                            seed, checkpoint, progress, removal=True)
+    results = {}
+    for system in systems:
+        table = tables[system.name]
+        results[system.name] = dict(system_correlations(system, removal), rounds=int(table.rounds.sum()),
+                                    **best_ramp(table, spread))
+    return results
+
+
+# --- Command line ---
+
+def format_report(results: Dict[str, Dict[str, object]], spread: float) -> str:
+    lines = [f"{'System':<12}{'BC':>7}{'PE':>7}{'IC':>7}{'Win/100':>10}{'SD/100':>9}{'SCORE':>9}",
+             "-" * 61]
+    for name, result in results.items():
+        lines.append(f"{name:<12}{result['BC']:>7.3f}{result['PE']:>7.3f}{result['IC']:>7.3f}"
+                     f"{result['win_rate']:>10.3f}{result['sd']:>9.2f}{result['score']:>9.2f}")
+    rounds = next(iter(results.values()))['rounds'] if results else 0
+    lines.append(f"\n{rounds:,} rounds per system; win rate and SD in units, 1-{spread:g} spread "
+                 f"(best ramp per system)")
+    return "\n".join(lines)
+
+
+def _parse_tags(text: str):
+    name, _, tags = text.partition("=")
+    try:
+        values = [float(tag) if '.' in tag else int(tag) for tag in tags.split(",")]
+        return name, values
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected NAME=ace,2,...,9,ten tags, got {text!r}") from None
+
+
+def main(argv=None):
+    from batch_simulator import add_rules_arguments, build_rules
+    parser = argparse.ArgumentParser(description="Compare card counting systems by simulation.")
+    parser.add_argument("--systems", nargs="+", default=list(COUNTING_SYSTEMS), help="Counting systems to compare")
+    parser.add_argument("--tags", type=_parse_tags, action="append", default=[], metavar="NAME=A,2,...,9,T",
+                        help="Add a user-defined system (repeatable)")
+    parser.add_argument("--rounds", type=int, default=20_000_000, help="Rounds to simulate")
+    parser.add_argument("--spread", type=float, default=8, help="Largest bet in units of the smallest")
+    parser.add_argument("--decks", type=int, default=DEFAULT_NUM_DECKS, help="Number of decks in the shoe")
+    parser.add_argument("--shoes", type=int, default=4096, help="Shoes played in lockstep per worker")
+    parser.add_argument("--shards", type=int, default=None, help="Number of shards (checkpoint steps)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file; an existing one is resumed")
+    add_rules_arguments(parser, default_penetration=0.75)
+    args = parser.parse_args(argv)
+
+    rules = build_rules(args)
+    systems = list(args.systems)
+    for name, tags in args.tags:
+        systems.append(CountingSystem(name, tags))
+
+    start = time.perf_counter()
+    try:
+        results = run_counting_benchmark(
+            systems, args.rounds, rules, args.decks, args.spread, args.shoes, args.shards, args.workers, args.seed,
+            args.checkpoint, progress=lambda done, total: print(f"\rShards {done}/{total}", end="", flush=True))
+    except ValueError as error:
+        raise SystemExit(str(error))
+    print(f"\r{format_report(results, args.spread)}")
+    print(f"Elapsed: {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
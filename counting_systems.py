@@ -0,0 +1,117 @@
+"""Card counting systems as weight tables.
+
+A system is a tag for each card value. Compiled, it is a weight array
+indexed by value (index 1 = ace ... 10, index 0 unused), so a count is a dot
+product of the weights with how many cards of each value have been seen.
+Tracking the seen cards once therefore serves every system at no extra
+cost per card, and a batch of cards is one histogram plus one dot product.
+
+Unbalanced systems (tags that don't sum to zero over a deck, like KO) are
+converted to a balanced-equivalent true count, so bet ramps and indices keyed
+on true count work with any system. Side counts - an ace count for the
+Hi-Opt systems and an insurance count for every system - are weight arrays too.
+"""
+
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the array forms need it
+    np = None
+
+from deck import DECK_COMPOSITION
+
+# Insurance side count: breaks even when tens are a third of the unseen cards
+INSURANCE_TAGS = (4, 4, 4, 4, 4, 4, 4, 4, 4, -9)
+ACE_TAGS = (1, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+
+
+def _weights(tags: Sequence[float]) -> Tuple[float, ...]:
+    """Weight array indexed by card value from tags listed ace, 2, ..., 9, ten."""
+    if len(tags) != 10:
+        raise ValueError(f"expected 10 tags (ace through ten), got {len(tags)}")
+    return (0,) + tuple(tags)
+
+
+class CountingSystem:
+    """One counting system: a tag per card value, plus optional side counts."""
+
+    def __init__(self, name: str, tags: Sequence[float], side_counts: Optional[Dict[str, Sequence[float]]] = None):
+        """
+        Args:
+            name: Display name
+            tags: Count tag of each card value, listed ace, 2, ..., 9, ten
+            side_counts: Extra counts by name, with tags in the same order; every
+                system also keeps an "insurance" side count
+        """
+        self.name = name
+        self.tags = tuple(tags)
+        self.weights = _weights(tags)
+        self.side_weights = {"insurance": _weights(INSURANCE_TAGS)}
+        for side_name, side_tags in (side_counts or {}).items():
+            self.side_weights[side_name] = _weights(side_tags)
+        self.level = max(abs(tag) for tag in self.tags)
+        # Count gained per full deck; 0 for a balanced system
+        self.imbalance = sum(weight * count for weight, count in zip(self.weights, DECK_COMPOSITION))
+        if np is not None:
+            self.weights_array = np.array(self.weights, dtype=np.float64 if self._fractional() else np.int16)
+
+    def _fractional(self) -> bool:
+        return any(tag != int(tag) for tag in self.tags)
+
+    @property
+    def balanced(self) -> bool:
+        return self.imbalance == 0
+
+    def running_count(self, seen: Sequence[int]) -> float:
+        """Count for seen cards by value (index 1 = ace ... 10)."""
+        return sum(weight * count for weight, count in zip(self.weights, seen))
+
+    def side_count(self, name: str, seen: Sequence[int]) -> float:
+        return sum(weight * count for weight, count in zip(self.side_weights[name], seen))
+
+    def true_count(self, running_count: float, cards_seen: int, cards_remaining: int) -> float:
+        """Running count per deck remaining, less the drift an unbalanced system picks up from neutral cards.
+
+        The running count here starts at 0 for every system.
+        """
+        decks_remaining = cards_remaining / 52.0
+        if decks_remaining <= 0:
+            return 0.0
+        return (running_count - self.imbalance * cards_seen / 52.0) / decks_remaining
+
+    def __repr__(self):
+        return f"CountingSystem({self.name!r}, {self.tags})"
+
+
+COUNTING_SYSTEMS: Dict[str, CountingSystem] = {system.name: system for system in (
+    CountingSystem("Hi-Lo", (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1)),
+    CountingSystem("KO", (-1, 1, 1, 1, 1, 1, 1, 0, 0, -1)),
+    CountingSystem("Hi-Opt I", (0, 0, 1, 1, 1, 1, 0, 0, 0, -1), {"aces": ACE_TAGS}),
+    CountingSystem("Hi-Opt II", (0, 1, 1, 2, 2, 1, 1, 0, 0, -2), {"aces": ACE_TAGS}),
+    CountingSystem("Omega II", (0, 1, 1, 2, 2, 2, 1, 0, -1, -2), {"aces": ACE_TAGS}),
+    CountingSystem("Zen", (-1, 1, 1, 2, 2, 2, 1, 0, 0, -2)),
+)}
+DEFAULT_COUNTING_SYSTEM = "Hi-Lo"
+
+
+def register_counting_system(name: str, tags: Sequence[float],
+                             side_counts: Optional[Dict[str, Sequence[float]]] = None) -> CountingSystem:
+    """Add a user-defined system (tags listed ace, 2, ..., 9, ten) to COUNTING_SYSTEMS."""
+    system = COUNTING_SYSTEMS[name] = CountingSystem(name, tags, side_counts)
+    return system
+
+
+def get_counting_system(system) -> CountingSystem:
+    """A system from COUNTING_SYSTEMS by name, or a CountingSystem passed through."""
+    if isinstance(system, CountingSystem):
+        return system
+    try:
+        return COUNTING_SYSTEMS[system]
+    except KeyError:
+        raise ValueError(f"unknown counting system {system!r}; choose from {', '.join(COUNTING_SYSTEMS)}") from None
+
+
+def weight_matrix(systems: Iterable) -> "np.ndarray":
+    """(systems x 11) weights, so weight_matrix(systems) @ seen gives every system's count at once."""
+    return np.array([get_counting_system(system).weights for system in systems], dtype=np.float64)
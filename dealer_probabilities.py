@@ -0,0 +1,110 @@
+"""Exact dealer final-total probabilities for a shoe composition.
+
+The dealer's play is fixed by the rules, so the chance of each final total
+(17-21, bust or blackjack) follows exactly from the upcard and the cards left
+in the shoe. The recursion draws every possible card in turn, walking the
+hand_states transition table, and is memoized on a compact integer key that
+packs the per-value card counts, so repeated queries during a shoe - and the
+sub-shoes shared between queries - are cache hits.
+"""
+
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+from hand_states import BLACKJACK, TRANSITIONS, STATE_TOTAL, DEALER_HITS_H17, DEALER_HITS_S17, state_after
+
+DEALER_TOTALS = (17, 18, 19, 20, 21)
+BUST = 5  # Index of bust in a distribution
+DEALER_BLACKJACK = 6  # Index of blackjack in a distribution
+NUM_OUTCOMES = 7
+
+_COUNT_BITS = 10  # Up to 1023 cards of one value, enough for any shoe
+_COUNT_MASK = (1 << _COUNT_BITS) - 1
+# Packed key of one card of each value; adding or subtracting it changes that count
+ONE_CARD_KEY = tuple(1 << (_COUNT_BITS * (value - 1)) if value else 0 for value in range(11))
+CACHE_SIZE = 1 << 16  # Memoized sub-shoes before the least recently used are evicted
+
+
+def composition_key(composition: Sequence[int]) -> int:
+    """Pack a composition (card counts indexed 1 = ace ... 10, as from Deck.get_composition()) into one int."""
+    key = 0
+    for value in range(10, 0, -1):
+        key = (key << _COUNT_BITS) | composition[value]
+    return key
+
+
+def key_count(key: int, value: int) -> int:
+    """Number of cards of a value in a packed composition."""
+    return (key >> (_COUNT_BITS * (value - 1))) & _COUNT_MASK
+
+
+_FRESH_DECK_KEY = composition_key((0,) + (4,) * 9 + (16,))
+
+
+def _final_outcomes(hits_table) -> Tuple[int, ...]:
+    """Outcome index of every state where the dealer stops drawing, or -1 where the dealer draws."""
+    return tuple(DEALER_BLACKJACK if state == BLACKJACK else
+                 -1 if hits_table[state] else
+                 min(STATE_TOTAL[state], 22) - 17
+                 for state in range(len(hits_table)))
+
+
+_FINAL_OUTCOMES = {False: _final_outcomes(DEALER_HITS_S17), True: _final_outcomes(DEALER_HITS_H17)}
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _finish(state: int, key: int, hits_soft_17: bool) -> Tuple[float, ...]:
+    """Outcome distribution for a dealer hand that must draw, drawing from a packed composition."""
+    final_outcomes = _FINAL_OUTCOMES[hits_soft_17]
+    transitions = TRANSITIONS[state]
+    weights = [0] * NUM_OUTCOMES  # Card counts leading straight to each outcome
+    outcome = [0.0] * NUM_OUTCOMES
+    total_cards = 0
+    for value in range(1, 11):
+        count = (key >> (_COUNT_BITS * (value - 1))) & _COUNT_MASK
+        if not count:
+            continue
+        total_cards += count
+        next_state = transitions[value]
+        final = final_outcomes[next_state]
+        if final >= 0:
+            weights[final] += count  # Most draws end the hand; no recursion needed
+        else:
+            sub_outcome = _finish(next_state, key - ONE_CARD_KEY[value], hits_soft_17)
+            for i in range(NUM_OUTCOMES):
+                outcome[i] += count * sub_outcome[i]
+    if total_cards == 0:
+        # The shoe ran dry; the discards are reshuffled, which a fresh deck stands in for
+        return _finish(state, _FRESH_DECK_KEY, hits_soft_17)
+    return tuple((outcome[i] + weights[i]) / total_cards for i in range(NUM_OUTCOMES))
+
+
+@lru_cache(maxsize=4096)
+def _dealer_probabilities(upcard: int, key: int, hits_soft_17: bool, no_blackjack: bool) -> Tuple[float, ...]:
+    outcome = _finish(state_after([upcard]), key, hits_soft_17)  # A lone upcard always draws
+    if not no_blackjack or not outcome[DEALER_BLACKJACK]:
+        return outcome
+    scale = 1 / (1 - outcome[DEALER_BLACKJACK])
+    return tuple(p * scale for p in outcome[:DEALER_BLACKJACK]) + (0.0,)
+
+
+def dealer_probabilities(upcard: int, composition: Sequence[int], hits_soft_17: bool = False,
+                         no_blackjack: bool = False) -> Tuple[float, ...]:
+    """Probability of each final dealer outcome.
+
+    Args:
+        upcard: Dealer upcard value (1 = ace ... 10)
+        composition: Unseen cards by value, indexed 1 (ace) to 10; includes the hole card
+        hits_soft_17: Dealer hits soft 17
+        no_blackjack: Condition on the dealer not having blackjack, as after a peek
+
+    Returns:
+        tuple: Probabilities of finishing on 17, 18, 19, 20, 21, then bust
+        (index BUST) and blackjack (index DEALER_BLACKJACK); they sum to 1
+    """
+    return _dealer_probabilities(upcard, composition_key(composition), hits_soft_17, no_blackjack)
+
+
+def cache_info():
+    """Hit/miss statistics of the sub-shoe cache (functools.lru_cache info)."""
+    return _finish.cache_info()
@@ -0,0 +1,275 @@
+"""Expected value of every blackjack action for a shoe composition.
+
+ActionEVSolver works out the EV of standing, hitting, doubling, splitting
+and surrendering any hand state against one dealer upcard. The dealer's
+final-total distribution is exact for the unseen cards (dealer_probabilities);
+the player's hit, double and split outcomes are a memoized recursion over the
+hand_states table, with the player's later draws taken from that same
+composition. Drawing without replacement for every player card as well costs
+seconds per decision, while this keeps a live decision within a few
+milliseconds and moves EVs by hundredths of a percent.
+
+Solvers are kept in a small LRU cache keyed by upcard, packed composition and
+rules, so every hand and split hand played against the same shoe state
+shares one solver. ShoeEVCache follows a live shoe card by card, so a table
+of many hands gets fresh EVs after every card without rebuilding the
+composition each time. CasinoRules decide which actions exist: double after
+split, the split limit, resplitting aces, surrender and the dealer peek.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+from blackjack_strategy import Action
+from casino_rules import CasinoRules
+from dealer_probabilities import (BUST, DEALER_BLACKJACK, DEALER_TOTALS, ONE_CARD_KEY, composition_key,
+                                  dealer_probabilities)
+from hand_states import TRANSITIONS, STATE_TOTAL, STATE_BUST, STATE_PAIR_VALUE, state_after
+
+EV_CACHE_SIZE = 256  # Solvers kept before the least recently used is evicted
+
+_solvers = OrderedDict()
+_solvers_lock = threading.Lock()  # The GUI asks for EVs from a background thread
+
+
+class ActionEVSolver:
+    """Action EVs for every hand state against one dealer upcard and shoe composition.
+
+    EVs are per unit of the hand's bet.
+    """
+
+    def __init__(self, upcard: int, composition: Sequence[int], rules: CasinoRules):
+        """
+        Args:
+            upcard: Dealer upcard value (1 = ace ... 10)
+            composition: Unseen cards by value, indexed 1 (ace) to 10; includes the dealer's hole card
+            rules: Casino rules
+        """
+        self.rules = rules
+        total_cards = sum(composition[1:11])
+        self.draw = [0.0] + [composition[value] / total_cards for value in range(1, 11)]
+        self.dealer_blackjack = dealer_probabilities(upcard, composition, rules.dealer_hits_soft_17)[DEALER_BLACKJACK]
+        # Play only continues when the dealer has no blackjack, so EVs are conditioned on that
+        self.dealer = dealer_probabilities(upcard, composition, rules.dealer_hits_soft_17, no_blackjack=True)
+        self._hit_memo = {}
+        self._split_memo = {}
+
+    def stand(self, state: int) -> float:
+        if STATE_BUST[state]:
+            return -1.0
+        total = STATE_TOTAL[state]
+        win = self.dealer[BUST]
+        lose = 0.0
+        for dealer_total, p in zip(DEALER_TOTALS, self.dealer):
+            if dealer_total < total:
+                win += p
+            elif dealer_total > total:
+                lose += p
+        return win - lose
+
+    def hit(self, state: int) -> float:
+        if state not in self._hit_memo:
+            ev = 0.0
+            for value in range(1, 11):
+                if self.draw[value]:
+                    ev += self.draw[value] * self.best_after_hit(TRANSITIONS[state][value])
+            self._hit_memo[state] = ev
+        return self._hit_memo[state]
+
+    def best_after_hit(self, state: int) -> float:
+        """EV of a hand that has hit: it can only stand or hit again."""
+        if STATE_BUST[state]:
+            return -1.0
+        if STATE_TOTAL[state] == 21:
+            return self.stand(state)
+        return max(self.stand(state), self.hit(state))
+
+    def double(self, state: int) -> float:
+        return 2 * sum(self.draw[value] * self.stand(TRANSITIONS[state][value])
+                       for value in range(1, 11) if self.draw[value])
+
+    def split(self, pair_value: int, resplits: Optional[int] = None) -> float:
+        """EV of splitting a pair, for both hands together.
+
+        Args:
+            pair_value: Value of the paired cards (1 = aces)
+            resplits: Further splits allowed after this one (defaults to the rules' limit less this split)
+        """
+        if resplits is None:
+            resplits = self.rules.max_splits - 1
+        return 2 * self._split_hand(pair_value, resplits)
+
+    def _split_hand(self, pair_value: int, resplits: int) -> float:
+        # Each resplit hand is given the remaining allowance to itself, which
+        # slightly overstates deep resplits but never changes a decision
+        key = (pair_value, resplits)
+        if key in self._split_memo:
+            return self._split_memo[key]
+        rules = self.rules
+        one_card = state_after([pair_value])
+        ev = 0.0
+        for value in range(1, 11):
+            if not self.draw[value]:
+                continue
+            state = TRANSITIONS[one_card][value]
+            if pair_value == 1:
+                hand_ev = self.stand(state)  # Split aces get one card
+            else:
+                hand_ev = max(self.stand(state), self.hit(state))
+                if rules.double_after_split:
+                    hand_ev = max(hand_ev, self.double(state))
+            if value == pair_value and resplits > 0 and (pair_value != 1 or rules.resplit_aces):
+                hand_ev = max(hand_ev, 2 * self._split_hand(pair_value, resplits - 1))
+            ev += self.draw[value] * hand_ev
+        self._split_memo[key] = ev
+        return ev
+
+    def action_evs(self, state: int, can_hit: bool = True, can_double: bool = True, can_split: bool = True,
+                   can_surrender: bool = True, resplits: Optional[int] = None,
+                   dealer_checked: bool = False) -> Dict[Action, float]:
+        """EV of every legal action on a hand.
+
+        Args:
+            state: The hand's hand_states index
+            can_hit, can_double, can_split, can_surrender: Which actions the table allows right now;
+                splitting also needs a pair
+            resplits: Further splits allowed after splitting this hand (see split())
+            dealer_checked: The dealer has peeked and has no blackjack. Otherwise a
+                dealer blackjack is still possible and is folded into every EV.
+
+        Returns:
+            dict: Action -> EV per unit of the hand's bet
+        """
+        rules = self.rules
+        blackjack = 0.0 if dealer_checked else self.dealer_blackjack
+
+        def overall(ev, stake=1):
+            # Peeking dealers take only the original bet on a blackjack; otherwise every stake is lost
+            loss = 1 if rules.dealer_peeks_for_blackjack else stake
+            return -blackjack * loss + (1 - blackjack) * ev
+
+        evs = {Action.STAND: overall(self.stand(state))}
+        if can_hit:
+            evs[Action.HIT] = overall(self.hit(state))
+        if can_double:
+            evs[Action.DOUBLE] = overall(self.double(state), 2)
+        pair_value = STATE_PAIR_VALUE[state]
+        if can_split and pair_value:
+            evs[Action.SPLIT] = overall(self.split(pair_value, resplits), 2)
+        if can_surrender:
+            early = rules.surrender_type == "early" and not dealer_checked
+            evs[Action.SURRENDER] = -0.5 if early else overall(-0.5)
+        return evs
+
+
+def _rules_key(rules: CasinoRules):
+    return (rules.dealer_hits_soft_17, rules.dealer_peeks_for_blackjack, rules.double_after_split,
+            rules.resplit_aces, rules.max_splits, rules.surrender_type)
+
+
+def get_solver(upcard: int, composition: Sequence[int], rules: CasinoRules,
+               packed_key: Optional[int] = None) -> ActionEVSolver:
+    """Solver for an upcard, composition and rules, shared through the LRU cache.
+
+    packed_key is composition_key(composition) when the caller already has it.
+    """
+    if packed_key is None:
+        packed_key = composition_key(composition)
+    key = (upcard, packed_key, _rules_key(rules))
+    with _solvers_lock:
+        solver = _solvers.get(key)
+        if solver is None:
+            solver = _solvers[key] = ActionEVSolver(upcard, composition, rules)
+            if len(_solvers) > EV_CACHE_SIZE:
+                _solvers.popitem(last=False)
+        else:
+            _solvers.move_to_end(key)
+    return solver
+
+
+def calculate_action_evs(state: int, upcard: int, composition: Sequence[int], rules: Optional[CasinoRules] = None,
+                         **legal) -> Dict[Action, float]:
+    """EV of every legal action on a hand; see ActionEVSolver.action_evs() for the keyword arguments."""
+    rules = rules if rules is not None else CasinoRules()
+    return get_solver(upcard, composition, rules).action_evs(state, **legal)
+
+
+class ShoeEVCache:
+    """EV solvers for the unseen cards of one live shoe, kept current card by card.
+
+    The owner reports every card as it becomes visible (card_seen) and every
+    reshuffle (reset). A seen card updates the count and the packed key in
+    place and marks the solvers built for the old composition stale; every
+    EV depends on every count, so they can't be patched, but only the upcards
+    actually queried are rebuilt, once each, and then shared by every hand at
+    the table until the next card. Another thread can solve for a snapshot()
+    taken on the owner's thread while the owner keeps dealing.
+    """
+
+    def __init__(self, rules: CasinoRules, composition: Sequence[int] = ()):
+        """
+        Args:
+            rules: Casino rules
+            composition: Unseen cards by value, indexed 1 (ace) to 10
+        """
+        self.rules = rules
+        self.composition = []
+        self.key = 0
+        self._solvers: Dict[int, ActionEVSolver] = {}  # Upcard -> solver for the current composition
+        self._lock = threading.Lock()  # Cards are seen on the Tk thread while the worker solves
+        self.rebuilds = 0  # Solvers fetched or built since the last reset
+        if composition:
+            self.reset(composition)
+
+    def reset(self, composition: Sequence[int]):
+        """Start over from a new composition, as after a reshuffle."""
+        with self._lock:
+            self.composition = list(composition)
+            self.key = composition_key(composition)
+            self._solvers.clear()
+            self.rebuilds = 0
+
+    def card_seen(self, value: int):
+        """A card of this value (1 = ace ... 10) left the unseen cards."""
+        with self._lock:
+            self.composition[value] -= 1
+            self.key -= ONE_CARD_KEY[value]
+            self._solvers.clear()
+
+    def card_returned(self, value: int):
+        """A card of this value went back among the unseen cards."""
+        with self._lock:
+            self.composition[value] += 1
+            self.key += ONE_CARD_KEY[value]
+            self._solvers.clear()
+
+    def snapshot(self) -> Tuple[int, Tuple[int, ...]]:
+        """(packed key, composition) of the unseen cards right now, to solve for later on any thread."""
+        with self._lock:
+            return self.key, tuple(self.composition)
+
+    def solver(self, upcard: int, snapshot: Optional[Tuple[int, Tuple[int, ...]]] = None) -> ActionEVSolver:
+        """Solver against an upcard for the current composition, or for an earlier snapshot().
+
+        A snapshot the shoe has since moved past is still solved (through the
+        module LRU cache) but doesn't replace the current solvers.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot()
+        key, composition = snapshot
+        with self._lock:
+            solver = self._solvers.get(upcard) if key == self.key else None
+        if solver is None:
+            # A composition seen before in this shoe is still in the module LRU cache
+            solver = get_solver(upcard, composition, self.rules, key)
+            with self._lock:
+                if key == self.key:
+                    self._solvers[upcard] = solver
+                    self.rebuilds += 1
+        return solver
+
+    def action_evs(self, state: int, upcard: int, snapshot: Optional[Tuple[int, Tuple[int, ...]]] = None,
+                   **legal) -> Dict[Action, float]:
+        """EV of every legal action on a hand; see ActionEVSolver.action_evs() for the keyword arguments."""
+        return self.solver(upcard, snapshot).action_evs(state, **legal)
@@ -0,0 +1,153 @@
+"""Precomputed blackjack hand-state transition table.
+
+Every hand is in one of a small, fixed set of states: empty, a single card,
+a two-card pair, two-card hard or soft totals, multi-card hard or soft
+totals, blackjack and bust. TRANSITIONS[state][value] gives the state after
+adding a card of that value (1 = ace ... 10), and the STATE_* tuples hold
+per-state metadata, so adding a card, scoring a hand and the dealer's
+hit/stand decision are all table indexing. Everything is built once at
+import; NumPy copies of the tables support batched simulations, which can
+advance thousands of hands with a single gather.
+"""
+
+from typing import Dict, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the array copies need it
+    np = None
+
+CARD_VALUES_RANGE = range(1, 11)
+
+# (kind, total, detail) for every state, in index order
+_STATE_KEYS: List[Tuple[str, int, int]] = []
+_STATE_INDEX: Dict[Tuple[str, int, int], int] = {}
+
+
+def _add_state(kind: str, total: int = 0, detail: int = 0) -> int:
+    key = (kind, total, detail)
+    _STATE_INDEX[key] = len(_STATE_KEYS)
+    _STATE_KEYS.append(key)
+    return _STATE_INDEX[key]
+
+
+EMPTY = _add_state('empty')
+for _value in CARD_VALUES_RANGE:
+    _add_state('one', 11 if _value == 1 else _value, _value)
+for _value in CARD_VALUES_RANGE:
+    _add_state('pair', 12 if _value == 1 else 2 * _value, _value)
+for _total in range(5, 21):
+    _add_state('hard2', _total)
+for _total in range(13, 21):
+    _add_state('soft2', _total)
+for _total in range(4, 22):
+    _add_state('hard', _total)
+for _total in range(12, 22):
+    _add_state('soft', _total)
+BLACKJACK = _add_state('blackjack', 21)
+BUST = _add_state('bust', 22)
+NUM_STATES = len(_STATE_KEYS)
+
+
+def _describe(state: int) -> Tuple[int, bool, int, int]:
+    """(hard total, has ace, card count capped at 3, first card value) that a state stands for."""
+    kind, total, detail = _STATE_KEYS[state]
+    if kind == 'empty':
+        return 0, False, 0, 0
+    if kind == 'one':
+        return detail, detail == 1, 1, detail
+    if kind == 'pair':
+        return 2 * detail, detail == 1, 2, detail
+    if kind in ('soft2', 'blackjack'):
+        return total - 10, True, 2, 0
+    if kind == 'hard2':
+        return total, False, 2, 0
+    if kind == 'soft':
+        return total - 10, True, 3, 0
+    # A hard total of 12+ can never become soft again, so its ace flag doesn't matter
+    return total, False, 3, 0
+
+
+def _classify(hard_total: int, has_ace: bool, num_cards: int, first_value: int, is_pair: bool) -> int:
+    if num_cards == 0:
+        return EMPTY
+    if num_cards == 1:
+        return _STATE_INDEX[('one', 11 if first_value == 1 else first_value, first_value)]
+    if is_pair:
+        return _STATE_INDEX[('pair', 12 if first_value == 1 else 2 * first_value, first_value)]
+    soft = has_ace and hard_total <= 11
+    total = hard_total + 10 if soft else hard_total
+    if total > 21:
+        return BUST
+    if num_cards == 2:
+        if soft and total == 21:
+            return BLACKJACK
+        return _STATE_INDEX[('soft2' if soft else 'hard2', total, 0)]
+    return _STATE_INDEX[('soft' if soft else 'hard', total, 0)]
+
+
+def _build_transitions() -> Tuple[Tuple[int, ...], ...]:
+    table = []
+    for state in range(NUM_STATES):
+        row = [state]  # Value 0 means "no card" and leaves the state unchanged
+        hard_total, has_ace, num_cards, first_value = _describe(state)
+        for value in CARD_VALUES_RANGE:
+            if state == BUST:
+                row.append(BUST)
+                continue
+            row.append(_classify(hard_total + value, has_ace or value == 1, min(num_cards + 1, 3),
+                                 value if num_cards == 0 else first_value,
+                                 num_cards == 1 and value == first_value))
+        table.append(tuple(row))
+    return tuple(table)
+
+
+# TRANSITIONS[state][value] -> next state (value 1 = ace ... 10; 0 = no card)
+TRANSITIONS = _build_transitions()
+
+# Per-state metadata
+STATE_TOTAL = tuple(total for _, total, _ in _STATE_KEYS)  # Best total; 22 for bust
+STATE_SOFT = tuple(kind in ('soft2', 'soft', 'blackjack') or (kind in ('one', 'pair') and detail == 1)
+                   for kind, _, detail in _STATE_KEYS)
+STATE_BUST = tuple(kind == 'bust' for kind, _, _ in _STATE_KEYS)
+STATE_BLACKJACK = tuple(kind == 'blackjack' for kind, _, _ in _STATE_KEYS)
+STATE_PAIR_VALUE = tuple(detail if kind == 'pair' else 0 for kind, _, detail in _STATE_KEYS)  # 0 = not a pair
+STATE_CAN_DOUBLE = tuple(kind in ('pair', 'hard2', 'soft2') for kind, _, _ in _STATE_KEYS)  # Two-card hands
+STATE_CARD_COUNT = tuple(min(_describe(s)[2], 3) if s != BUST else 3 for s in range(NUM_STATES))  # 3 = three or more
+STATE_NAMES = tuple(f"{kind} {total}" if kind not in ('empty', 'bust') else kind
+                    for kind, total, _ in _STATE_KEYS)
+
+# Dealer decisions per state: hit below 17, and on soft 17 when the dealer hits soft 17
+DEALER_HITS_S17 = tuple(not STATE_BUST[s] and STATE_TOTAL[s] < 17 for s in range(NUM_STATES))
+DEALER_HITS_H17 = tuple(not STATE_BUST[s] and (STATE_TOTAL[s] < 17 or (STATE_TOTAL[s] == 17 and STATE_SOFT[s]))
+                        for s in range(NUM_STATES))
+
+
+def state_after(values, state: int = EMPTY) -> int:
+    """State reached by adding card values (1 = ace ... 10) to a hand in the given state."""
+    for value in values:
+        state = TRANSITIONS[state][value]
+    return state
+
+
+def dealer_hits(state: int, hits_soft_17: bool) -> bool:
+    """True if the dealer must draw to a hand in this state."""
+    return (DEALER_HITS_H17 if hits_soft_17 else DEALER_HITS_S17)[state]
+
+
+if np is not None:
+    TRANSITIONS_ARRAY = np.array(TRANSITIONS, dtype=np.int16)
+    STATE_TOTAL_ARRAY = np.array(STATE_TOTAL, dtype=np.int16)
+    STATE_SOFT_ARRAY = np.array(STATE_SOFT, dtype=bool)
+    STATE_BUST_ARRAY = np.array(STATE_BUST, dtype=bool)
+    STATE_BLACKJACK_ARRAY = np.array(STATE_BLACKJACK, dtype=bool)
+    STATE_PAIR_VALUE_ARRAY = np.array(STATE_PAIR_VALUE, dtype=np.int16)
+    STATE_CAN_DOUBLE_ARRAY = np.array(STATE_CAN_DOUBLE, dtype=bool)
+    STATE_CARD_COUNT_ARRAY = np.array(STATE_CARD_COUNT, dtype=np.int8)
+    DEALER_HITS_S17_ARRAY = np.array(DEALER_HITS_S17, dtype=bool)
+    DEALER_HITS_H17_ARRAY = np.array(DEALER_HITS_H17, dtype=bool)
+    _TRANSITIONS_FLAT = TRANSITIONS_ARRAY.ravel()
+
+    def advance_states(states, values):
+        """Batched TRANSITIONS lookup: next state for every (state, card value) pair, as one gather."""
+        return _TRANSITIONS_FLAT.take(states * TRANSITIONS_ARRAY.shape[1] + values)
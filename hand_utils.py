@@ -1,28 +1,92 @@
 """Utility functions for hand value calculations."""
 
+from cards import CARD_VALUES
+from hand_states import (
+    EMPTY, TRANSITIONS, STATE_TOTAL, STATE_SOFT, STATE_BUST, STATE_BLACKJACK, STATE_PAIR_VALUE
+)
+
 def calculate_hand_value(cards):
     """
     Calculate the value of a blackjack hand.
     
     Args:
-        cards: List of tuples (value, card_repr) representing cards
+        cards: Sequence of card codes (see cards.py)
         
     Returns:
         tuple: (hand_value, is_busted, has_blackjack)
     """
-    total = 0
-    aces = sum(1 for val, _ in cards if val == 1)
-    non_ace_total = sum(val for val, _ in cards if val != 1)
-    total = non_ace_total
-    
-    for _ in range(aces):
-        if total + 11 <= 21:
-            total += 11
-        else:
-            total += 1
+    state = EMPTY
+    hard_total = 0
+    for card in cards:
+        value = CARD_VALUES[card]
+        state = TRANSITIONS[state][value]
+        hard_total += value
     
-    is_busted = total > 21
-    has_blackjack = len(cards) == 2 and total == 21
+    is_busted = STATE_BUST[state]
+    # Bust states don't keep the exact total, so report the hard total instead
+    total = hard_total if is_busted else STATE_TOTAL[state]
+    return total, is_busted, STATE_BLACKJACK[state]
+
+
+def is_soft_hand(cards, hand_value):
+    """
+    Check whether a hand is soft (an ace is currently counted as 11).
     
-    return total, is_busted, has_blackjack
+    Args:
+        cards: Sequence of card codes (see cards.py)
+        hand_value: Value returned by calculate_hand_value for the same cards
+        
+    Returns:
+        bool: True if the hand is soft
+    """
+    hard_total = 0
+    has_ace = False
+    for card in cards:
+        value = CARD_VALUES[card]
+        hard_total += value
+        if value == 1:
+            has_ace = True
+    return has_ace and hand_value > hard_total
+
+
+class HandState:
+    """Incremental hand totals shared by player and dealer hands.
+
+    Every added card advances the hand through the hand_states transition
+    table and copies that state's metadata, so strategy, dealer and
+    settlement code never rescan the card list.
+    """
+
+    def __init__(self):
+        self.reset_state()
+
+    def reset_state(self):
+        self.state = EMPTY  # Index into the hand_states tables
+        self.hard_total = 0  # Total with every ace counted as 1
+        self.num_cards = 0
+        self.first_value = 0  # Value of the first card, for pair and split-ace checks
+        self.is_pair = False  # Exactly two cards of equal value
+        self.soft = False  # An ace is currently counted as 11
+        self.hand_value = 0
+        self.is_busted = False
+        self.has_blackjack = False
+
+    def add_value(self, value: int):
+        """Add one card by blackjack value (ace = 1)."""
+        state = TRANSITIONS[self.state][value]
+        self.state = state
+        self.hard_total += value
+        self.num_cards += 1
+        if self.num_cards == 1:
+            self.first_value = value
+        self.is_pair = STATE_PAIR_VALUE[state] != 0
+        self.soft = STATE_SOFT[state]
+        self.is_busted = STATE_BUST[state]
+        self.has_blackjack = STATE_BLACKJACK[state]
+        self.hand_value = self.hard_total if self.is_busted else STATE_TOTAL[state]
 
+    def rebuild_state(self, cards):
+        """Recompute the state from scratch after cards were removed (e.g. a split)."""
+        self.reset_state()
+        for card in cards:
+            self.add_value(CARD_VALUES[card])
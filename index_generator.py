@@ -0,0 +1,381 @@
+"""Rule-specific index generator.
+
+Published indices are for particular rules and deck counts. This derives
+them for any CasinoRules setup. Shoes are dealt down to random depths. For
+every upcard and two-card hand, the exact EV of each first action is solved
+by ev_engine from the cards still unseen, and filed under the true count the
+player sees at that decision. An index is where an alternative action's
+average EV, taken bucket by bucket, crosses the chart's play.
+
+A random tilt towards removing low or high cards makes the rarer counts come
+up more often. Each evaluation is still filed under its own true count, so
+the tilt mostly changes how many samples each bucket gets.
+
+Work is split into tasks of one upcard and one batch of shoes. They run
+across a process pool, and each task's EV sums are cached on disk. A rerun
+therefore resumes where it stopped, and asking for more samples only solves
+the new batches:
+
+    python index_generator.py --decks 8 --h17 --samples 2000 --workers 8 --output h17_indices.txt
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from blackjack_strategy import CHART_CODES, Action
+from casino_rules import CasinoRules
+from constants import DEFAULT_NUM_DECKS, INDEX_CACHE_DIR
+from counting_systems import DEFAULT_COUNTING_SYSTEM, get_counting_system
+from deck import DECK_COMPOSITION
+from ev_engine import ActionEVSolver
+from hand_states import BLACKJACK, STATE_PAIR_VALUE, STATE_SOFT, STATE_TOTAL, state_after
+from index_plays import SURRENDER, IndexPlay, format_index_play
+from strategy_generator import ACTION_LETTERS, UPCARDS, generate_strategy, strategy_rules
+
+GENERATOR_VERSION = 1  # Bump when the calculation changes so cached task tables are ignored
+TC_LIMIT = 12  # Decision true counts are bucketed by floor() and clipped to +/- this
+BATCH_SAMPLES = 25  # Shoes per task, i.e. per cached table
+MAX_TILT = 0.2  # Largest bias towards removing cards of one sign of tag, as a log weight
+MIN_SAMPLES = 8  # Shoes' worth of hands a bucket needs before its EVs are trusted for a crossover
+INSURANCE = 'insurance'
+
+# Every two-card hand by chart cell: (hand type, row) -> [(first card, second card, hand state)]
+HAND_COMBOS: Dict[Tuple[str, int], List[Tuple[int, int, int]]] = {}
+for _first in range(1, 11):
+    for _second in range(_first, 11):
+        _state = state_after([_first, _second])
+        if _state == BLACKJACK:
+            continue
+        if STATE_PAIR_VALUE[_state]:
+            _cell = ('pairs', STATE_PAIR_VALUE[_state])
+        else:
+            _cell = ('soft' if STATE_SOFT[_state] else 'hard', STATE_TOTAL[_state])
+        HAND_COMBOS.setdefault(_cell, []).append((_first, _second, _state))
+
+
+# --- Sampling and solving ---
+
+def sample_shoe(rng: random.Random, num_decks: int, max_depth: int, tags: Sequence[float]) -> List[int]:
+    """Unseen cards by value (index 1 = ace ... 10) after dealing a random number of cards up to max_depth.
+
+    Cards are removed with a random tilt towards one sign of tag, so shoes
+    with large counts either way turn up often.
+    """
+    counts = [count * num_decks for count in DECK_COMPOSITION]
+    tilt = rng.uniform(-MAX_TILT, MAX_TILT)
+    bias = [0.0] + [math.exp(tilt * tag) for tag in tags]
+    values = range(1, 11)
+    for _ in range(rng.randint(0, max_depth)):
+        value = rng.choices(values, [counts[v] * bias[v] for v in values])[0]
+        counts[value] -= 1
+    return counts
+
+
+def _bucket(true_count: float) -> int:
+    return min(max(math.floor(true_count), -TC_LIMIT), TC_LIMIT)
+
+
+def _run_task(upcard: int, batch: int, setup: dict) -> dict:
+    """EV sums for every hand against one upcard over one batch of sampled shoes.
+
+    Returns:
+        dict: {'samples': shoes used, 'cells': {"hand_type row": {bucket: [weight, weighted true count,
+        {action letter: weighted EV}]}}, 'insurance': {bucket: [weight, weighted true count,
+        weighted EV of insurance per unit insured]}}
+    """
+    rules, num_decks = setup['rules'], setup['num_decks']
+    system = get_counting_system(setup['system'])
+    rng = random.Random(f"{setup['seed']}-{upcard}-{batch}")
+    full = [count * num_decks for count in DECK_COMPOSITION]
+    total_cards = sum(full)
+    max_depth = total_cards - rules.get_cut_card_position(total_cards)
+    legal = dict(can_split=rules.max_splits > 0, can_surrender=rules.surrender_available,
+                 dealer_checked=rules.dealer_peeks_for_blackjack)
+    cells, insurance, samples = {}, {}, 0
+
+    for _ in range(setup['batch_samples']):
+        shoe = sample_shoe(rng, num_decks, max_depth, system.tags)
+        if not shoe[upcard]:
+            continue
+        samples += 1
+        shoe[upcard] -= 1
+        remaining = sum(shoe)
+        for (hand_type, row), combos in HAND_COMBOS.items():
+            cell = cells.setdefault(f"{hand_type} {row}", {})
+            for first, second, state in combos:
+                if shoe[first] < 1 + (first == second) or shoe[second] < 1:
+                    continue
+                # Probability of being dealt this combination, in either order
+                weight = shoe[first] * (shoe[second] - (first == second)) / (remaining * (remaining - 1))
+                weight *= 1 if first == second else 2
+                unseen = list(shoe)
+                unseen[first] -= 1
+                unseen[second] -= 1
+                seen = [a - b for a, b in zip(full, unseen)]
+                cards_unseen = remaining - 2
+                true_count = system.true_count(system.running_count(seen), total_cards - cards_unseen,
+                                               cards_unseen)
+                bucket = _bucket(true_count)
+                evs = ActionEVSolver(upcard, unseen, rules).action_evs(state, **legal)
+                summed = cell.setdefault(bucket, [0.0, 0.0, {}])
+                summed[0] += weight
+                summed[1] += weight * true_count
+                for action, ev in evs.items():
+                    letter = ACTION_LETTERS[action]
+                    summed[2][letter] = summed[2].get(letter, 0.0) + weight * ev
+                if upcard == 1:
+                    # Insurance pays 2:1 on a ten in the hole, from the cards unseen once the hand is dealt
+                    summed = insurance.setdefault(bucket, [0.0, 0.0, 0.0])
+                    summed[0] += weight
+                    summed[1] += weight * true_count
+                    summed[2] += weight * (3 * unseen[10] / cards_unseen - 1)
+    return {'samples': samples, 'cells': cells, 'insurance': insurance}
+
+
+# --- Cached task tables ---
+
+def _setup_key(setup: dict) -> str:
+    rules = setup['rules']
+    system = get_counting_system(setup['system'])
+    key = dict(strategy_rules(rules, setup['num_decks']), **rules.get_shoe_policy(), system=system.name,
+               tags=list(system.tags), batch_samples=setup['batch_samples'], seed=setup['seed'], tilt=MAX_TILT,
+               tc_limit=TC_LIMIT, version=GENERATOR_VERSION)
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _save_table(path: str, table: dict):
+    temporary = path + ".tmp"
+    with open(temporary, 'w') as f:
+        json.dump(table, f)
+    os.replace(temporary, path)  # A run killed mid-write never leaves a partial table
+
+
+def _merge(total: dict, table: dict):
+    total['samples'] += table['samples']
+    for name, buckets in table['cells'].items():
+        cell = total['cells'].setdefault(name, {})
+        for bucket, (weight, true_count, sums) in buckets.items():
+            merged = cell.setdefault(int(bucket), [0.0, 0.0, {}])
+            merged[0] += weight
+            merged[1] += true_count
+            for letter, ev in sums.items():
+                merged[2][letter] = merged[2].get(letter, 0.0) + ev
+    for bucket, (weight, true_count, ev) in table['insurance'].items():
+        merged = total['insurance'].setdefault(int(bucket), [0.0, 0.0, 0.0])
+        merged[0] += weight
+        merged[1] += true_count
+        merged[2] += ev
+
+
+def compute_ev_tables(rules: Optional[CasinoRules] = None, num_decks: int = DEFAULT_NUM_DECKS,
+                      system=DEFAULT_COUNTING_SYSTEM, samples: int = 1000, workers: Optional[int] = None,
+                      seed: int = 0, cache_dir: Optional[str] = INDEX_CACHE_DIR, progress=None) -> Dict[int, dict]:
+    """Average-able EV sums by true count for every hand and upcard.
+
+    Args:
+        rules: Casino rules, including penetration (defaults to CasinoRules())
+        num_decks: Decks in the shoe
+        system: Counting system the true counts are taken with
+        samples: Sampled shoes per upcard (rounded up to whole batches of BATCH_SAMPLES)
+        workers: Worker processes (defaults to the CPU count)
+        seed: Base seed; with the rules it names the cached tables, so changing it starts afresh
+        cache_dir: Directory of cached task tables; None disables it
+        progress: Called with (finished tasks, total tasks) as tasks complete
+
+    Returns:
+        dict: upcard -> merged task tables (see _run_task())
+    """
+    rules = rules if rules is not None else CasinoRules()
+    workers = workers or os.cpu_count() or 1
+    setup = {'rules': rules, 'num_decks': num_decks, 'system': get_counting_system(system).name,
+             'batch_samples': BATCH_SAMPLES, 'seed': seed}
+    directory = os.path.join(cache_dir, _setup_key(setup)) if cache_dir else None
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tasks = [(upcard, batch) for upcard in UPCARDS for batch in range(math.ceil(samples / BATCH_SAMPLES))]
+    tables = {upcard: {'samples': 0, 'cells': {}, 'insurance': {}} for upcard in UPCARDS}
+    pending = []
+    for upcard, batch in tasks:
+        path = os.path.join(directory, f"{upcard}-{batch}.json") if directory else None
+        try:
+            with open(path) as f:
+                _merge(tables[upcard], json.load(f))
+        except (TypeError, OSError, ValueError, KeyError):
+            pending.append((upcard, batch, path))  # Not cached yet, or unreadable; solve it again
+    done = len(tasks) - len(pending)
+
+    def finished(upcard, path, table):
+        nonlocal done
+        if path:
+            _save_table(path, table)
+        _merge(tables[upcard], json.loads(json.dumps(table)))  # Same str bucket keys as a cached table
+        done += 1
+        if progress:
+            progress(done, len(tasks))
+
+    if workers > 1 and pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_run_task, upcard, batch, setup): (upcard, path) for upcard, batch, path in pending}
+            for future in as_completed(futures):
+                finished(*futures[future], future.result())
+    else:
+        for upcard, batch, path in pending:
+            finished(upcard, path, _run_task(upcard, batch, setup))
+    return tables
+
+
+# --- Crossovers ---
+
+def crossover(points: Sequence[Tuple[float, float, float]]) -> Optional[Tuple[float, bool]]:
+    """True count at which a gain changes sign.
+
+    Args:
+        points: (true count, gain, weight) per bucket
+
+    Returns:
+        (root, rising), rising if the gain is positive above the root. Of several sign changes
+        the best-supported one is used; the root is a weighted straight-line fit to the buckets
+        within two counts of it. None if the gain never changes sign, or the fit doesn't agree
+        that it does (noise in thinly sampled buckets).
+    """
+    points = sorted(points)
+    changes = [(p, q) for p, q in zip(points, points[1:]) if (p[1] < 0) != (q[1] < 0)]
+    if not changes:
+        return None
+    low, high = max(changes, key=lambda pair: min(pair[0][2], pair[1][2]))
+    middle = (low[0] + high[0]) / 2
+    reach = max(2.0, (high[0] - low[0]) / 2)  # Always takes in the two buckets either side
+    nearby = [point for point in points if abs(point[0] - middle) <= reach]
+    weight = sum(w for _, _, w in nearby)
+    mean_tc = sum(tc * w for tc, _, w in nearby) / weight
+    mean_gain = sum(gain * w for _, gain, w in nearby) / weight
+    spread = sum(w * (tc - mean_tc) ** 2 for tc, _, w in nearby)
+    slope = sum(w * (tc - mean_tc) * (gain - mean_gain) for tc, gain, w in nearby) / spread if spread else 0.0
+    rising = high[1] > low[1]
+    if slope == 0 or (slope > 0) != rising:
+        return None
+    root = mean_tc - mean_gain / slope
+    return min(max(root, low[0]), high[0]), rising
+
+
+def _points(buckets: dict, samples: int, gain) -> List[Tuple[float, float, float]]:
+    """(mean true count, mean gain, weight) of each bucket with at least MIN_SAMPLES shoes' worth of hands."""
+    least = MIN_SAMPLES * sum(bucket[0] for bucket in buckets.values()) / max(samples, 1)
+    return [(true_count / weight, gain(sums) / weight, weight)
+            for weight, true_count, sums in buckets.values() if weight and weight >= least]
+
+
+def find_indices(tables: Dict[int, dict], rules: CasinoRules, num_decks: int) -> List[Dict[str, object]]:
+    """Every crossover between the chart's play and an alternative first action.
+
+    Playing alternatives are measured against the chart's play without
+    surrender; surrender against the best of the other actions.
+
+    Returns:
+        list of dicts: 'hand_type', 'row', 'upcard', 'chart' and 'alternative' (action letters),
+        'root' (true count), 'rising' (the alternative wins above the root) and 'play' (an IndexPlay)
+    """
+    chart = generate_strategy(rules, num_decks)['chart']
+    results = []
+    for upcard in UPCARDS:
+        samples = tables[upcard]['samples']
+        for name, buckets in tables[upcard]['cells'].items():
+            hand_type, row = name.split()
+            row = int(row)
+            first, fallback = CHART_CODES[chart[hand_type][row][upcard]]
+            play = ACTION_LETTERS[fallback if first == Action.SURRENDER else first]
+            available = set().union(*(sums for _, _, sums in buckets.values()))
+            for alternative in sorted(available - {play, SURRENDER}):
+                found = crossover(_points(buckets, samples, lambda sums: sums[alternative] - sums[play]))
+                if found:
+                    root, rising = found
+                    index = round(root)
+                    results.append(dict(hand_type=hand_type, row=row, upcard=upcard, chart=play,
+                                        alternative=alternative, root=root, rising=rising,
+                                        play=IndexPlay(hand_type, row, upcard, index, alternative, play) if rising
+                                        else IndexPlay(hand_type, row, upcard, index, play, alternative)))
+            if SURRENDER in available:
+                others = sorted(available - {SURRENDER})
+                found = crossover(_points(buckets, samples,
+                                          lambda sums: sums[SURRENDER] - max(sums[a] for a in others)))
+                if found and found[1]:  # Only "surrender at or above" can be played as an index
+                    results.append(dict(hand_type=hand_type, row=row, upcard=upcard, chart=play,
+                                        alternative=SURRENDER, root=found[0], rising=True,
+                                        play=IndexPlay(hand_type, row, upcard, round(found[0]), SURRENDER)))
+    return results
+
+
+def insurance_index(tables: Dict[int, dict]) -> Optional[float]:
+    """True count at which insurance becomes a good bet, or None if it never does in the sampled range."""
+    aces = tables[1]
+    found = crossover(_points(aces['insurance'], aces['samples'], lambda ev: ev))
+    return found[0] if found and found[1] else None
+
+
+def select_index_plays(results: Sequence[Dict[str, object]]) -> List[IndexPlay]:
+    """One playing index and one surrender index per hand and upcard, as IndexedStrategy needs.
+
+    Where several alternatives cross the chart's play, the one at the count nearest zero is kept.
+    """
+    chosen = {}
+    for result in sorted(results, key=lambda result: -abs(result['root'])):
+        play = result['play']
+        chosen[play.hand_type, play.row, play.upcard, play.action == SURRENDER] = play
+    return list(chosen.values())
+
+
+# --- Command line ---
+
+def format_indices(results: Sequence[Dict[str, object]], limit: float) -> str:
+    lines = [f"{'Hand':<10}{'Up':>4}{'Chart':>7}{'Alt':>5}{'TC':>8}  Play"]
+    for result in sorted(results, key=lambda result: (result['hand_type'], -result['row'], result['upcard'])):
+        if abs(result['root']) > limit:
+            continue
+        upcard = 'A' if result['upcard'] == 1 else result['upcard']
+        when = "at or above" if result['rising'] else "below"
+        lines.append(f"{result['hand_type'] + ' ' + str(result['row']):<10}{upcard:>4}{result['chart']:>7}"
+                     f"{result['alternative']:>5}{result['root']:>+8.2f}  {result['alternative']} {when}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    from batch_simulator import add_rules_arguments, build_rules
+    parser = argparse.ArgumentParser(description="Generate count indices for a set of casino rules.")
+    parser.add_argument("--system", default=DEFAULT_COUNTING_SYSTEM, help="Counting system")
+    parser.add_argument("--samples", type=int, default=1000, help="Sampled shoes per upcard")
+    parser.add_argument("--limit", type=float, default=8, help="Leave out indices beyond this true count")
+    parser.add_argument("--decks", type=int, default=DEFAULT_NUM_DECKS, help="Number of decks in the shoe")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (part of the cache key)")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write cached EV tables")
+    parser.add_argument("--output", default=None, help="Write the chosen index plays here, one per line")
+    add_rules_arguments(parser)
+    args = parser.parse_args(argv)
+
+    rules = build_rules(args)
+    start = time.perf_counter()
+    tables = compute_ev_tables(rules, args.decks, args.system, args.samples, args.workers, args.seed,
+                               cache_dir=None if args.no_cache else INDEX_CACHE_DIR,
+                               progress=lambda done, total: print(f"\rTasks {done}/{total}", end="", flush=True))
+    results = find_indices(tables, rules, args.decks)
+    print(f"\r{format_indices(results, args.limit)}")
+    insurance = insurance_index(tables)
+    print(f"\nInsurance: {'never' if insurance is None else f'take at {insurance:+.2f}'}")
+    if args.output:
+        plays = [play for play in select_index_plays(results) if abs(play.index) <= args.limit]
+        with open(args.output, 'w') as f:
+            f.write("".join(format_index_play(play) + "\n" for play in plays))
+        print(f"{len(plays)} index plays written to {args.output}")
+    print(f"Elapsed: {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""Count-based strategy deviations (index plays).
+
+An index play changes one chart cell once the true count reaches its index,
+e.g. "stand on 16 vs 10 at true count 0 or higher, otherwise hit".
+IndexedStrategy layers a set of them over a CompiledStrategy. Each compiled
+table gets three dense tables next to it: the index of each cell, the action
+below the index, and the action at or above it. A decision is then the same
+single lookup plus one comparison with the true count, and lookup_batch()
+does the same for whole arrays of hands in vectorized simulations.
+
+The Illustrious 18 and Fab 4 below are the published Hi-Lo indices for
+multi-deck games. User indices can be added in the same form or parsed from
+text (parse_index_play()); index_generator derives a full set for other
+rules. Measure what a set of deviations is worth:
+
+    python index_plays.py --decks 6 --penetration 0.8 --rounds 50000000 --play "p9v7:P@3/S"
+"""
+
+import argparse
+import math
+import re
+from typing import Dict, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the batch API needs it
+    np = None
+
+from blackjack_strategy import CHART_CODES, NUM_UPCARDS, CompiledStrategy, get_compiled_strategy
+from hand_states import NUM_STATES, STATE_SOFT, STATE_TOTAL
+
+INSURANCE_INDEX = 3  # Take insurance at this true count or higher
+
+HAND_TYPES = ('hard', 'soft', 'pairs')
+PLAY_LETTERS = ('H', 'S', 'D', 'P')  # Chart letters an index play can switch between
+SURRENDER = 'R'
+
+
+class IndexPlay:
+    """Play action at true count index or higher, and otherwise below it.
+
+    Actions are chart letters: H, S, D or P, or R for a surrender index.
+    A surrender index leaves otherwise as None: below the index the hand is
+    played as the chart plays it without surrendering. Doubling and surrender
+    keep the chart's fallback for when they aren't allowed.
+    """
+
+    def __init__(self, hand_type: str, row: int, upcard: int, index: float, action: str,
+                 otherwise: Optional[str] = None):
+        """
+        Args:
+            hand_type: 'hard', 'soft' or 'pairs', as in the chart
+            row: Chart row, i.e. the total, or the pair card value (1 = aces)
+            upcard: Dealer upcard value (1 = ace ... 10)
+            index: True count at which action takes over
+            action: Chart letter played at or above the index
+            otherwise: Chart letter played below it; None for a surrender index
+        """
+        if hand_type not in HAND_TYPES:
+            raise ValueError(f"hand type must be one of {', '.join(HAND_TYPES)}, got {hand_type!r}")
+        if not 1 <= upcard <= 10:
+            raise ValueError(f"upcard must be 1 (ace) to 10, got {upcard}")
+        if action == SURRENDER:
+            if otherwise is not None:
+                raise ValueError("a surrender index plays the chart below its index, so otherwise must be None")
+        elif action not in PLAY_LETTERS or otherwise not in PLAY_LETTERS:
+            raise ValueError(f"index play actions must be chart letters H, S, D or P (or R alone), "
+                             f"got {action!r} and {otherwise!r}")
+        self.hand_type = hand_type
+        self.row = row
+        self.upcard = upcard
+        self.index = index
+        self.action = action
+        self.otherwise = otherwise
+
+    def as_tuple(self) -> tuple:
+        return self.hand_type, self.row, self.upcard, self.index, self.action, self.otherwise
+
+    def __eq__(self, other):
+        return isinstance(other, IndexPlay) and self.as_tuple() == other.as_tuple()
+
+    def __hash__(self):
+        return hash(self.as_tuple())
+
+    def __repr__(self):
+        return f"IndexPlay{self.as_tuple()!r}"
+
+
+# Illustrious 18 playing indices (insurance, the 18th, is INSURANCE_INDEX)
+ILLUSTRIOUS_18 = (
+    IndexPlay('hard', 16, 10, 0, 'S', 'H'),
+    IndexPlay('hard', 15, 10, 4, 'S', 'H'),
+    IndexPlay('pairs', 10, 5, 5, 'P', 'S'),
+    IndexPlay('pairs', 10, 6, 4, 'P', 'S'),
+    IndexPlay('hard', 10, 10, 4, 'D', 'H'),
+    IndexPlay('hard', 12, 3, 2, 'S', 'H'),
+    IndexPlay('hard', 12, 2, 3, 'S', 'H'),
+    IndexPlay('hard', 11, 1, 1, 'D', 'H'),
+    IndexPlay('hard', 9, 2, 1, 'D', 'H'),
+    IndexPlay('hard', 10, 1, 4, 'D', 'H'),
+    IndexPlay('hard', 9, 7, 3, 'D', 'H'),
+    IndexPlay('hard', 16, 9, 5, 'S', 'H'),
+    IndexPlay('hard', 13, 2, -1, 'S', 'H'),
+    IndexPlay('hard', 12, 4, 0, 'S', 'H'),
+    IndexPlay('hard', 12, 5, -2, 'S', 'H'),
+    IndexPlay('hard', 12, 6, -1, 'S', 'H'),
+    IndexPlay('hard', 13, 3, -2, 'S', 'H'),
+)
+
+# Fab 4 late surrender indices
+FAB_4 = (
+    IndexPlay('hard', 14, 10, 3, SURRENDER),
+    IndexPlay('hard', 15, 10, 0, SURRENDER),
+    IndexPlay('hard', 15, 9, 2, SURRENDER),
+    IndexPlay('hard', 15, 1, 1, SURRENDER),
+)
+
+DEFAULT_INDEX_PLAYS = ILLUSTRIOUS_18 + FAB_4
+
+_PLAY_PATTERN = re.compile(r"^([ps]?)(A|\d+)v(A|\d+):([HSDPR])@([-+]?\d+(?:\.\d+)?)(?:/([HSDP]))?$", re.IGNORECASE)
+
+
+def parse_index_play(text: str) -> IndexPlay:
+    """Index play from text like "16v10:S@0/H" (stand 16 vs 10 at TC 0 or higher, else hit).
+
+    Prefix the hand with s for a soft total ("s18v2:D@1/S") or p for a pair
+    by card value ("p10v6:P@4/S", "pAvA:..."); a surrender index has no
+    otherwise part ("15v9:R@2").
+
+    Raises:
+        ValueError: If the text isn't an index play
+    """
+    match = _PLAY_PATTERN.match(text.strip())
+    if not match:
+        raise ValueError(f"expected an index play like 16v10:S@0/H, got {text!r}")
+    prefix, row, upcard, action, index, otherwise = match.groups()
+    hand_type = {'': 'hard', 's': 'soft', 'p': 'pairs'}[prefix.lower()]
+    index = float(index)
+    return IndexPlay(hand_type, 1 if row.upper() == 'A' else int(row), 1 if upcard.upper() == 'A' else int(upcard),
+                     int(index) if index.is_integer() else index, action.upper(),
+                     otherwise.upper() if otherwise else None)
+
+
+def format_index_play(play: IndexPlay) -> str:
+    """Text form of an index play, as read by parse_index_play()."""
+    prefix = {'hard': '', 'soft': 's', 'pairs': 'p'}[play.hand_type]
+    row = 'A' if play.hand_type == 'pairs' and play.row == 1 else play.row
+    upcard = 'A' if play.upcard == 1 else play.upcard
+    return f"{prefix}{row}v{upcard}:{play.action}@{play.index:g}" + (f"/{play.otherwise}" if play.otherwise else "")
+
+
+# --- Layering over a chart ---
+
+def _split_code(code: str) -> Tuple[str, str]:
+    """Chart code -> (first action letter, fallback letter), e.g. 'Ds' -> ('D', 'S')."""
+    first, later = CHART_CODES.get(code, CHART_CODES['H'])
+    letters = 'HSDPR'
+    return letters[first], letters[later]
+
+
+def _join_code(first: str, fallback: str) -> str:
+    if first == fallback:
+        return first
+    return first if fallback == 'H' else first + fallback.lower()
+
+
+def _apply(code: str, play: IndexPlay, at_or_above: bool) -> str:
+    """A chart cell's code with one index play applied on one side of its index."""
+    first, fallback = _split_code(code)
+    letter = play.action if at_or_above else play.otherwise
+    if play.action == SURRENDER:
+        if at_or_above:
+            first = SURRENDER
+        elif first == SURRENDER:
+            first = fallback  # No surrender below the index
+    elif letter == 'D':
+        first, fallback = 'D', fallback if fallback == 'S' else 'H'
+    else:
+        # A playing index keeps a surrender the chart makes, and changes what happens without it
+        first, fallback = (first if first == SURRENDER else letter), letter
+    return _join_code(first, fallback)
+
+
+def _implied_row(chart: dict, hand_type: str, row: int) -> dict:
+    """Codes for a row the chart leaves out, as the chart plays it: by total for a pair, else hit or stand."""
+    if hand_type == 'pairs':
+        hand_type, row = ('soft', 12) if row == 1 else ('hard', 2 * row)
+        if row in chart[hand_type]:
+            return dict(chart[hand_type][row])
+    rows = chart[hand_type]
+    code = 'S' if row >= 21 or (rows and row > max(rows)) else 'H'
+    return {upcard: code for upcard in range(1, NUM_UPCARDS)}
+
+
+def _chart_at(chart: dict, plays: Sequence[IndexPlay], true_count: float) -> dict:
+    """The chart with every index play applied at a true count; surrender indices go last."""
+    chart = {hand_type: {row: dict(cells) for row, cells in rows.items()} for hand_type, rows in chart.items()}
+    for play in sorted(plays, key=lambda play: play.action == SURRENDER):
+        if play.row not in chart[play.hand_type]:
+            chart[play.hand_type][play.row] = _implied_row(chart, play.hand_type, play.row)
+        cells = chart[play.hand_type][play.row]
+        cells[play.upcard] = _apply(cells.get(play.upcard, 'H'), play, true_count >= play.index)
+    return chart
+
+
+class IndexedStrategy:
+    """A compiled strategy with index plays layered over it, looked up at a true count."""
+
+    def __init__(self, base, plays: Sequence[IndexPlay] = DEFAULT_INDEX_PLAYS,
+                 insurance_index: Optional[float] = INSURANCE_INDEX):
+        """
+        Args:
+            base: Strategy name from PLAYING_STRATEGIES or a CompiledStrategy
+            plays: Index plays to layer over it. A later play for the same cell replaces
+                an earlier one of the same kind (playing or surrender), so user indices
+                can follow the defaults and override them
+            insurance_index: True count to take insurance at; None never takes it
+
+        Raises:
+            ValueError: If the plays change one cell more than once for any combination
+                of "can split" and "can double or surrender"
+        """
+        self.base = get_compiled_strategy(base)
+        by_cell = {}
+        for play in plays:
+            by_cell[play.hand_type, play.row, play.upcard, play.action == SURRENDER] = play
+        self.plays = tuple(by_cell.values())
+        self.insurance_index = insurance_index
+
+        # The chart is constant between consecutive indices, so compile it once per stretch
+        indices = sorted({play.index for play in self.plays})
+        starts = [-math.inf] + indices
+        stretches = [CompiledStrategy(_chart_at(self.base.strategy, self.plays, indices[0] - 1 if indices else 0))]
+        stretches += [CompiledStrategy(_chart_at(self.base.strategy, self.plays, index)) for index in indices]
+
+        self.cells = {key: self._compile(key, starts, stretches) for key in self.base.tables}
+        if np is not None:
+            self.index_arrays, self.below_arrays, self.above_arrays = {}, {}, {}
+            for key, table in self.cells.items():
+                self.index_arrays[key] = np.array([[cell[0] for cell in row] for row in table]).ravel()
+                self.below_arrays[key] = np.array([[cell[1] for cell in row] for row in table], dtype=np.int8).ravel()
+                self.above_arrays[key] = np.array([[cell[2] for cell in row] for row in table], dtype=np.int8).ravel()
+
+    @staticmethod
+    def _compile(key, starts, stretches):
+        """(index, action below, action at or above) for every state and upcard of one table variant."""
+        table = []
+        for state in range(NUM_STATES):
+            row = []
+            for upcard in range(NUM_UPCARDS):
+                actions = [stretch.tables[key][state][upcard] for stretch in stretches]
+                changes = [i for i in range(1, len(actions)) if actions[i] != actions[i - 1]]
+                if len(changes) > 1:
+                    hand = f"{'soft' if STATE_SOFT[state] else 'hard'} {STATE_TOTAL[state]}"
+                    raise ValueError(f"index plays change {hand} vs {upcard} more than once "
+                                     f"(at {', '.join(f'{starts[i]:+g}' for i in changes)})")
+                index = starts[changes[0]] if changes else math.inf
+                row.append((index, actions[0], actions[-1]))
+            table.append(tuple(row))
+        return tuple(table)
+
+    def lookup(self, state: int, dealer_upcard_value: int, true_count: float, ignore_pairs: bool = False,
+               allow_double: bool = True):
+        """Action for one hand state at a true count; the arguments are otherwise as for CompiledStrategy.lookup()."""
+        index, below, at_or_above = self.cells[ignore_pairs, allow_double][state][dealer_upcard_value]
+        return at_or_above if true_count >= index else below
+
+    def lookup_batch(self, states, dealer_upcard_values, true_counts, ignore_pairs: bool = False,
+                     allow_double: bool = True):
+        """Action codes for arrays of hand states, upcards and true counts (broadcast together).
+
+        Returns:
+            np.ndarray of int8 Action codes
+        """
+        key = ignore_pairs, allow_double
+        cells = np.asarray(states) * NUM_UPCARDS + dealer_upcard_values
+        return np.where(true_counts >= self.index_arrays[key].take(cells),
+                        self.above_arrays[key].take(cells), self.below_arrays[key].take(cells))
+
+    def take_insurance(self, true_count: float) -> bool:
+        return self.insurance_index is not None and true_count >= self.insurance_index
+
+
+_indexed_cache: Dict[tuple, IndexedStrategy] = {}
+
+
+def get_indexed_strategy(base, plays: Sequence[IndexPlay] = DEFAULT_INDEX_PLAYS,
+                         insurance_index: Optional[float] = INSURANCE_INDEX) -> IndexedStrategy:
+    """IndexedStrategy for a base strategy and set of plays, built once and reused."""
+    base = get_compiled_strategy(base)
+    key = (base, tuple(plays), insurance_index)
+    indexed = _indexed_cache.get(key)
+    if indexed is None:
+        indexed = _indexed_cache[key] = IndexedStrategy(base, plays, insurance_index)
+    return indexed
+
+
+# --- Command line ---
+
+def main(argv=None):
+    from batch_simulator import add_rules_arguments, build_rules
+    from constants import DEFAULT_NUM_DECKS
+    from count_tables import TC_LIMIT, TrueCountStats
+    from counting_benchmark import simulate_count_tables
+    from counting_systems import DEFAULT_COUNTING_SYSTEM
+
+    parser = argparse.ArgumentParser(description="Measure the value of index plays by simulation.")
+    parser.add_argument("--system", default=DEFAULT_COUNTING_SYSTEM, help="Counting system the indices are for")
+    parser.add_argument("--play", action="append", default=[], metavar="16v10:S@0/H",
+                        help="Add an index play (repeatable)")
+    parser.add_argument("--plays-file", default=None, help="Add the index plays in this file, one per line "
+                        "(e.g. from index_generator.py)")
+    parser.add_argument("--insurance-index", type=float, default=INSURANCE_INDEX,
+                        help="Take insurance at this true count or higher")
+    parser.add_argument("--no-defaults", action="store_true", help="Leave out the Illustrious 18 and Fab 4")
+    parser.add_argument("--rounds", type=int, default=20_000_000, help="Rounds to simulate, with and without plays")
+    parser.add_argument("--spread", type=float, default=8, help="Largest bet in units of the smallest")
+    parser.add_argument("--decks", type=int, default=DEFAULT_NUM_DECKS, help="Number of decks in the shoe")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    add_rules_arguments(parser, default_penetration=0.75)
+    args = parser.parse_args(argv)
+
+    try:
+        texts = list(args.play)
+        if args.plays_file:
+            with open(args.plays_file) as f:
+                texts = [line for line in f if line.strip() and not line.startswith('#')] + texts
+        plays = (() if args.no_defaults else DEFAULT_INDEX_PLAYS) + tuple(parse_index_play(p) for p in texts)
+        IndexedStrategy('Basic', plays)  # Reject conflicting plays before simulating
+    except (OSError, ValueError) as error:
+        raise SystemExit(str(error))
+    rules = build_rules(args)
+    results = {}
+    indexed_options = {'index_plays': plays, 'insurance_index': args.insurance_index}
+    for label, options in (("Chart", {}), ("Indices", indexed_options)):
+        tables, _ = simulate_count_tables([args.system], args.rounds, rules, args.decks, workers=args.workers,
+                                          seed=args.seed, **options)
+        table = tables[args.system]
+        results[label] = TrueCountStats.from_totals(args.system, "", table.rounds.tolist(), table.total.tolist(),
+                                                   table.total_sq.tolist())
+
+    chart, indexed = results["Chart"], results["Indices"]
+    print(f"{'TC':>4}{'Chart EV':>10}{'Indices EV':>12}{'Gain':>9}")
+    for bucket in range(len(chart.ev)):
+        if chart.frequency[bucket] >= 0.001:
+            print(f"{bucket - TC_LIMIT:>+4}{chart.ev[bucket]:>+10.3%}{indexed.ev[bucket]:>+12.3%}"
+                  f"{indexed.ev[bucket] - chart.ev[bucket]:>+9.3%}")
+    for label, stats in results.items():
+        flat = sum(f * ev for f, ev in zip(stats.frequency, stats.ev))
+        second_moment = sum(f * (v + ev * ev) for f, ev, v in zip(stats.frequency, stats.ev, stats.variance))
+        error = math.sqrt(max(second_moment - flat * flat, 0.0) / max(stats.rounds, 1))
+        ramp = stats.best_ramp(args.spread)
+        print(f"{label:<8} flat EV {flat:+.3%} (SE {error:.3%})  win/100 {ramp['win_rate']:.3f} units  SCORE {ramp['score']:.2f} "
+              f"(1-{args.spread:g} spread, {stats.rounds:,} rounds)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,22 @@
+import time
 import tkinter as tk
-import random
-from deck import Deck
-from player import Player, Hand
+from player import Player
 from dealer import Dealer
-from blackjack_strategy import get_recommendation, get_bet_amount
+from table_engine import TableEngine
+from blackjack_strategy import ACTION_BY_LABEL, ACTION_LABELS, Action
 from statistics import CardCounting
 from strategy_explanation import get_strategy_explanation, get_hand_type_description
-from probability_calculator import get_action_probabilities, calculate_bust_probability
+from probability_calculator import calculate_bust_probability, estimate_action_evs, np
+from probability_worker import ProbabilityWorker
 from casino_rules import CasinoRules
+from count_tables import load_count_stats
+from index_plays import DEFAULT_INDEX_PLAYS, INSURANCE_INDEX
 from bankroll_manager import BankrollManager
 from session_stats import SessionStatistics
 from constants import (
     BG_COLOR, WHITE, GREEN, RED, BLUE, YELLOW, DEFAULT_NUM_DECKS,
-    BLACKJACK_PAYOUT_MULTIPLIER, DEFAULT_AUTOPLAY_SPEED, AUTOPLAY_RESULTS_DELAY,
-    STATUS_ACTIVE, STATUS_STAND, STATUS_BUST, STATUS_BLACKJACK, DEALER_STAND_VALUE
+    DEFAULT_AUTOPLAY_SPEED, AUTOPLAY_RESULTS_DELAY, TURBO_REFRESH_INTERVAL, TURBO_SLICE, SPLIT_SAMPLE_PASS,
+    SPLIT_SAMPLE_LIMIT, STATUS_ACTIVE
 )
 
 
@@ -23,8 +26,6 @@ class BlackjackSimulator:
         self.root.title("Blackjack Simulator")
         self.root.configure(bg=BG_COLOR)
 
-        self.deck = Deck(num_decks=DEFAULT_NUM_DECKS)
-        self.deck.shuffle()  # Shuffle initial deck
         self.players = []
         self.dealer = Dealer(self.root)
         
@@ -34,13 +35,18 @@ class BlackjackSimulator:
         # Casino rules
         self.casino_rules = CasinoRules()
 
-        self.current_player_index = 0
-        self.current_hand_index = 0
+        # Game flow runs in the headless engine; this class only renders its state
+        self.engine = TableEngine(seats=self.players, rules=self.casino_rules, num_decks=DEFAULT_NUM_DECKS,
+                                  dealer=self.dealer, card_counter=self.card_counter, live_evs=True)
+        # Explanations, bust risk and EVs are worked out off the Tk thread
+        self.probability_worker = ProbabilityWorker(self.root)
+
         self.autoplay = False
         self.autoplay_speed = DEFAULT_AUTOPLAY_SPEED
+        self.turbo_running = False
+        self._turbo_job = None
         self.total_starting_balance = 0
         self.round_number = 0
-        self.insurance_offered = False
         self.tutorial_mode = False
         
         # Session statistics
@@ -95,6 +101,23 @@ class BlackjackSimulator:
         self.tutorial_var = tk.BooleanVar(value=False)
         tk.Checkbutton(rules_frame, text="Tutorial Mode", variable=self.tutorial_var,
                       bg=BG_COLOR, fg=WHITE, selectcolor=BG_COLOR).grid(row=1, column=1, sticky="w", padx=5)
+        
+        self.csm_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(rules_frame, text="Continuous Shuffler", variable=self.csm_var,
+                      bg=BG_COLOR, fg=WHITE, selectcolor=BG_COLOR).grid(row=2, column=0, sticky="w", padx=5)
+        
+        self.deviations_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(rules_frame, text="Count Deviations (I18 + Fab 4)", variable=self.deviations_var,
+                      bg=BG_COLOR, fg=WHITE, selectcolor=BG_COLOR).grid(row=3, column=0, sticky="w", padx=5)
+        
+        penetration_frame = tk.Frame(rules_frame, bg=BG_COLOR)
+        penetration_frame.grid(row=2, column=1, sticky="w", padx=5)
+        tk.Label(penetration_frame, text="Penetration %:", bg=BG_COLOR, fg=WHITE).pack(side="left")
+        self.penetration_entry = tk.Entry(penetration_frame, width=5)
+        # Starts at the rules' own cut (one deck from the end unless a penetration is set)
+        penetration = self.casino_rules.get_penetration(DEFAULT_NUM_DECKS * 52)
+        self.penetration_entry.insert(0, f"{penetration * 100:g}")
+        self.penetration_entry.pack(side="left")
 
         self.start_button = tk.Button(self.settings_frame, text="Start Game", command=self.setup_game)
         self.start_button.grid(row=4, column=0, columnspan=2, pady=10)
@@ -187,6 +210,9 @@ class BlackjackSimulator:
         self.autoplay_button = tk.Button(self.control_frame, text="Autoplay Off", command=self.toggle_autoplay,
                                          bg="#555", fg=WHITE)
         self.autoplay_button.pack(side="left", padx=10)
+        self.turbo_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(self.control_frame, text="Turbo", variable=self.turbo_var,
+                       bg=BG_COLOR, fg=WHITE, selectcolor=BG_COLOR).pack(side="left")
         self.main_menu_button = tk.Button(self.control_frame, text="Main Menu", command=self.go_to_main_menu)
         self.main_menu_button.pack(side="left", padx=10)
 
@@ -205,7 +231,11 @@ class BlackjackSimulator:
         color = GREEN if self.autoplay else "#555"
         self.autoplay_button.config(text=f"Autoplay {state}", bg=color)
 
-        if self.autoplay and self.deal_button.cget('state') == tk.DISABLED:
+        if not self.autoplay and self.turbo_running:
+            self._stop_turbo()
+        elif self.autoplay and self.engine.insurance_offered:
+            self.decline_insurance()
+        elif self.autoplay and self.deal_button.cget('state') == tk.DISABLED:
             self.check_current_player_status()
         elif self.autoplay and self.deal_button.cget('state') == tk.NORMAL:
             self.deal_initial_hands()
@@ -228,12 +258,34 @@ class BlackjackSimulator:
             default_bet = int(self.default_bet_entry.get())
             if default_bet <= 0:
                 raise ValueError("Default bet must be positive.")
+            penetration = float(self.penetration_entry.get()) / 100
+            if not (0 < penetration <= 1):
+                raise ValueError("Penetration must be between 1 and 100%.")
         except ValueError as e:
             self.status_bar.config(text=f"Error: {e}", fg=RED)
             return
 
+        # Apply casino rules chosen on the settings screen
+        self.casino_rules.dealer_hits_soft_17 = self.soft_17_var.get()
+        self.casino_rules.insurance_available = self.insurance_var.get()
+        self.casino_rules.surrender_available = self.surrender_var.get()
+        self.casino_rules.continuous_shuffle = self.csm_var.get()
+        # An untouched entry keeps the rules' cut-card placement as it is
+        total_cards = self.engine.num_decks * 52
+        if abs(penetration - self.casino_rules.get_penetration(total_cards)) > 1e-9:
+            self.casino_rules.penetration = penetration
+            self.engine.reshuffle()  # Place the cut card for the new penetration
+        # Recommendations and autoplay follow the count's index plays when deviations are on
+        deviations = self.deviations_var.get()
+        self.engine.index_plays = DEFAULT_INDEX_PLAYS if deviations else None
+        self.engine.insurance_index = INSURANCE_INDEX if deviations else None
+        # Measured EV by true count for these rules, if a table has been built (count_tables.py)
+        self.card_counter.count_stats = load_count_stats(self.card_counter.system, self.casino_rules,
+                                                         self.card_counter.num_decks)
+
         self.total_starting_balance = starting_balance * num_players
         self.round_number = 0
+        self.engine.round_number = 0
         self.profit_loss_label.config(text="Total P/L: $0.00", fg=WHITE)
         self.round_label.config(text="Round: 0")
 
@@ -256,240 +308,204 @@ class BlackjackSimulator:
         self.enable_player_controls(False)
 
     def deal_initial_hands(self):
-        self.round_number += 1
+        if self.autoplay and self.turbo_var.get():
+            self._start_turbo()
+            return
+
+        started = self.engine.start_round()
+        self.round_number = self.engine.round_number
         self.round_label.config(text=f"Round: {self.round_number}")
         
-        # Only create new deck if current deck is empty or nearly empty
-        if len(self.deck) < 52:  # Less than one deck remaining
-            # Reshuffle - reset card counter
-            self.deck = Deck(num_decks=DEFAULT_NUM_DECKS)
-            self.deck.shuffle()
-            self.card_counter.reset()
+        if self.engine.reshuffled:
             self.status_bar.config(text="Game: Deck reshuffled. Card count reset.", fg=YELLOW)
         # Otherwise, continue using the same deck (card count persists)
-        
-        self.dealer.reset()
 
-        all_players_can_bet = True
-        for player in self.players:
-            player.reset()
-            if not player.place_bet(get_bet_amount):
-                self.status_bar.config(
-                    text=f"Player {player.player_index + 1} has insufficient funds. Autoplay stopped.", fg=RED)
-                if self.autoplay:
-                    self.toggle_autoplay()
-                all_players_can_bet = False
-        if not all_players_can_bet: return
+        if not started:
+            player = self.engine.unable_to_bet[0]
+            self.status_bar.config(
+                text=f"Player {player.player_index + 1} has insufficient funds. Autoplay stopped.", fg=RED)
+            if self.autoplay:
+                self.toggle_autoplay()
+            for player in self.players:
+                player.update_gui()
+            return
 
         for player in self.players:
-            card1 = self.deck.deal_card()
-            card2 = self.deck.deal_card()
-            player.hands[0].add_card(card1)
-            player.hands[0].add_card(card2)
-            # Count the cards
-            self.card_counter.count_card(card1[0])
-            self.card_counter.count_card(card2[0])
             player.update_gui()
-
-        dealer_card1 = self.deck.deal_card()
-        dealer_card2 = self.deck.deal_card()
-        self.dealer.add_card(dealer_card1)
-        self.dealer.add_card(dealer_card2)
-        # Count dealer's up card (only the visible one initially)
-        self.card_counter.count_card(dealer_card1[0])
         self.dealer.update_gui()
         self._update_count_display()
         
-        # Check for insurance opportunity
-        self.insurance_offered = self.casino_rules.should_offer_insurance(dealer_card1[0])
-        if self.insurance_offered:
-            self._offer_insurance()
-
-        self.current_player_index = 0
-        self.current_hand_index = 0
         self.status_bar.config(text="Game: Dealing cards...", fg=WHITE)
-
         self.deal_button.config(state=tk.DISABLED)
 
+        # Check for insurance opportunity
+        if self.engine.insurance_offered:
+            self._offer_insurance()
+            return
+
         self.check_current_player_status()
 
     def check_current_player_status(self):
-        if self.current_player_index >= len(self.players):
+        current_player, current_hand = self.engine.next_decision()
+        if current_player is None:
             self.dealer_play()
             return
 
-        current_player = self.players[self.current_player_index]
-
-        if self.current_hand_index >= len(current_player.hands):
-            self.next_turn_or_hand()
-            return
-
-        current_hand = current_player.hands[self.current_hand_index]
-        if current_hand.status != STATUS_ACTIVE:
-            self.next_turn_or_hand()
-            return
-
         current_player.update_gui()
 
-        dealer_upcard_value = self.dealer.get_up_card()[0]
-        recommendation = get_recommendation(current_hand, dealer_upcard_value, current_player.playing_strategy.get())
+        dealer_upcard_value = self.dealer.get_up_card_value()
+        recommendation = self.engine.get_recommendation(current_player, current_hand)
         
-        # Get hand type and explanation
+        # Get hand type; its explanation follows from the background worker
         hand_type, hand_type_desc = get_hand_type_description(current_hand, dealer_upcard_value)
-        pair_value = None
-        if hand_type == "pair":
-            pair_value = current_hand.cards[0][0] if current_hand.cards[0][0] <= 10 else 10
-        
-        explanation = get_strategy_explanation(
-            current_hand.hand_value,
-            dealer_upcard_value,
-            hand_type,
-            recommendation,
-            is_pair=(hand_type == "pair"),
-            pair_value=pair_value
-        )
-        
-        # Set recommendation with explanation
-        current_player.set_recommendation(recommendation, explanation, hand_type, hand_type_desc)
-        
-        # Calculate and display probabilities
-        is_soft = (hand_type == "soft")
-        can_double = self.is_action_possible('double')
-        can_split = self.is_action_possible('split')
-        
-        try:
-            probabilities = get_action_probabilities(
-                current_hand.hand_value,
-                dealer_upcard_value,
-                is_soft,
-                can_double,
-                can_split
-            )
-            
-            # Update probability display in player panel
-            prob_text = " | ".join([f"{action}: {prob*100:.1f}%" for action, (prob, _) in probabilities.items()])
-            if hasattr(current_player, 'probability_label'):
-                current_player.probability_label.config(text=prob_text[:100])  # Limit length
-        except:
-            pass  # Skip if probability calculation fails
+        current_player.set_recommendation(recommendation, "", hand_type, hand_type_desc)
+        self._request_probabilities(current_player, current_hand, recommendation, hand_type)
         
         # Visual mistake highlighting in tutorial mode
         if self.tutorial_mode and current_player.last_action_taken:
             self._highlight_mistakes(current_player, recommendation)
 
-        player_id_str = f"Player {self.current_player_index + 1}"
-        hand_id_str = f", Hand {self.current_hand_index + 1}" if len(current_player.hands) > 1 else ""
+        player_id_str = f"Player {self.engine.current_player_index + 1}"
+        hand_id_str = f", Hand {self.engine.current_hand_index + 1}" if len(current_player.hands) > 1 else ""
         self.status_bar.config(text=f"Game: {player_id_str}{hand_id_str}'s turn.", fg=WHITE)
 
-        if current_hand.has_blackjack:
-            current_hand.status = STATUS_BLACKJACK
-            self.root.after(self.autoplay_speed, self.next_turn_or_hand)
-            return
-        elif current_hand.hand_value == 21:
-            current_hand.status = STATUS_STAND
-            self.root.after(self.autoplay_speed, self.next_turn_or_hand)
-            return
-
-        # Handle insurance offer (only for first player, first hand)
-        if self.insurance_offered and self.current_player_index == 0 and self.current_hand_index == 0:
-            # Insurance decision needed
-            if self.autoplay:
-                # Autoplay: automatically decline insurance (basic strategy recommends declining)
-                self.root.after(self.autoplay_speed, self.decline_insurance)
-            else:
-                # Manual play: show insurance buttons
-                self.enable_player_controls(False)
-                self.insurance_button.config(state=tk.NORMAL)
-                self.decline_insurance_button.config(state=tk.NORMAL)
+        if self.autoplay:
+            self.perform_autoplay_action(recommendation)
         else:
-            # Normal play - enable standard controls
-            if self.autoplay:
-                self.perform_autoplay_action(recommendation)
-            else:
-                self.enable_player_controls(True)
+            self.enable_player_controls(True)
 
-    def perform_autoplay_action(self, recommendation):
-        self.enable_player_controls(False)
+    def _decision_key(self):
+        """Identifies the decision on screen; it changes whenever the current hand does."""
         player, hand = self.get_current_hand()
+        return (self.engine.round_number, self.engine.current_player_index, self.engine.current_hand_index,
+                len(hand.cards) if hand else 0)
 
-        action_map = {
-            "Hit": self.hit,
-            "Stand": self.stand,
-            "Double Down": self.double_down,
-            "Split": self.split
-        }
+    def _request_probabilities(self, player, hand, recommendation, hand_type):
+        """Queue the explanation, bust risk and exact EV of each legal action for the current hand,
+        and the action EVs of every hand still waiting to play.
 
-        final_recommendation = recommendation
-        if random.random() > player.skill_level.get():
-            if recommendation == "Hit":
-                final_recommendation = "Stand"
-            elif recommendation == "Stand":
-                final_recommendation = "Hit"
-            else:
-                final_recommendation = "Hit"
-            player.recommendation_label.config(text=f"Rec: {recommendation} (Mistake: {final_recommendation})")
+        Everything the worker needs is copied now, since the table moves on
+        while it computes; a result for a hand that has changed is dropped.
+        """
+        dealer_upcard_value = self.dealer.get_up_card_value()
+        hand_value, is_soft = hand.hand_value, hand.soft
+        pair_value = hand.first_value if hand_type == "pair" else None
+        # Every hand in play, solved from the shoe's EV cache for the cards unseen right now
+        table_request = self.engine.action_ev_request()
+        hand_key = (self.engine.current_player_index, self.engine.current_hand_index)
+        key = self._decision_key()
+
+        def compute():
+            explanation = get_strategy_explanation(hand_value, dealer_upcard_value, hand_type, recommendation,
+                                                   is_pair=(hand_type == "pair"), pair_value=pair_value)
+            # Bust risk and EVs per unit bet, from the cards players haven't seen
+            bust_prob = calculate_bust_probability(hand_value, is_soft, table_request['snapshot'][1])
+            table_evs = self.engine.table_action_evs(table_request)
+            ev_text = f"Bust {bust_prob * 100:.0f}% | EV " + ", ".join(
+                f"{ACTION_LABELS[action]} {ev * 100:+.1f}%" for action, ev in table_evs[hand_key].items())
+            return explanation, ev_text[:100], table_evs  # Limit length
+
+        def deliver(result):
+            if self._decision_key() != key:
+                return  # The hand moved on while the worker was busy
+            explanation, ev_text, table_evs = result
+            player.explanation_label.config(text=explanation)
+            if hasattr(player, 'probability_label'):
+                player.probability_label.config(text=ev_text)
+            self._show_waiting_evs(player, table_evs)
+            options = table_request['hands'][hand_key][1]
+            if (Action.SPLIT in table_evs[hand_key] and options['resplits'] > 0 and not self.autoplay and
+                    np is not None and hasattr(player, 'probability_label')):
+                self._sample_split_ev(player, ev_text, table_request, hand_key)
+
+        def fail():
+            if self._decision_key() == key and hasattr(player, 'probability_label'):
+                player.probability_label.config(text="EV unavailable (see log)")
+
+        self.probability_worker.submit(compute, deliver, fail)
+
+    def _sample_split_ev(self, player, ev_text, request, hand_key, estimate=None, elapsed=0):
+        """Refine a resplittable pair's split EV by Monte Carlo while the player decides.
+
+        The exact split EV gives each resplit hand the whole split allowance, so
+        deep split trees come out slightly high. Each pass samples for
+        SPLIT_SAMPLE_PASS ms on the worker and shows the running estimate, until
+        the interval is narrow, SPLIT_SAMPLE_LIMIT is spent or the hand moves on.
+        """
+        state, options = request['hands'][hand_key]
+        upcard, composition = request['upcard'], request['snapshot'][1]
+        rules = self.casino_rules
+        key = self._decision_key()
+        half_width = 0.005
+
+        def compute():
+            sample = estimate_action_evs(state, upcard, composition, rules, budget=SPLIT_SAMPLE_PASS / 1000,
+                                         half_width=half_width, actions=[Action.SPLIT],
+                                         resplits=options['resplits'],
+                                         dealer_checked=options['dealer_checked'])[Action.SPLIT]
+            if estimate is not None:
+                sample.merge(estimate)
+            return sample
+
+        def deliver(result):
+            if self._decision_key() != key or self.autoplay:
+                return
+            low, high = result.get_confidence_interval()
+            player.probability_label.config(
+                text=f"{ev_text}\nSplit (sampled) {result.get_ev() * 100:+.1f}% +/-{(high - low) * 50:.1f}%")
+            if (high - low) / 2 > half_width and elapsed + SPLIT_SAMPLE_PASS < SPLIT_SAMPLE_LIMIT:
+                self._sample_split_ev(player, ev_text, request, hand_key, result, elapsed + SPLIT_SAMPLE_PASS)
+
+        self.probability_worker.submit(compute, deliver)
+
+    def _show_waiting_evs(self, current_player, table_evs):
+        """Show the action EVs of every hand still waiting to play in its player's panel."""
+        for seat_index, seat in enumerate(self.players):
+            hand_evs = [(hand_index, evs) for (index, hand_index), evs in sorted(table_evs.items())
+                        if index == seat_index]
+            if seat is current_player or not hand_evs or not hasattr(seat, 'probability_label'):
+                continue
+            lines = [(f"Hand {hand_index + 1} EV " if len(seat.hands) > 1 else "EV ") + ", ".join(
+                f"{ACTION_LABELS[action]} {ev * 100:+.1f}%" for action, ev in evs.items())
+                for hand_index, evs in hand_evs]
+            seat.probability_label.config(text="\n".join(lines))
 
-        action_func = action_map.get(final_recommendation)
+    def perform_autoplay_action(self, recommendation):
+        self.enable_player_controls(False)
+        player, hand = self.get_current_hand()
 
-        if final_recommendation == "Double Down" and not self.is_action_possible('double'):
-            action_func = self.hit
-        elif final_recommendation == "Split" and not self.is_action_possible('split'):
-            new_rec = get_recommendation(hand, self.dealer.get_up_card()[0], player.playing_strategy.get(),
-                                         ignore_pairs=True)
-            action_func = action_map.get(new_rec, self.hit)
+        action = self.engine.choose_autoplay_action(player, hand, ACTION_BY_LABEL[recommendation])
+        if self.engine.last_autoplay_mistake:
+            player.recommendation_label.config(
+                text=f"Rec: {recommendation} (Mistake: {self.engine.last_autoplay_mistake})")
 
-        if action_func:
-            self.root.after(self.autoplay_speed, action_func)
+        action_methods = (self.hit, self.stand, self.double_down, self.split, self.surrender)
+        self.root.after(self.autoplay_speed, action_methods[action])
 
     def next_turn_or_hand(self):
-        # Disable insurance after first player (insurance only offered once per round)
-        if self.current_player_index == 0:
-            self.insurance_offered = False
-            self.insurance_button.config(state=tk.DISABLED)
-            self.decline_insurance_button.config(state=tk.DISABLED)
-        
-        self.current_hand_index += 1
-        if self.current_player_index < len(self.players):
-            current_player = self.players[self.current_player_index]
-            if self.current_hand_index >= len(current_player.hands):
-                self.current_player_index += 1
-                self.current_hand_index = 0
-
         self.check_current_player_status()
 
     def get_current_hand(self):
-        if self.current_player_index < len(self.players):
-            player = self.players[self.current_player_index]
-            if self.current_hand_index < len(player.hands):
-                return player, player.hands[self.current_hand_index]
-        return None, None
+        return self.engine.get_current_hand()
 
     def hit(self):
         player, hand = self.get_current_hand()
-        if player and hand and hand.status == STATUS_ACTIVE:
-            card = self.deck.deal_card()
-            hand.add_card(card)
-            # Count the card
-            self.card_counter.count_card(card[0])
-            self._update_count_display()
-            player.record_action("hit")
-            player.update_gui()
+        if self.engine.hit() is None:
+            return
+        self._update_count_display()
+        player.update_gui()
 
-            if hand.is_busted:
-                hand.status = STATUS_BUST
-                player.update_gui()
-                # Disable controls immediately when bust occurs
-                self.enable_player_controls(False)
-                # Proceed to next player/dealer
-                self.root.after(self.autoplay_speed, self.next_turn_or_hand)
-            else:
-                self.check_current_player_status()
+        if hand.status != STATUS_ACTIVE:
+            # Disable controls immediately when bust occurs
+            self.enable_player_controls(False)
+            # Proceed to next player/dealer
+            self.root.after(self.autoplay_speed, self.next_turn_or_hand)
+        else:
+            self.check_current_player_status()
 
     def stand(self):
         player, hand = self.get_current_hand()
-        if player and hand and hand.status == STATUS_ACTIVE:
-            hand.status = STATUS_STAND
-            player.record_action("stand")
+        if self.engine.stand():
             player.update_gui()
             self.root.after(self.autoplay_speed, self.next_turn_or_hand)
 
@@ -498,15 +514,8 @@ class BlackjackSimulator:
             if self.autoplay: self.hit()
             return
         player, hand = self.get_current_hand()
-        player.balance -= hand.bet
-        hand.bet *= 2
-        card = self.deck.deal_card()
-        hand.add_card(card)
-        # Count the card
-        self.card_counter.count_card(card[0])
+        self.engine.double_down()
         self._update_count_display()
-        hand.status = STATUS_STAND if not hand.is_busted else STATUS_BUST
-        player.record_action("double")
         player.update_gui()
         self.root.after(self.autoplay_speed, self.next_turn_or_hand)
 
@@ -515,142 +524,49 @@ class BlackjackSimulator:
             if self.autoplay: self.hit()
             return
         player, hand = self.get_current_hand()
-        player.balance -= hand.bet
-        new_hand = Hand(hand.bet)
-        new_hand.add_card(hand.cards.pop(1))
-        player.hands.insert(self.current_hand_index + 1, new_hand)
-        card1 = self.deck.deal_card()
-        card2 = self.deck.deal_card()
-        hand.add_card(card1)
-        new_hand.add_card(card2)
-        # Count the cards
-        self.card_counter.count_card(card1[0])
-        self.card_counter.count_card(card2[0])
+        self.engine.split()
         self._update_count_display()
-        player.record_action("split")
         player.update_gui()
         self.check_current_player_status()
 
     def is_action_possible(self, action):
-        player, hand = self.get_current_hand()
-        if not player or not hand or hand.status != STATUS_ACTIVE:
-            return False
-        if hand.is_surrendered:
-            return False
-        if action == 'double':
-            return len(hand.cards) == 2 and player.balance >= hand.bet
-        if action == 'split':
-            return player.can_split(hand) and player.balance >= hand.bet
-        if action == 'surrender':
-            return (self.casino_rules.can_surrender(len(hand.cards), self.dealer.get_up_card()[0]) and
-                   not self.insurance_offered)  # Can't surrender if insurance was offered
-        return True
+        return self.engine.is_action_possible(action)
 
     def enable_player_controls(self, enable):
         if self.autoplay:
             enable = False
 
         state = tk.NORMAL if enable else tk.DISABLED
-        self.hit_button.config(state=state)
+        self.hit_button.config(state=tk.NORMAL if enable and self.is_action_possible('hit') else tk.DISABLED)
         self.stand_button.config(state=state)
         self.double_down_button.config(state=tk.NORMAL if enable and self.is_action_possible('double') else tk.DISABLED)
         self.split_button.config(state=tk.NORMAL if enable and self.is_action_possible('split') else tk.DISABLED)
         self.surrender_button.config(state=tk.NORMAL if enable and self.is_action_possible('surrender') else tk.DISABLED)
-        self.insurance_button.config(state=tk.NORMAL if self.insurance_offered and self.current_player_index == 0 else tk.DISABLED)
-        self.decline_insurance_button.config(state=tk.NORMAL if self.insurance_offered and self.current_player_index == 0 else tk.DISABLED)
+        insurance_state = tk.NORMAL if self.engine.insurance_offered and not self.autoplay else tk.DISABLED
+        self.insurance_button.config(state=insurance_state)
+        self.decline_insurance_button.config(state=insurance_state)
 
     def dealer_play(self):
+        self.probability_worker.cancel()
         self.enable_player_controls(False)
         self.status_bar.config(text="Game: Dealer's turn...", fg=WHITE)
-        self.dealer.reveal_hole_card()
+        self.engine.reveal_hole_card()
+        self._update_count_display()
         self.dealer.update_gui()
-
-        all_busted = all(all(hand.is_busted for hand in p.hands) for p in self.players)
-        if all_busted:
-            self.root.after(self.autoplay_speed, self.show_results)
-            return
-
         self.root.after(self.autoplay_speed, self._dealer_hit_loop)
 
     def _dealer_hit_loop(self):
-        dealer_value = self.dealer.get_hand_value()
-        # Check if dealer has soft hand
-        has_ace = any(c[0] == 1 for c in self.dealer.hand)
-        is_soft = has_ace and dealer_value > sum(c[0] for c in self.dealer.hand if c[0] != 1) + 1
-        
-        should_hit = not self.casino_rules.get_dealer_stand_value(dealer_value, is_soft)
-        
-        if should_hit:
-            card = self.deck.deal_card()
-            self.dealer.add_card(card)
-            self.card_counter.count_card(card[0])
+        if self.engine.dealer_should_hit():
+            self.engine.dealer_hit()
             self._update_count_display()
             self.dealer.update_gui()
             self.root.after(self.autoplay_speed, self._dealer_hit_loop)
         else:
-            # Count dealer's hole card when revealed
-            if len(self.dealer.hand) == 2 and not self.dealer.hole_card_hidden:
-                self.card_counter.count_card(self.dealer.hand[1][0])
-                self._update_count_display()
             self.root.after(self.autoplay_speed, self.show_results)
 
     def show_results(self):
-        dealer_total = self.dealer.get_hand_value()
-        dealer_busted = self.dealer.is_busted
-        dealer_has_blackjack = self.dealer.has_blackjack
-
-        for i, player in enumerate(self.players):
-            for j, hand in enumerate(player.hands):
-                if hand.is_surrendered:
-                    # Surrendered hand - lose half bet
-                    player.balance += hand.bet / 2
-                    hand.result_text = "Surrendered (Lose 50%)"
-                    hand.result_color = YELLOW
-                    player.record_loss(hand)
-                elif hand.is_busted:
-                    player.record_loss(hand)
-                    hand.result_text = "Bust! Lost"
-                    hand.result_color = RED
-                elif hand.has_blackjack:
-                    if dealer_has_blackjack:
-                        player.record_push(hand)
-                        hand.result_text = "Push (Blackjack)"
-                        hand.result_color = BLUE
-                        # Insurance pays if taken
-                        if hand.insurance_bet > 0:
-                            player.balance += hand.insurance_bet * 3  # 2:1 payout
-                            hand.result_text += " + Insurance Win"
-                    else:
-                        player.record_win(hand, payout_multiplier=BLACKJACK_PAYOUT_MULTIPLIER)
-                        hand.result_text = "Blackjack! Win (3:2)"
-                        hand.result_color = GREEN
-                        # Insurance loses if taken
-                        if hand.insurance_bet > 0:
-                            hand.result_text += " (Insurance Lost)"
-                elif dealer_has_blackjack:
-                    # Dealer has blackjack, player doesn't - insurance pays
-                    player.record_loss(hand)
-                    hand.result_text = "Lost (Dealer Blackjack)"
-                    hand.result_color = RED
-                    if hand.insurance_bet > 0:
-                        player.balance += hand.insurance_bet * 3  # 2:1 payout
-                        hand.result_text += " + Insurance Win"
-                elif dealer_busted:
-                    player.record_win(hand)
-                    hand.result_text = "Win (Dealer Busts)"
-                    hand.result_color = GREEN
-                elif hand.hand_value > dealer_total:
-                    player.record_win(hand)
-                    hand.result_text = "Win"
-                    hand.result_color = GREEN
-                elif hand.hand_value < dealer_total:
-                    player.record_loss(hand)
-                    hand.result_text = "Lost"
-                    hand.result_color = RED
-                else:  # Push
-                    player.record_push(hand)
-                    hand.result_text = "Push"
-                    hand.result_color = BLUE
+        self.engine.settle()
+        for player in self.players:
             player.update_gui()
 
         current_total_balance = sum(p.balance for p in self.players)
@@ -671,21 +587,115 @@ class BlackjackSimulator:
                 'rtp': player.stats.get_rtp(),
                 'strategy_adherence': player.stats.get_strategy_adherence()
             })
-        self.session_stats.record_round(self.round_number, players_data, profit_loss)
+        # The session adds up per-round results, the same quantity turbo mode records
+        self.session_stats.record_round(self.round_number, players_data,
+                                        sum(player.round_net for player in self.players))
         if self.autoplay:
             self.root.after(AUTOPLAY_RESULTS_DELAY, self.deal_initial_hands)
         else:
             self.deal_button.config(state=tk.NORMAL)
     
+    # --- Turbo autoplay ---
+
+    def _start_turbo(self):
+        """Play rounds headlessly through the engine, refreshing the display every TURBO_REFRESH_INTERVAL ms."""
+        if self.turbo_running:
+            return
+        self.turbo_running = True
+        self.probability_worker.cancel()
+        self.engine.live_evs = False  # Nothing shows EVs between refreshes
+        for participant in self.players + [self.dealer]:
+            participant.live_updates = False
+        # Per-round and per-hand logs would grow by thousands of entries a second
+        self.session_stats.keep_rounds = False
+        for player in self.players:
+            player.stats.track_history = False
+        self.enable_player_controls(False)
+        self.deal_button.config(state=tk.DISABLED)
+        self._turbo_rounds = 0
+        self._turbo_start = self._turbo_last_refresh = time.perf_counter()
+        self._turbo_job = self.root.after(0, self._turbo_tick)
+
+    def _turbo_tick(self):
+        """Play rounds for one TURBO_SLICE, then yield to the event loop."""
+        self._turbo_job = None
+        if not self.turbo_var.get():
+            # Turbo switched off mid-run: carry on with normal autoplay
+            self._stop_turbo()
+            self.deal_initial_hands()
+            return
+
+        now = time.perf_counter()
+        deadline = now + TURBO_SLICE / 1000
+        while now < deadline:
+            if not self.engine.play_round():
+                player = self.engine.unable_to_bet[0]
+                self.toggle_autoplay()
+                self.status_bar.config(
+                    text=f"Player {player.player_index + 1} has insufficient funds. Autoplay stopped.", fg=RED)
+                return
+            self._turbo_rounds += 1
+            self.session_stats.record_round(self.engine.round_number, [],
+                                            sum(player.round_net for player in self.players))
+            now = time.perf_counter()
+
+        if now - self._turbo_last_refresh >= TURBO_REFRESH_INTERVAL / 1000:
+            self._turbo_last_refresh = now
+            self._refresh_turbo_display()
+        self._turbo_job = self.root.after(1, self._turbo_tick)
+
+    def _refresh_turbo_display(self):
+        """Update balances, P/L, round number and count without rebuilding any card widgets."""
+        self.round_number = self.engine.round_number
+        self.round_label.config(text=f"Round: {self.round_number}")
+        for player in self.players:
+            player.balance_label.config(text=f"Balance: ${player.balance:.2f}")
+            player._update_profit_loss()
+            player._update_statistics_display()
+
+        profit_loss = sum(p.balance for p in self.players) - self.total_starting_balance
+        color = GREEN if profit_loss > 0 else RED if profit_loss < 0 else WHITE
+        self.profit_loss_label.config(text=f"Total P/L: ${profit_loss:+.2f}", fg=color)
+        self._update_count_display()
+
+        elapsed = time.perf_counter() - self._turbo_start
+        rate = self._turbo_rounds / elapsed if elapsed > 0 else 0
+        self.status_bar.config(text=f"Game: Turbo autoplay - {self._turbo_rounds:,} rounds ({rate:,.0f}/sec)",
+                               fg=WHITE)
+
+    def _stop_turbo(self):
+        """Leave turbo mode and redraw the last round in full."""
+        if self._turbo_job is not None:
+            self.root.after_cancel(self._turbo_job)
+            self._turbo_job = None
+        self.turbo_running = False
+        self.engine.live_evs = True
+        for participant in self.players + [self.dealer]:
+            participant.live_updates = True
+        self.session_stats.keep_rounds = True
+        for player in self.players:
+            player.stats.track_history = True
+
+        self._refresh_turbo_display()
+        for player in self.players:
+            player.update_gui()
+        self.dealer.update_gui()
+        self.deal_button.config(state=tk.NORMAL)
+
     def _update_count_display(self):
         """Update the card counting display."""
         running_count = self.card_counter.running_count
-        cards_remaining = len(self.deck)
+        deck = self.engine.deck
+        cards_remaining = len(deck)
         # Update total cards for accurate true count calculation
         self.card_counter.total_cards = cards_remaining + self.card_counter.cards_seen
         true_count = self.card_counter.get_true_count(cards_remaining)
         status = self.card_counter.get_count_status()
-        decks_remaining = cards_remaining / 52.0
+        advantage = self.card_counter.get_advantage(cards_remaining)
+        if advantage is not None:
+            status = f"{status} ({advantage:+.2%})"
+        favorable = advantage > 0 if advantage is not None else true_count >= 2
+        decks_remaining = deck.decks_remaining()
         
         # Color code running count
         if running_count >= 2:
@@ -703,10 +713,11 @@ class BlackjackSimulator:
         else:
             tc_color = WHITE
         
-        self.running_count_label.config(text=f"RC: {running_count:+d}", fg=rc_color)
+        self.running_count_label.config(text=f"RC: {running_count:+g}", fg=rc_color)
         self.true_count_label.config(text=f"TC: {true_count:+.1f}", fg=tc_color)
         self.count_status_label.config(text=status, fg=YELLOW if true_count >= 1 else WHITE)
-        self.cards_remaining_label.config(text=f"Cards: {cards_remaining} ({decks_remaining:.1f} decks)")
+        self.cards_remaining_label.config(
+            text=f"Cards: {cards_remaining} ({decks_remaining:.1f} decks, {deck.penetration():.0%} dealt)")
         
         # Bet recommendation based on count
         if self.players and len(self.players) > 0:
@@ -714,7 +725,7 @@ class BlackjackSimulator:
             recommended_bet = self.card_counter.get_betting_unit(base_bet)
             if recommended_bet != base_bet:
                 # Show bet recommendation in status bar if count is favorable
-                if true_count >= 2:
+                if favorable:
                     self.status_bar.config(
                         text=f"Count Favorable! Recommended bet: ${recommended_bet:.2f} (TC: {true_count:+.1f})",
                         fg=GREEN
@@ -831,57 +842,52 @@ class BlackjackSimulator:
         close_button.pack(pady=10)
     
     def _offer_insurance(self):
-        """Offer insurance to all players when dealer shows Ace."""
+        """Offer insurance to the first player when dealer shows Ace."""
         self.status_bar.config(text="Game: Insurance available! Dealer shows Ace.", fg=YELLOW)
-        # Insurance button will be enabled by enable_player_controls
+        if self.autoplay:
+            # Autoplay: decline insurance as basic strategy does, unless the count calls for it
+            if self.engine.insurance_recommended():
+                self.root.after(self.autoplay_speed, self.take_insurance)
+            else:
+                self.root.after(self.autoplay_speed, self.decline_insurance)
+        else:
+            # Manual play: only the insurance buttons are enabled until the decision is made
+            if self.engine.insurance_recommended():
+                self.status_bar.config(text=f"Game: Insurance available! Count says take it "
+                                            f"(TC {self.engine.true_count():+.1f}).", fg=YELLOW)
+            self.enable_player_controls(False)
     
     def take_insurance(self):
         """Player takes insurance bet."""
-        player, hand = self.get_current_hand()
-        if not player or not hand:
+        if not self.engine.insurance_offered:
             return
-        
-        insurance_bet = hand.bet / 2
-        if player.balance >= insurance_bet:
-            player.balance -= insurance_bet
-            hand.insurance_bet = insurance_bet
-            self.status_bar.config(text=f"Game: Player {self.current_player_index + 1} took insurance.", fg=WHITE)
+        player = self.players[0]
+        if self.engine.take_insurance(player):
+            self.status_bar.config(text=f"Game: Player {player.player_index + 1} took insurance.", fg=WHITE)
             player.update_gui()
-        
-        # After insurance decision, disable insurance buttons and enable normal controls
-        self.insurance_offered = False
-        self.insurance_button.config(state=tk.DISABLED)
-        self.decline_insurance_button.config(state=tk.DISABLED)
-        if not self.autoplay:
-            self.enable_player_controls(True)
+        self._close_insurance()
     
     def decline_insurance(self):
         """Player declines insurance - proceed with hand."""
-        # Insurance decision made, disable insurance buttons and enable normal controls
-        self.insurance_offered = False
+        if not self.engine.insurance_offered:
+            return
+        self._close_insurance()
+
+    def _close_insurance(self):
+        """Finish the insurance decision (the dealer peeks) and continue with normal play."""
+        self.engine.close_insurance()
         self.insurance_button.config(state=tk.DISABLED)
         self.decline_insurance_button.config(state=tk.DISABLED)
-        
-        # After declining insurance, proceed with normal play
-        if self.autoplay:
-            # In autoplay, continue with the current player's turn
-            self.check_current_player_status()
-        else:
-            self.enable_player_controls(True)
+        self.check_current_player_status()
     
     def surrender(self):
         """Player surrenders hand."""
         player, hand = self.get_current_hand()
-        if not player or not hand or hand.status != STATUS_ACTIVE:
-            return
-        
-        if not self.is_action_possible('surrender'):
+        if not self.engine.surrender():
             return
         
-        hand.is_surrendered = True
-        hand.status = STATUS_STAND
         player.update_gui()
-        self.status_bar.config(text=f"Game: Player {self.current_player_index + 1} surrendered.", fg=YELLOW)
+        self.status_bar.config(text=f"Game: Player {player.player_index + 1} surrendered.", fg=YELLOW)
         self.root.after(self.autoplay_speed, self.next_turn_or_hand)
     
     def _highlight_mistakes(self, player, optimal_action):
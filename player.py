@@ -1,56 +1,23 @@
 import tkinter as tk
-from blackjack_strategy import PLAYING_STRATEGIES, BETTING_STRATEGIES
-from hand_utils import calculate_hand_value
-from statistics import PlayerStatistics
+from blackjack_strategy import PLAYING_STRATEGY_NAMES, BETTING_STRATEGIES
+from cards import card_label, is_red
+from table_engine import Hand, Seat
 from strategy_explanation import get_strategy_explanation, get_hand_type_description
 from constants import (
     BG_COLOR, WHITE, RED_SUIT_COLOR, BLACK_SUIT_COLOR, YELLOW, DARK_GREEN,
-    STATUS_ACTIVE, STATUS_STAND, STATUS_BUST, STATUS_BLACKJACK, GREEN, RED
+    GREEN, RED
 )
 
 
-class Hand:
-    def __init__(self, bet_amount):
-        self.cards = []
-        self.hand_value = 0
-        self.is_busted = False
-        self.status = STATUS_ACTIVE
-        self.bet = bet_amount
-        self.has_blackjack = False
-        self.result_text = ""
-        self.result_color = "black"
-        self.is_surrendered = False
-        self.insurance_bet = 0
-
-    def add_card(self, card):
-        self.cards.append(card)
-        self._calculate_hand_value()
-
-    def _calculate_hand_value(self):
-        self.hand_value, self.is_busted, self.has_blackjack = calculate_hand_value(self.cards)
-
-
-class Player:
+class Player(Seat):
     def __init__(self, master, player_index, initial_balance=1000, default_bet=10):
-        self.player_index = player_index
-        self.hands = []
-        self.balance = initial_balance
-        self.starting_balance = initial_balance  # Track starting balance for P/L calculation
-        self.default_bet = default_bet
+        super().__init__(player_index, initial_balance, default_bet)
+        self.live_updates = True  # Turbo autoplay turns this off and refreshes on its own schedule
 
         # Strategy and skill attributes
         self.skill_level = tk.DoubleVar(value=1.0)
-        self.playing_strategy = tk.StringVar(value=list(PLAYING_STRATEGIES.keys())[0])
+        self.playing_strategy = tk.StringVar(value=PLAYING_STRATEGY_NAMES[0])
         self.betting_strategy = tk.StringVar(value=list(BETTING_STRATEGIES.keys())[0])
-        self.previous_bet_won = None
-        self.last_bet_amount = default_bet
-        self.win_streak = 0
-        
-        # Statistics tracking
-        self.stats = PlayerStatistics()
-        self.last_recommendation = None
-        self.last_action_taken = None
-        self.last_hand_type = None
 
         # GUI elements
         self.frame = tk.LabelFrame(master, text=f"Player {player_index + 1}", padx=5, pady=5, bg=BG_COLOR, fg=WHITE,
@@ -70,7 +37,7 @@ class Player:
 
         tk.Label(settings_frame, text="Play:", font=("Arial", 8), bg=BG_COLOR, fg=WHITE).grid(row=1, column=0,
                                                                                                  sticky="w")
-        play_menu = tk.OptionMenu(settings_frame, self.playing_strategy, *PLAYING_STRATEGIES.keys())
+        play_menu = tk.OptionMenu(settings_frame, self.playing_strategy, *PLAYING_STRATEGY_NAMES)
         play_menu.config(font=("Arial", 8), width=8)
         play_menu.grid(row=1, column=1, sticky="ew", pady=1)
 
@@ -141,23 +108,25 @@ class Player:
                                          wraplength=200, justify="left")
         self.probability_label.pack(anchor="w", padx=5, pady=2)
 
+    def get_playing_strategy(self) -> str:
+        return self.playing_strategy.get()
+
+    def get_betting_strategy(self) -> str:
+        return self.betting_strategy.get()
+
+    def get_skill_level(self) -> float:
+        return self.skill_level.get()
+
     def place_bet(self, get_bet_amount_func):
-        amount = get_bet_amount_func(self, self.default_bet, self.betting_strategy.get())
-        if self.balance >= amount:
-            self.balance -= amount
-            self.last_bet_amount = amount
-            new_hand = Hand(amount)
-            self.hands.append(new_hand)
+        placed = super().place_bet(get_bet_amount_func)
+        if placed and self.live_updates:
             self._update_profit_loss()  # Update P/L immediately after bet
-            return True
-        return False
+        return placed
 
     def reset(self):
-        self.hands.clear()
-        self.update_gui()
-
-    def can_split(self, hand):
-        return len(hand.cards) == 2 and hand.cards[0][0] == hand.cards[1][0]
+        super().reset()
+        if self.live_updates:
+            self.update_gui()
 
     def update_gui(self):
         for widget in self.hand_container.winfo_children():
@@ -186,71 +155,19 @@ class Player:
             cards_frame = tk.Frame(hand_frame, bg=BG_COLOR)
             cards_frame.pack()
 
-            for _, card_repr in hand.cards:
-                suit = card_repr[-1]
-                color = RED_SUIT_COLOR if suit in ['♥', '♦'] else BLACK_SUIT_COLOR
-                card_label = tk.Label(cards_frame, text=card_repr, font=("Arial", 24, "bold"), fg=color, bg="white",
+            for card in hand.cards:
+                color = RED_SUIT_COLOR if is_red(card) else BLACK_SUIT_COLOR
+                card_widget = tk.Label(cards_frame, text=card_label(card), font=("Arial", 24, "bold"), fg=color, bg="white",
                                       padx=5, pady=5, relief="raised", borderwidth=2)
-                card_label.pack(side="left", padx=2, pady=2)
+                card_widget.pack(side="left", padx=2, pady=2)
 
             if hand.result_text:
                 result_label = tk.Label(hand_frame, text=hand.result_text, font=("Arial", 10, "bold"),
                                         fg=hand.result_color, bg=BG_COLOR)
                 result_label.pack()
 
-    def record_win(self, hand, payout_multiplier=1):
-        winnings = hand.bet * payout_multiplier
-        net_winnings = winnings  # Net profit from this hand
-        self.balance += winnings + hand.bet
-        self.previous_bet_won = True
-        self.win_streak += 1
-        
-        # Track statistics
-        was_mistake = self._was_strategy_mistake(hand)
-        result = "blackjack" if hand.has_blackjack else "win"
-        self.stats.record_hand(result, hand.bet, net_winnings, was_mistake)
-
-    def record_loss(self, hand):
-        self.previous_bet_won = False
-        self.win_streak = 0
-        
-        # Track statistics
-        was_mistake = self._was_strategy_mistake(hand)
-        result = "bust" if hand.is_busted else "loss"
-        self.stats.record_hand(result, hand.bet, -hand.bet, was_mistake)
-
-    def record_push(self, hand):
-        self.balance += hand.bet
-        self.previous_bet_won = None
-        
-        # Track statistics
-        was_mistake = self._was_strategy_mistake(hand)
-        self.stats.record_hand("push", hand.bet, 0, was_mistake)
-    
-    def record_action(self, action: str):
-        """Record a player action for statistics."""
-        self.stats.record_action(action)
-        self.last_action_taken = action
-    
-    def _was_strategy_mistake(self, hand) -> bool:
-        """Check if the last action was a strategy mistake."""
-        if self.last_recommendation is None or self.last_action_taken is None:
-            return False
-        
-        # Map actions to recommendations
-        action_map = {
-            "hit": "Hit",
-            "stand": "Stand",
-            "double": "Double Down",
-            "split": "Split"
-        }
-        
-        expected_action = action_map.get(self.last_action_taken.lower(), "")
-        return expected_action != self.last_recommendation
-    
     def set_recommendation(self, recommendation: str, explanation: str, hand_type: str, hand_type_desc: str):
         """Set the current recommendation and explanation."""
-        self.last_recommendation = recommendation
         self.last_hand_type = hand_type
         self.recommendation_label.config(text=f"Rec: {recommendation}", fg=YELLOW)
         self.explanation_label.config(text=explanation)
@@ -1,146 +1,204 @@
 """Probability calculations for blackjack decisions."""
 
-from typing import Dict, Tuple
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
 import math
+import time
 
+from blackjack_strategy import Action
+from casino_rules import CasinoRules
+from constants import DEFAULT_NUM_DECKS
+from dealer_probabilities import BUST, DEALER_TOTALS, composition_key, dealer_probabilities, key_count
+from deck import DECK_COMPOSITION
+from hand_states import STATE_CAN_DOUBLE, STATE_PAIR_VALUE
 
-def calculate_bust_probability(hand_value: int, is_soft: bool = False) -> float:
-    """Calculate probability of busting on next card.
-    
-    Simplified calculation based on remaining cards in deck.
-    For a full deck, probability of busting is:
-    - Cards that would cause bust / Total cards remaining
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only estimate_action_evs() needs it
+    np = None
+
+FULL_SHOE_COMPOSITION = tuple(count * DEFAULT_NUM_DECKS for count in DECK_COMPOSITION)
+
+
+def calculate_bust_probability(hand_value: int, is_soft: bool = False,
+                               composition: Optional[Sequence[int]] = None) -> float:
+    """Probability that the next card busts the hand, from the cards still unseen.
+    
+    A soft hand can't bust on one card (its ace drops to 1), and a hard hand
+    busts on every value above 21 - hand_value. One pass over the ten card
+    values, so it's cheap enough to refresh on every card dealt.
+    
+    Args:
+        hand_value: Player's hand total
+        is_soft: Hand counts an ace as 11
+        composition: Unseen cards by value, indexed 1 (ace) to 10 (defaults to a full shoe)
     """
+    if composition is None:
+        composition = FULL_SHOE_COMPOSITION
+    if is_soft or hand_value <= 11:
+        return 0.0
     if hand_value >= 21:
-        return 0.0  # Already at or over 21
+        return 1.0
+    total_cards = sum(composition[1:11])
+    if total_cards == 0:
+        return 0.0
+    return sum(composition[22 - hand_value:11]) / total_cards
+
+
+@lru_cache(maxsize=256)
+def _bust_chain_table(key: int, stand_on: int) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    """(hard, soft) tables, indexed by total, of the chance of busting while hitting up to stand_on."""
+    counts = [0] + [key_count(key, value) for value in range(1, 11)]
+    total_cards = sum(counts) or 1
+    draw = [count / total_cards for count in counts]
+    hard = [0.0] * 32
+    soft = [0.0] * 22
+    # Hard 12+ only leads to higher hard totals; soft totals lead to higher soft or hard 12+;
+    # hard 11 and below can turn soft with an ace, so each group only needs the ones before it
+    for total in range(31, 11, -1):
+        if total > 21:
+            hard[total] = 1.0
+        elif total < stand_on:
+            hard[total] = sum(draw[value] * hard[total + value] for value in range(1, 11))
+    for total in range(21, 11, -1):
+        if total < stand_on:
+            # The ace drops back to 1 when a card would take a soft total past 21
+            soft[total] = sum(draw[value] * (soft[total + value] if total + value <= 21 else hard[total + value - 10])
+                              for value in range(1, 11))
+    for total in range(11, 1, -1):
+        if total < stand_on:
+            ace = soft[total + 11] if total + 11 <= 21 else hard[total + 1]
+            hard[total] = draw[1] * ace + sum(draw[value] * hard[total + value] for value in range(2, 11))
+    return tuple(hard), tuple(soft)
+
+
+def calculate_bust_chain_probability(hand_value: int, is_soft: bool = False,
+                                     composition: Optional[Sequence[int]] = None, stand_on: int = 17) -> float:
+    """Probability of busting when hitting until the total reaches stand_on, over however many cards it takes.
     
+    Later draws are taken from the same composition. The tables for a
+    composition are built once, so repeated queries during a shoe cost O(1).
+    """
+    if composition is None:
+        composition = FULL_SHOE_COMPOSITION
+    hard, soft = _bust_chain_table(composition_key(composition), stand_on)
     if is_soft:
-        # Soft hands can't bust on next card (ace can become 1)
-        if hand_value <= 11:
-            return 0.0
-        # If soft hand value is 12-20, only 10-value cards can bust
-        # (and only if ace becomes 1, making it hard)
-        if hand_value == 12:
-            return 0.0  # Can't bust
-        elif hand_value <= 20:
-            # Only busts if we get a card that makes ace = 1 and total > 21
-            # This is complex, simplified: very low probability
-            return 0.0
-    
-    # Hard hand bust probability
-    # Cards that would cause bust: any card that makes total > 21
-    cards_that_bust = 0
-    
-    if hand_value <= 11:
-        return 0.0  # Can't bust
-    elif hand_value == 12:
-        # Only 10-value cards bust (10, J, Q, K) = 16 cards out of 52
-        cards_that_bust = 16
-    elif hand_value == 13:
-        # 9, 10-value cards bust = 20 cards
-        cards_that_bust = 20
-    elif hand_value == 14:
-        # 8, 9, 10-value cards bust = 24 cards
-        cards_that_bust = 24
-    elif hand_value == 15:
-        # 7, 8, 9, 10-value cards bust = 28 cards
-        cards_that_bust = 28
-    elif hand_value == 16:
-        # 6, 7, 8, 9, 10-value cards bust = 32 cards
-        cards_that_bust = 32
-    elif hand_value == 17:
-        # 5, 6, 7, 8, 9, 10-value cards bust = 36 cards
-        cards_that_bust = 36
-    elif hand_value == 18:
-        # 4, 5, 6, 7, 8, 9, 10-value cards bust = 40 cards
-        cards_that_bust = 40
-    elif hand_value == 19:
-        # 3, 4, 5, 6, 7, 8, 9, 10-value cards bust = 44 cards
-        cards_that_bust = 44
-    elif hand_value == 20:
-        # 2, 3, 4, 5, 6, 7, 8, 9, 10-value cards bust = 48 cards
-        cards_that_bust = 48
-    else:
-        return 1.0  # Already over 21
-    
-    # Simplified: assume full deck (52 cards)
-    # In reality, this should account for cards already seen
-    return cards_that_bust / 52.0
+        return soft[min(max(hand_value, 12), 21)]
+    return hard[min(max(hand_value, 2), 31)]
 
 
-def calculate_win_probability(player_value: int, dealer_upcard: int, is_soft: bool = False) -> float:
-    """Estimate win probability based on player hand and dealer upcard.
-    
-    This is a simplified calculation. Real probability requires
-    complex simulation of all possible outcomes.
+def calculate_win_probability(player_value: int, dealer_upcard: int, is_soft: bool = False,
+                              composition: Optional[Sequence[int]] = None, hits_soft_17: bool = False,
+                              dealer_peeked: bool = True) -> float:
+    """Exact probability that standing on player_value wins.
+    
+    Args:
+        player_value: Player's hand total
+        dealer_upcard: Dealer upcard value (1 = ace)
+        is_soft: Unused; a standing hand's softness doesn't matter
+        composition: Unseen cards by value, indexed 1 (ace) to 10 (defaults to a full shoe)
+        hits_soft_17: Dealer hits soft 17
+        dealer_peeked: The dealer has checked for blackjack and doesn't have it
     """
-    # Simplified win probability estimates
     if player_value > 21:
         return 0.0
-    if player_value == 21:
-        return 0.95  # Very high win probability
-    
-    # Base win probability on hand value
-    base_win_prob = {
-        20: 0.85, 19: 0.75, 18: 0.65, 17: 0.55,
-        16: 0.45, 15: 0.35, 14: 0.25, 13: 0.20,
-        12: 0.15, 11: 0.10, 10: 0.08, 9: 0.05,
-        8: 0.03, 7: 0.02, 6: 0.01, 5: 0.01
-    }
-    
-    prob = base_win_prob.get(player_value, 0.0)
-    
-    # Adjust based on dealer upcard
-    if dealer_upcard in [2, 3, 4, 5, 6]:
-        # Dealer weak card - increase win probability
-        prob += 0.15
-    elif dealer_upcard in [7, 8, 9]:
-        # Dealer medium card - slight decrease
-        prob -= 0.05
-    elif dealer_upcard in [10, 1]:  # 10 or Ace
-        # Dealer strong card - decrease win probability
-        prob -= 0.20
-    
-    # Soft hands have slightly better odds
-    if is_soft:
-        prob += 0.05
-    
-    return max(0.0, min(1.0, prob))
+    if composition is None:
+        composition = FULL_SHOE_COMPOSITION
+    outcome = dealer_probabilities(dealer_upcard, composition, hits_soft_17, no_blackjack=dealer_peeked)
+    return outcome[BUST] + sum(p for total, p in zip(DEALER_TOTALS, outcome) if total < player_value)
 
 
-def get_action_probabilities(
-    player_hand_value: int,
-    dealer_upcard: int,
-    is_soft: bool = False,
-    can_double: bool = False,
-    can_split: bool = False
-) -> Dict[str, Tuple[float, str]]:
-    """Get probability estimates for different actions.
-    
-    Returns dict with action -> (probability, description)
+class MonteCarloEstimate:
+    """Running mean and standard error of one Monte Carlo EV estimate."""
+
+    def __init__(self):
+        self.samples = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def add(self, results):
+        """Add a batch of sampled results (a NumPy array)."""
+        self.samples += len(results)
+        self.total += float(results.sum())
+        self.total_sq += float((results * results).sum())
+
+    def merge(self, other: 'MonteCarloEstimate'):
+        """Fold in another estimate of the same EV, e.g. from a later pass."""
+        self.samples += other.samples
+        self.total += other.total
+        self.total_sq += other.total_sq
+
+    def get_ev(self) -> float:
+        return self.total / self.samples if self.samples else 0.0
+
+    def get_standard_error(self) -> float:
+        if self.samples < 2:
+            return math.inf
+        mean = self.total / self.samples
+        variance = (self.total_sq - self.samples * mean * mean) / (self.samples - 1)
+        return math.sqrt(max(variance, 0.0) / self.samples)
+
+    def get_confidence_interval(self, z: float = 1.96) -> Tuple[float, float]:
+        """(low, high) bounds of the EV; z = 1.96 gives 95%."""
+        margin = z * self.get_standard_error()
+        return self.get_ev() - margin, self.get_ev() + margin
+
+
+def estimate_action_evs(state: int, upcard: int, composition: Optional[Sequence[int]] = None,
+                        rules: Optional[CasinoRules] = None, budget: float = 0.05, half_width: float = 0.005,
+                        actions: Optional[Sequence[Action]] = None, strategy=None, resplits: Optional[int] = None,
+                        dealer_checked: bool = False, batch_size: int = 4096,
+                        seed=None) -> Dict[Action, MonteCarloEstimate]:
+    """Monte Carlo EV of each action on a hand, within a wall-clock budget.
+
+    For hands the exact engine (ev_engine) handles slowly or only
+    approximately, such as deep split trees. Every draw comes from the
+    composition without replacement, and the decisions after the first
+    follow a strategy chart. Batches of deals are sampled until the budget is
+    spent or every action's 95% confidence interval is within half_width,
+    so latency is bounded and idle time buys accuracy. Needs NumPy.
+
+    Args:
+        state: The hand's hand_states index
+        upcard: Dealer upcard value (1 = ace ... 10)
+        composition: Unseen cards by value, indexed 1 (ace) to 10 (defaults to a full shoe)
+        rules: Casino rules
+        budget: Seconds to spend; at least one batch is always played
+        half_width: Stop early once every 95% interval is this narrow, per unit bet
+        actions: Actions to estimate (defaults to those the hand's cards allow)
+        strategy: Chart or CompiledStrategy for later decisions (defaults to Basic)
+        resplits: Further splits allowed after splitting (defaults to the rules' limit less one)
+        dealer_checked: The dealer has peeked and has no blackjack
+        batch_size: Deals per batch
+        seed: Seed for the random generator
+
+    Returns:
+        dict: Action -> MonteCarloEstimate, per unit of the hand's bet
     """
-    bust_prob = calculate_bust_probability(player_hand_value, is_soft)
-    win_prob = calculate_win_probability(player_hand_value, dealer_upcard, is_soft)
-    
-    results = {}
-    
-    # Hit probability
-    hit_win_prob = win_prob * (1 - bust_prob)  # Win if don't bust
-    results["Hit"] = (hit_win_prob, f"Bust risk: {bust_prob*100:.1f}%")
-    
-    # Stand probability
-    results["Stand"] = (win_prob, f"Current win chance: {win_prob*100:.1f}%")
-    
-    # Double down (if possible)
-    if can_double:
-        # Double has same win prob as hit, but with 2x bet
-        results["Double Down"] = (hit_win_prob, f"2x bet, {hit_win_prob*100:.1f}% win chance")
-    
-    # Split (if possible)
-    if can_split:
-        # Splitting generally improves odds for pairs
-        split_win_prob = win_prob + 0.10  # Rough estimate
-        results["Split"] = (min(1.0, split_win_prob), "Creates two hands")
-    
-    return results
+    from vectorized_simulator import HandPlayoutSimulator  # NumPy is only needed for estimates
+
+    deadline = time.perf_counter() + budget
+    rules = rules if rules is not None else CasinoRules()
+    if composition is None:
+        composition = FULL_SHOE_COMPOSITION
+    if actions is None:
+        actions = [Action.STAND, Action.HIT]
+        if STATE_CAN_DOUBLE[state]:
+            actions.append(Action.DOUBLE)
+            if rules.surrender_available:
+                actions.append(Action.SURRENDER)
+        if STATE_PAIR_VALUE[state] and rules.max_splits > 0:
+            actions.append(Action.SPLIT)
 
+    simulator = HandPlayoutSimulator(composition, batch_size, rules, strategy, seed)
+    estimates = {action: MonteCarloEstimate() for action in actions}
+    while True:
+        simulator.deal_shoes()
+        for action, estimate in estimates.items():
+            net, counted = simulator.play_action(state, upcard, action, resplits, dealer_checked)
+            estimate.add(net[counted])
+        if time.perf_counter() >= deadline:
+            break
+        if all(1.96 * estimate.get_standard_error() <= half_width for estimate in estimates.values()):
+            break
+    return estimates
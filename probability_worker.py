@@ -0,0 +1,84 @@
+"""Background computation of decision probabilities for the GUI.
+
+Tk widgets may only be touched from the thread running mainloop, so the
+worker thread never calls back into Tk itself: finished results wait in a
+queue that the Tk thread drains with root.after while requests are
+outstanding.
+"""
+
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 10  # ms between checks for finished results while a request is outstanding
+
+
+class ProbabilityWorker:
+    """Runs probability requests on one background thread, newest request first.
+
+    Only the latest request matters: submitting another, or calling cancel(),
+    makes every earlier one stale. A stale request still waiting in the queue
+    is skipped without being computed, and a stale result is dropped instead
+    of delivered.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._generation = 0  # Bumped by every submit() and cancel(); only the latest is current
+        self._outstanding = 0  # Requests the worker hasn't answered yet (Tk thread only)
+        self._polling = False
+        self._thread = threading.Thread(target=self._run, name="probability-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, compute, deliver, fail=None):
+        """Call compute() on the worker thread, then deliver(result) on the Tk thread unless it's stale by then.
+
+        A compute() that raises is logged with its traceback and nothing is
+        delivered; fail(), if given, is called on the Tk thread instead so the
+        display can say so.
+        """
+        self._generation += 1
+        self._outstanding += 1
+        self._requests.put((self._generation, compute, deliver, fail))
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_INTERVAL, self._poll)
+
+    def cancel(self):
+        """Make every pending request stale, e.g. once the hand it describes is over."""
+        self._generation += 1
+
+    def _run(self):
+        while True:
+            generation, compute, deliver, fail = self._requests.get()
+            result, ok, failed = None, False, False
+            if generation == self._generation:
+                try:
+                    result, ok = compute(), True
+                except Exception:
+                    logger.exception("Probability request failed")
+                    failed = True
+            self._results.put((generation, deliver, fail if failed else None, result, ok))
+
+    def _poll(self):
+        """Deliver finished results on the Tk thread; keeps polling until every request is answered."""
+        while True:
+            try:
+                generation, deliver, fail, result, ok = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._outstanding -= 1
+            if generation != self._generation:
+                continue
+            if ok:
+                deliver(result)
+            elif fail is not None:
+                fail()
+        if self._outstanding:
+            self.root.after(POLL_INTERVAL, self._poll)
+        else:
+            self._polling = False
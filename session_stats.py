@@ -8,33 +8,61 @@ import json
 class SessionStatistics:
     """Track session-wide statistics and performance."""
     
-    def __init__(self):
+    def __init__(self, keep_rounds: bool = True):
         self.start_time = datetime.now()
         self.rounds = []
         self.players_data = []
+        self.keep_rounds = keep_rounds  # Headless simulations only keep the aggregates
+        
+        # Running aggregates, so summaries don't rescan every round
+        self.total_rounds = 0
+        self.total_pl = 0.0
+        self.winning_rounds = 0
+        self.losing_rounds = 0
+        self.push_rounds = 0
         
     def record_round(self, round_number: int, players_data: List[Dict], total_pl: float):
-        """Record a round's statistics."""
-        self.rounds.append({
-            'round': round_number,
-            'timestamp': datetime.now().isoformat(),
-            'total_pl': total_pl,
-            'players': players_data
-        })
+        """Record a round's statistics; total_pl is the table's net result for this round alone."""
+        self.total_rounds += 1
+        self.total_pl += total_pl
+        if total_pl > 0:
+            self.winning_rounds += 1
+        elif total_pl < 0:
+            self.losing_rounds += 1
+        else:
+            self.push_rounds += 1
+        
+        if self.keep_rounds:
+            self.rounds.append({
+                'round': round_number,
+                'timestamp': datetime.now().isoformat(),
+                'total_pl': total_pl,
+                'players': players_data
+            })
+    
+    def merge(self, other: 'SessionStatistics'):
+        """Add another session's rounds and aggregates (e.g. from a simulation shard)."""
+        self.total_rounds += other.total_rounds
+        self.total_pl += other.total_pl
+        self.winning_rounds += other.winning_rounds
+        self.losing_rounds += other.losing_rounds
+        self.push_rounds += other.push_rounds
+        if self.keep_rounds:
+            self.rounds.extend(other.rounds)
     
     def get_session_summary(self) -> Dict:
         """Get overall session summary."""
-        if not self.rounds:
+        if not self.total_rounds:
             return {}
         
-        total_rounds = len(self.rounds)
-        total_pl = sum(r['total_pl'] for r in self.rounds)
+        total_rounds = self.total_rounds
+        total_pl = self.total_pl
         avg_pl_per_round = total_pl / total_rounds if total_rounds > 0 else 0
         
         # Calculate win/loss streaks
-        wins = sum(1 for r in self.rounds if r['total_pl'] > 0)
-        losses = sum(1 for r in self.rounds if r['total_pl'] < 0)
-        pushes = sum(1 for r in self.rounds if r['total_pl'] == 0)
+        wins = self.winning_rounds
+        losses = self.losing_rounds
+        pushes = self.push_rounds
         
         return {
             'total_rounds': total_rounds,
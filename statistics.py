@@ -3,11 +3,18 @@
 from collections import defaultdict
 from typing import Dict, List, Optional
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only batch counting uses it
+    np = None
+
+from counting_systems import COUNTING_SYSTEMS, DEFAULT_COUNTING_SYSTEM, get_counting_system, weight_matrix
+
 
 class PlayerStatistics:
     """Track statistics for a single player."""
     
-    def __init__(self):
+    def __init__(self, track_history: bool = True):
         self.wins = 0
         self.losses = 0
         self.pushes = 0
@@ -21,6 +28,7 @@ class PlayerStatistics:
         self.strategy_mistakes = 0
         self.strategy_correct = 0
         self.hands_played = []
+        self.track_history = track_history  # Headless simulations skip the per-hand log
         
     def record_hand(self, result: str, bet: float, winnings: float, was_mistake: bool = False):
         """Record a hand result."""
@@ -44,12 +52,13 @@ class PlayerStatistics:
         else:
             self.strategy_correct += 1
             
-        self.hands_played.append({
-            'result': result,
-            'bet': bet,
-            'winnings': winnings,
-            'was_mistake': was_mistake
-        })
+        if self.track_history:
+            self.hands_played.append({
+                'result': result,
+                'bet': bet,
+                'winnings': winnings,
+                'was_mistake': was_mistake
+            })
     
     def record_action(self, action: str):
         """Record a player action."""
@@ -82,6 +91,23 @@ class PlayerStatistics:
         """Calculate total profit/loss."""
         return self.total_winnings - self.total_bet
     
+    def merge(self, other: 'PlayerStatistics'):
+        """Add another player's statistics (e.g. from a simulation shard) into these."""
+        self.wins += other.wins
+        self.losses += other.losses
+        self.pushes += other.pushes
+        self.blackjacks += other.blackjacks
+        self.busts += other.busts
+        self.doubles += other.doubles
+        self.splits += other.splits
+        self.total_hands += other.total_hands
+        self.total_bet += other.total_bet
+        self.total_winnings += other.total_winnings
+        self.strategy_mistakes += other.strategy_mistakes
+        self.strategy_correct += other.strategy_correct
+        if self.track_history:
+            self.hands_played.extend(other.hands_played)
+    
     def get_summary(self) -> Dict:
         """Get summary statistics."""
         return {
@@ -103,58 +129,98 @@ class PlayerStatistics:
 
 
 class CardCounting:
-    """Hi-Lo card counting system."""
-    
-    # Hi-Lo values
-    CARD_VALUES = {
-        1: -1,   # Ace
-        2: 1,    # 2
-        3: 1,    # 3
-        4: 1,    # 4
-        5: 1,    # 5
-        6: 1,    # 6
-        7: 0,    # 7
-        8: 0,    # 8
-        9: 0,    # 9
-        10: -1,  # 10, J, Q, K
-    }
+    """Card counting with any system from counting_systems (Hi-Lo by default).
+
+    Only the number of cards of each value seen is tracked, so counting a
+    card costs the same whichever system is used, and the count for any
+    other system over the same shoe is available too (get_running_counts()).
+
+    With count_stats (a count_tables.TrueCountStats for this system and
+    table), the advantage, bet ramp and count status come from measured EV
+    by true count instead of fixed rules of thumb.
+    """
     
-    def __init__(self, num_decks: int = 8):
+    def __init__(self, num_decks: int = 8, system=DEFAULT_COUNTING_SYSTEM, count_stats=None):
         self.num_decks = num_decks
-        self.running_count = 0
+        self.system = get_counting_system(system)
+        self.count_stats = count_stats
+        self.seen = [0] * 11  # Cards seen by value, index 1 = ace ... 10
         self.cards_seen = 0
         self.total_cards = num_decks * 52  # Will be updated as deck is used
         
     def reset(self):
         """Reset counting."""
-        self.running_count = 0
+        self.seen = [0] * 11
         self.cards_seen = 0
         
     def count_card(self, card_value: int):
         """Count a card that's been seen."""
         if card_value > 10:
             card_value = 10
-        self.running_count += self.CARD_VALUES.get(card_value, 0)
+        self.seen[card_value] += 1
         self.cards_seen += 1
+
+    def count_cards(self, card_values):
+        """Count a batch of seen card values (a NumPy array or any iterable of ints)."""
+        if np is not None and isinstance(card_values, np.ndarray):
+            counts = np.bincount(np.minimum(card_values, 10), minlength=11)
+            self.seen = [a + int(b) for a, b in zip(self.seen, counts)]
+            self.cards_seen += int(card_values.size)
+        else:
+            for card_value in card_values:
+                self.count_card(card_value)
+
+    @property
+    def running_count(self):
+        """Running count for the selected system, starting from 0 after a reshuffle."""
+        return self.system.running_count(self.seen)
+
+    def get_running_counts(self, systems=None) -> Dict[str, float]:
+        """Running count of several systems over the same cards, by name (defaults to every system)."""
+        systems = [get_counting_system(system) for system in (systems or COUNTING_SYSTEMS)]
+        if np is not None:
+            counts = weight_matrix(systems) @ np.array(self.seen, dtype=np.float64)
+            return {system.name: float(count) for system, count in zip(systems, counts)}
+        return {system.name: system.running_count(self.seen) for system in systems}
+
+    def get_side_count(self, name: str = "insurance"):
+        """Running side count, e.g. "insurance" or the Hi-Opt systems' "aces"."""
+        return self.system.side_count(name, self.seen)
         
     def get_true_count(self, cards_remaining: int = None) -> float:
         """Calculate true count (running count / decks remaining).
         
+        Unbalanced systems are converted to the balanced equivalent (see
+        CountingSystem.true_count), so bet ramps work the same with any system.
+        
         Args:
             cards_remaining: Current number of cards in deck. If None, calculates from total_cards.
         """
-        if cards_remaining is not None:
-            decks_remaining = cards_remaining / 52.0
-        else:
-            decks_remaining = (self.total_cards - self.cards_seen) / 52.0
-        
-        if decks_remaining <= 0:
-            return 0.0
-        return self.running_count / decks_remaining
+        if cards_remaining is None:
+            cards_remaining = self.total_cards - self.cards_seen
+        return self.system.true_count(self.running_count, self.cards_seen, cards_remaining)
+
+    def insurance_favorable(self, cards_remaining: int = None) -> bool:
+        """Whether the insurance side count says tens make up more than a third of the unseen cards."""
+        if cards_remaining is None:
+            cards_remaining = self.total_cards - self.cards_seen
+        # The side count equals 13 x unseen tens - 4 x unseen cards, so tens are over a third above this
+        return self.get_side_count("insurance") > cards_remaining / 3
     
-    def get_betting_unit(self, base_unit: float) -> float:
-        """Get recommended bet size based on true count."""
+    def get_advantage(self, cards_remaining: int = None) -> Optional[float]:
+        """Measured player EV per unit bet at the current true count, or None without count_stats."""
+        if self.count_stats is None:
+            return None
+        return self.count_stats.advantage(self.get_true_count(cards_remaining))
+
+    def get_betting_unit(self, base_unit: float, spread: float = 8) -> float:
+        """Get recommended bet size based on true count.
+
+        With count_stats this is the measured best ramp for the spread; otherwise a fixed 1-8 ramp.
+        """
         true_count = self.get_true_count()
+        if self.count_stats is not None:
+            return base_unit * self.count_stats.bet_units(true_count, spread)
         if true_count <= 0:
             return base_unit
         elif true_count <= 1:
@@ -170,6 +236,18 @@ class CardCounting:
     
     def get_count_status(self) -> str:
         """Get human-readable count status."""
+        advantage = self.get_advantage()
+        if advantage is not None:
+            # Measured edge: a point either side of break-even is "slightly"
+            if advantage >= 0.01:
+                return "Favorable"
+            elif advantage >= 0:
+                return "Slightly Favorable"
+            elif advantage >= -0.01:
+                return "Neutral"
+            elif advantage >= -0.02:
+                return "Slightly Unfavorable"
+            return "Unfavorable"
         true_count = self.get_true_count()
         if true_count >= 2:
             return "Favorable"
@@ -121,14 +121,11 @@ def _get_pair_explanation(hand_value: int, dealer_upcard: int, recommendation: s
 
 def get_hand_type_description(hand, dealer_upcard: int) -> Tuple[str, str]:
     """Get hand type and description."""
-    if len(hand.cards) == 2 and hand.cards[0][0] == hand.cards[1][0]:
-        pair_value = hand.cards[0][0]
-        if pair_value > 10:
-            pair_value = 10
+    if hand.is_pair:
+        pair_value = hand.first_value
         return "pair", f"Pair of {pair_value}s"
     
-    has_ace = any(c[0] == 1 for c in hand.cards)
-    if has_ace and hand.hand_value > sum(c[0] for c in hand.cards if c[0] != 1) + 1:
+    if hand.soft:
         return "soft", f"Soft {hand.hand_value}"
     
     return "hard", f"Hard {hand.hand_value}"
@@ -0,0 +1,220 @@
+"""Rule-aware basic strategy generator.
+
+Builds the optimal total-dependent basic strategy chart for any CasinoRules
+setup and deck count by exact expected-value calculation, instead of
+simulating. Every two-card hand is solved by ev_engine against each dealer
+upcard, with the upcard and the hand's own cards removed from the shoe.
+
+Charts are cached in memory and on disk, keyed by a hash of the rules that
+affect strategy, so each table configuration is only ever solved once:
+
+    python strategy_generator.py --decks 6 --h17 --no-das
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+from blackjack_strategy import Action, CompiledStrategy
+from casino_rules import CasinoRules
+from constants import DEFAULT_NUM_DECKS, STRATEGY_CACHE_DIR
+from deck import DECK_COMPOSITION
+from ev_engine import ActionEVSolver
+from hand_states import BLACKJACK, STATE_TOTAL, STATE_SOFT, STATE_PAIR_VALUE, state_after
+
+GENERATOR_VERSION = 1  # Bump when the calculation changes so stale disk caches are ignored
+UPCARDS = (2, 3, 4, 5, 6, 7, 8, 9, 10, 1)  # Chart column order
+
+# Chart action letters
+STAND, HIT, DOUBLE, SPLIT, SURRENDER = 'S', 'H', 'D', 'P', 'R'
+ACTION_LETTERS = {Action.STAND: STAND, Action.HIT: HIT, Action.DOUBLE: DOUBLE, Action.SPLIT: SPLIT,
+                  Action.SURRENDER: SURRENDER}
+
+_memory_cache: Dict[str, dict] = {}
+_compiled_cache: Dict[Tuple, CompiledStrategy] = {}
+
+
+# --- Rules key ---
+
+def strategy_rules(rules: CasinoRules, num_decks: int) -> Dict:
+    """The rule settings that change basic strategy, plus the deck count."""
+    return {
+        "num_decks": num_decks,
+        "dealer_hits_soft_17": rules.dealer_hits_soft_17,
+        "dealer_peeks_for_blackjack": rules.dealer_peeks_for_blackjack,
+        "surrender": rules.surrender_type if rules.surrender_available else None,
+        "double_after_split": rules.double_after_split,
+        "resplit_aces": rules.resplit_aces,
+        "max_splits": rules.max_splits,
+        "blackjack_payout": rules.get_blackjack_payout_multiplier(),
+    }
+
+
+def rules_hash(rules: CasinoRules, num_decks: int) -> str:
+    """Stable short hash of strategy_rules(), used as the cache key."""
+    key = dict(strategy_rules(rules, num_decks), version=GENERATOR_VERSION)
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+
+
+# --- Exact EV calculation ---
+
+def _chart_code(evs: Dict[str, float]) -> str:
+    """Chart code for a cell: the best action, with its fallback when doubling or surrender isn't allowed."""
+    best = max(evs, key=evs.get)
+    if best not in (DOUBLE, SURRENDER):
+        return best
+    fallbacks = {action: ev for action, ev in evs.items() if action in (STAND, HIT, SPLIT)}
+    if best == DOUBLE:
+        fallbacks.pop(SPLIT, None)
+    fallback = max(fallbacks, key=fallbacks.get)
+    return best if fallback == HIT else best + fallback.lower()
+
+
+def _shoe_counts(num_decks: int, *removed: int) -> Tuple[int, ...]:
+    """Shoe by card value (index 1 = ace ... 10) less the listed card values."""
+    counts = [count * num_decks for count in DECK_COMPOSITION]
+    for value in removed:
+        counts[value] -= 1
+    return tuple(counts)
+
+
+def compute_strategy(rules: CasinoRules, num_decks: int = DEFAULT_NUM_DECKS) -> dict:
+    """Solve the total-dependent basic strategy for a rules setup.
+
+    Every two-card hand is solved with its own cards and the upcard removed
+    from the shoe; a hard-total row averages its card combinations by how
+    likely each one is, so it is the best play for that total overall.
+
+    Returns:
+        dict: {'chart': ..., 'evs': ...}. chart has the same 'hard', 'soft' and
+        'pairs' layout as BASIC_STRATEGY; evs holds the EV of every legal
+        action for the same cells, per unit bet.
+    """
+    chart = {'hard': {}, 'soft': {}, 'pairs': {}}
+    evs = {'hard': {}, 'soft': {}, 'pairs': {}}
+    for upcard in UPCARDS:
+        counts = _shoe_counts(num_decks, upcard)
+        total_cards = sum(counts)
+        cells = {}  # (hand type, row) -> [weight, summed action EVs]
+        for first in range(1, 11):
+            for second in range(first, 11):
+                if counts[first] < 1 + (first == second) or counts[second] < 1:
+                    continue
+                state = state_after([first, second])
+                if state == BLACKJACK:
+                    continue
+                # Probability of being dealt this combination, in either order
+                weight = counts[first] * (counts[second] - (first == second)) / (total_cards * (total_cards - 1))
+                weight *= 1 if first == second else 2
+                solver = ActionEVSolver(upcard, _shoe_counts(num_decks, upcard, first, second), rules)
+                if STATE_PAIR_VALUE[state]:
+                    cell = ('pairs', STATE_PAIR_VALUE[state])
+                else:
+                    cell = (('soft' if STATE_SOFT[state] else 'hard'), STATE_TOTAL[state])
+                summed = cells.setdefault(cell, [0.0, {}])
+                summed[0] += weight
+                action_evs = solver.action_evs(state, can_split=rules.max_splits > 0,
+                                               can_surrender=rules.surrender_available)
+                for action, ev in action_evs.items():
+                    letter = ACTION_LETTERS[action]
+                    summed[1][letter] = summed[1].get(letter, 0.0) + weight * ev
+        for (hand_type, row), (weight, summed) in cells.items():
+            cell_evs = {action: ev / weight for action, ev in summed.items()}
+            chart[hand_type].setdefault(row, {})[upcard] = _chart_code(cell_evs)
+            evs[hand_type].setdefault(row, {})[upcard] = cell_evs
+    return {'chart': chart, 'evs': evs}
+
+
+# --- Caching ---
+
+def _from_json(data):
+    """Restore the int row and upcard keys that JSON turned into strings."""
+    return {hand_type: {int(row): {int(upcard): cell for upcard, cell in cells.items()}
+                        for row, cells in rows.items()}
+            for hand_type, rows in data.items()}
+
+
+def generate_strategy(rules: Optional[CasinoRules] = None, num_decks: int = DEFAULT_NUM_DECKS,
+                      cache_dir: Optional[str] = STRATEGY_CACHE_DIR) -> dict:
+    """Rule-aware strategy for a table setup, from the memory or disk cache when available.
+
+    Args:
+        rules: Casino rules (defaults to CasinoRules())
+        num_decks: Decks in the shoe
+        cache_dir: Directory of cached solutions; None disables the disk cache
+
+    Returns:
+        dict: {'rules': strategy_rules(), 'chart': ..., 'evs': ...} as from compute_strategy()
+    """
+    rules = rules if rules is not None else CasinoRules()
+    key = rules_hash(rules, num_decks)
+    if key in _memory_cache:
+        return _memory_cache[key]
+
+    path = os.path.join(cache_dir, f"{key}.json") if cache_dir else None
+    result = None
+    if path and os.path.exists(path):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            result = {'rules': data['rules'], 'chart': _from_json(data['chart']), 'evs': _from_json(data['evs'])}
+        except (OSError, ValueError, KeyError):
+            result = None  # Unreadable cache entry; solve again and overwrite it
+    if result is None:
+        result = dict(rules=strategy_rules(rules, num_decks), **compute_strategy(rules, num_decks))
+        if path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                with open(path, 'w') as f:
+                    json.dump(result, f)
+            except OSError:
+                pass  # The disk cache is an optimization; a read-only home still gets a chart
+    _memory_cache[key] = result
+    return result
+
+
+def get_rule_aware_strategy(rules: CasinoRules, num_decks: int) -> CompiledStrategy:
+    """Compiled rule-aware strategy for a table, cheap enough to call on every decision."""
+    key = (num_decks, rules.dealer_hits_soft_17, rules.dealer_peeks_for_blackjack, rules.surrender_available,
+           rules.surrender_type, rules.double_after_split, rules.resplit_aces, rules.max_splits,
+           rules.blackjack_pays_3to2)
+    compiled = _compiled_cache.get(key)
+    if compiled is None:
+        compiled = _compiled_cache[key] = CompiledStrategy(generate_strategy(rules, num_decks)['chart'])
+    return compiled
+
+
+# --- Command line ---
+
+def format_chart(chart: dict) -> str:
+    lines = []
+    header = "       " + " ".join(f"{'A' if upcard == 1 else upcard:>3}" for upcard in UPCARDS)
+    for hand_type, label in (('hard', "Hard"), ('soft', "Soft"), ('pairs', "Pair")):
+        lines.append(header if not lines else "\n" + header)
+        for row in sorted(chart[hand_type], reverse=True):
+            name = ('A' if row == 1 else row) if hand_type == 'pairs' else row
+            lines.append(f"{label} {name:>2}" + "".join(f"{chart[hand_type][row][upcard]:>4}" for upcard in UPCARDS))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    from batch_simulator import add_rules_arguments, build_rules
+    parser = argparse.ArgumentParser(description="Generate basic strategy for a set of casino rules.")
+    parser.add_argument("--decks", type=int, default=DEFAULT_NUM_DECKS, help="Number of decks in the shoe")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write the disk cache")
+    rule_options = add_rules_arguments(parser, penetration=False)
+    rule_options.add_argument("--early-surrender", action="store_true", help="Surrender before the dealer peeks")
+    args = parser.parse_args(argv)
+
+    rules = build_rules(args)
+    if args.early_surrender:
+        rules.surrender_type = "early"
+    result = generate_strategy(rules, args.decks, cache_dir=None if args.no_cache else STRATEGY_CACHE_DIR)
+    print(f"Rules hash {rules_hash(rules, args.decks)}")
+    print(format_chart(result['chart']))
+
+
+if __name__ == "__main__":
+    main()
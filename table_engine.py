@@ -0,0 +1,753 @@
+"""Headless blackjack table engine.
+
+Runs complete rounds (deal, insurance, player decisions, dealer play and
+settlement) synchronously without any GUI dependency. The tkinter front end
+in main.py drives the same engine one step at a time and only renders state.
+"""
+
+import random
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from cards import CARD_VALUES
+from deck import Deck
+from dealer_probabilities import composition_key
+from ev_engine import ShoeEVCache, calculate_action_evs, get_solver
+from hand_utils import HandState
+from hand_states import dealer_hits
+from index_plays import IndexedStrategy, IndexPlay, get_indexed_strategy
+from blackjack_strategy import (
+    PLAYING_STRATEGIES, BETTING_STRATEGIES, RULE_AWARE_STRATEGY, Action, ACTION_LABELS, ACTION_NAMES, get_action,
+    get_bet_amount
+)
+from statistics import PlayerStatistics, CardCounting
+from strategy_generator import get_rule_aware_strategy
+from casino_rules import CasinoRules
+from constants import (
+    DEFAULT_NUM_DECKS, GREEN, RED, BLUE, YELLOW,
+    STATUS_ACTIVE, STATUS_STAND, STATUS_BUST, STATUS_BLACKJACK
+)
+
+
+class Hand(HandState):
+    def __init__(self, bet_amount, is_split=False):
+        super().__init__()
+        self.cards = array('B')  # Card codes (see cards.py)
+        self.status = STATUS_ACTIVE
+        self.bet = bet_amount
+        self.result_text = ""
+        self.result_color = "black"
+        self.is_surrendered = False
+        self.insurance_bet = 0
+        self.is_split = is_split  # Hands created by splitting can't make blackjack
+
+    def add_card(self, card):
+        self.cards.append(card)
+        self.add_value(CARD_VALUES[card])
+        if self.is_split:
+            self.has_blackjack = False
+
+    def pop_card(self):
+        """Remove and return the last card (used when splitting)."""
+        card = self.cards.pop()
+        self.rebuild_state(self.cards)
+        return card
+
+    def is_soft(self) -> bool:
+        return self.soft
+
+    def is_split_aces(self) -> bool:
+        return self.is_split and self.first_value == 1
+
+
+class Seat:
+    """Bankroll, hands and statistics for one player, independent of any GUI."""
+
+    def __init__(self, player_index, initial_balance=1000, default_bet=10,
+                 playing_strategy=None, betting_strategy=None, skill_level=1.0, track_history=True):
+        self.player_index = player_index
+        self.hands = []
+        self.balance = initial_balance
+        self.starting_balance = initial_balance  # Track starting balance for P/L calculation
+        self.default_bet = default_bet
+
+        # Strategy and skill attributes
+        self.playing_strategy_name = playing_strategy or list(PLAYING_STRATEGIES.keys())[0]
+        self.betting_strategy_name = betting_strategy or list(BETTING_STRATEGIES.keys())[0]
+        self.skill = skill_level
+        self.previous_bet_won = None
+        self.last_bet_amount = default_bet
+        self.win_streak = 0
+
+        # Statistics tracking
+        self.stats = PlayerStatistics(track_history=track_history)
+        self.last_recommendation = None
+        self.last_action_taken = None
+        self.last_hand_type = None
+        self.round_net = 0.0  # Net result of the last settled round, including insurance
+
+    def get_playing_strategy(self) -> str:
+        return self.playing_strategy_name
+
+    def get_betting_strategy(self) -> str:
+        return self.betting_strategy_name
+
+    def get_skill_level(self) -> float:
+        return self.skill
+
+    def place_bet(self, get_bet_amount_func):
+        amount = get_bet_amount_func(self, self.default_bet, self.get_betting_strategy())
+        if self.balance >= amount:
+            self.balance -= amount
+            self.last_bet_amount = amount
+            self.hands.append(Hand(amount))
+            return True
+        return False
+
+    def reset(self):
+        self.hands.clear()
+
+    def can_split(self, hand):
+        return hand.is_pair
+
+    def record_win(self, hand, payout_multiplier=1):
+        winnings = hand.bet * payout_multiplier
+        net_winnings = winnings  # Net profit from this hand
+        self.balance += winnings + hand.bet
+        self.previous_bet_won = True
+        self.win_streak += 1
+
+        # Track statistics
+        was_mistake = self._was_strategy_mistake(hand)
+        result = "blackjack" if hand.has_blackjack else "win"
+        self.stats.record_hand(result, hand.bet, net_winnings, was_mistake)
+
+    def record_loss(self, hand):
+        self.previous_bet_won = False
+        self.win_streak = 0
+
+        # Track statistics
+        was_mistake = self._was_strategy_mistake(hand)
+        result = "bust" if hand.is_busted else "loss"
+        self.stats.record_hand(result, hand.bet, -hand.bet, was_mistake)
+
+    def record_push(self, hand):
+        self.balance += hand.bet
+        self.previous_bet_won = None
+
+        # Track statistics
+        was_mistake = self._was_strategy_mistake(hand)
+        self.stats.record_hand("push", hand.bet, 0, was_mistake)
+
+    def record_surrender(self, hand):
+        self.balance += hand.bet / 2
+        self.previous_bet_won = False
+        self.win_streak = 0
+
+        # Track statistics
+        was_mistake = self._was_strategy_mistake(hand)
+        self.stats.record_hand("loss", hand.bet, -hand.bet / 2, was_mistake)
+
+    def record_action(self, action: str):
+        """Record a player action for statistics."""
+        self.stats.record_action(action)
+        self.last_action_taken = action
+
+    def _was_strategy_mistake(self, hand) -> bool:
+        """Check if the last action was a strategy mistake."""
+        if self.last_recommendation is None or self.last_action_taken is None:
+            return False
+
+        return self.last_action_taken.lower() != ACTION_NAMES[self.last_recommendation]
+
+
+class DealerHand(HandState):
+    """The dealer's cards and hole-card state, independent of any GUI."""
+
+    def __init__(self):
+        super().__init__()
+        self.hand = array('B')  # Card codes (see cards.py)
+        self.hole_card_hidden = True
+
+    def add_card(self, card):
+        self.hand.append(card)
+        self.add_value(CARD_VALUES[card])
+
+    def get_hand_value(self):
+        return self.hand_value
+
+    def get_hand(self):
+        return self.hand
+
+    def get_up_card(self):
+        return self.hand[0] if self.hand else None
+
+    def get_up_card_value(self):
+        return CARD_VALUES[self.hand[0]] if self.hand else None
+
+    def is_soft(self) -> bool:
+        return self.soft
+
+    def reset(self):
+        self.hand = array('B')
+        self.reset_state()
+        self.hole_card_hidden = True
+
+    def reveal_hole_card(self):
+        self.hole_card_hidden = False
+
+
+class TableEngine:
+    """Plays blackjack rounds for a set of seats against one dealer and shoe.
+
+    Rounds can be played in one call with play_round(), or stepped through
+    with start_round(), next_decision(), the action methods, dealer_hit()
+    and settle() when a front end needs to pause between actions.
+    """
+
+    def __init__(self, seats: Optional[List[Seat]] = None, rules: Optional[CasinoRules] = None,
+                 num_decks: int = DEFAULT_NUM_DECKS, rng=None, dealer: Optional[DealerHand] = None,
+                 card_counter: Optional[CardCounting] = None, live_evs: bool = False):
+        self.rng = rng if rng is not None else random.Random()
+        self.num_decks = num_decks
+        self.rules = rules if rules is not None else CasinoRules()
+        self.deck = Deck(num_decks=num_decks, rng=self.rng, rules=self.rules)
+        self.seats = seats if seats is not None else []
+        self.dealer = dealer if dealer is not None else DealerHand()
+        # Card counting - persists across rounds until deck reshuffles
+        self.card_counter = card_counter if card_counter is not None else CardCounting(num_decks=num_decks)
+        # Action EVs for the unseen cards, updated alongside the count while live_evs is on
+        self.ev_cache: Optional[ShoeEVCache] = None
+        self.live_evs = live_evs
+        # Deviations from each seat's chart at the current true count; None plays the chart alone
+        self._index_plays: Optional[Sequence[IndexPlay]] = None
+        self._insurance_index: Optional[float] = None  # True count to take insurance at; None always declines
+        self._indexed: Dict[int, Tuple[object, IndexedStrategy]] = {}  # id(chart) -> (chart, its IndexedStrategy)
+
+        self.current_player_index = 0
+        self.current_hand_index = 0
+        self.insurance_offered = False
+        self.round_number = 0
+        self.reshuffled = False  # True if the shoe was reshuffled for the current round
+        self.unable_to_bet = []  # Seats that couldn't cover their bet this round
+        self.last_autoplay_mistake = None
+
+    # --- Round setup ---
+
+    @property
+    def index_plays(self) -> Optional[Sequence[IndexPlay]]:
+        """Deviations from each seat's chart at the current true count; None plays the chart alone."""
+        return self._index_plays
+
+    @index_plays.setter
+    def index_plays(self, plays: Optional[Sequence[IndexPlay]]):
+        self._index_plays = plays
+        self._indexed.clear()
+
+    @property
+    def insurance_index(self) -> Optional[float]:
+        """True count to take insurance at; None always declines."""
+        return self._insurance_index
+
+    @insurance_index.setter
+    def insurance_index(self, index: Optional[float]):
+        self._insurance_index = index
+        self._indexed.clear()
+
+    @property
+    def live_evs(self) -> bool:
+        """Whether ev_cache follows the shoe card by card; off for headless play, which never reads it."""
+        return self.ev_cache is not None
+
+    @live_evs.setter
+    def live_evs(self, enabled: bool):
+        if not enabled:
+            self.ev_cache = None
+        elif self.ev_cache is None:
+            self.ev_cache = ShoeEVCache(self.rules, self.unseen_composition())
+
+    def needs_reshuffle(self) -> bool:
+        return self.deck.cut_card_reached()
+
+    def reshuffle(self):
+        self.deck.reset()
+        self.card_counter.reset()
+        if self.ev_cache is not None:
+            self.ev_cache.reset(self.deck.get_composition())
+
+    def unseen_composition(self) -> Tuple[int, ...]:
+        """Cards the players can't see, by value (index 1 = ace ... 10): the shoe plus a hidden hole card."""
+        composition = list(self.deck.remaining)
+        if self.dealer.hole_card_hidden and len(self.dealer.hand) > 1:
+            composition[CARD_VALUES[self.dealer.hand[1]]] += 1
+        return tuple(composition)
+
+    def _cards_on_table(self):
+        cards = list(self.dealer.hand)
+        for seat in self.seats:
+            for hand in seat.hands:
+                cards.extend(hand.cards)
+        return cards
+
+    def _deal(self):
+        """Deal the next card, refilling the shoe from the discards if it runs out mid-round."""
+        if not self.deck:
+            self.deck.reshuffle_discards(self._cards_on_table())
+            self.card_counter.reset()
+            if self.ev_cache is not None:
+                self.ev_cache.reset(self.unseen_composition())
+        return self.deck.deal_card()
+
+    def _draw(self):
+        """Deal a face-up card and count it."""
+        card = self._deal()
+        self.card_counter.count_card(CARD_VALUES[card])
+        if self.ev_cache is not None:
+            self.ev_cache.card_seen(CARD_VALUES[card])
+        return card
+
+    def start_round(self) -> bool:
+        """Reshuffle if needed, take bets and deal the opening cards.
+
+        Returns:
+            False (with bets refunded and no cards dealt) if any seat can't cover its bet
+        """
+        self.round_number += 1
+        if self.rules.continuous_shuffle:
+            # Last round's cards go straight back into the shuffler, so counts never build up
+            self.deck.return_cards(self._cards_on_table())
+            self.card_counter.reset()
+            self.reshuffled = False
+        else:
+            # The cut card is only acted on between rounds
+            self.reshuffled = self.needs_reshuffle()
+            if self.reshuffled:
+                self.reshuffle()
+
+        self.dealer.reset()
+        for seat in self.seats:
+            seat.reset()
+        if self.ev_cache is not None:
+            # Picks up returned discards and a hole card that was never turned over
+            self.ev_cache.reset(self.unseen_composition())
+        self.unable_to_bet = [seat for seat in self.seats if not seat.place_bet(get_bet_amount)]
+        if self.unable_to_bet:
+            for seat in self.seats:
+                for hand in seat.hands:
+                    seat.balance += hand.bet
+                seat.hands.clear()
+            return False
+
+        for seat in self.seats:
+            hand = seat.hands[0]
+            hand.add_card(self._draw())
+            hand.add_card(self._draw())
+        self.dealer.add_card(self._draw())
+        self.dealer.add_card(self._deal())  # Hole card is counted when revealed
+
+        self.current_player_index = 0
+        self.current_hand_index = 0
+        self.insurance_offered = self.rules.should_offer_insurance(self.dealer.get_up_card_value())
+        if not self.insurance_offered:
+            self._peek_for_blackjack()
+        return True
+
+    def take_insurance(self, seat: Seat) -> bool:
+        """Place an insurance bet of half the seat's first hand."""
+        hand = seat.hands[0]
+        insurance_bet = hand.bet / 2
+        if seat.balance < insurance_bet:
+            return False
+        seat.balance -= insurance_bet
+        hand.insurance_bet = insurance_bet
+        return True
+
+    def close_insurance(self):
+        """End the insurance decision and let the dealer peek."""
+        self.insurance_offered = False
+        self._peek_for_blackjack()
+
+    def _peek_for_blackjack(self):
+        """Close out every hand immediately if the dealer peeks and has blackjack."""
+        if not (self.rules.dealer_peeks_for_blackjack and self.dealer.has_blackjack):
+            return
+        for seat in self.seats:
+            for hand in seat.hands:
+                if hand.status == STATUS_ACTIVE:
+                    hand.status = STATUS_BLACKJACK if hand.has_blackjack else STATUS_STAND
+
+    # --- Player decisions ---
+
+    def get_current_hand(self) -> Tuple[Optional[Seat], Optional[Hand]]:
+        if self.current_player_index < len(self.seats):
+            seat = self.seats[self.current_player_index]
+            if self.current_hand_index < len(seat.hands):
+                return seat, seat.hands[self.current_hand_index]
+        return None, None
+
+    def next_decision(self) -> Tuple[Optional[Seat], Optional[Hand]]:
+        """Advance past finished hands to the next hand that needs a decision.
+
+        Blackjacks and hands totalling 21 are stood automatically.
+
+        Returns:
+            (seat, hand), or (None, None) once every player has finished
+        """
+        while self.current_player_index < len(self.seats):
+            seat = self.seats[self.current_player_index]
+            if self.current_hand_index >= len(seat.hands):
+                self.current_player_index += 1
+                self.current_hand_index = 0
+                continue
+            hand = seat.hands[self.current_hand_index]
+            if hand.status == STATUS_ACTIVE:
+                if hand.has_blackjack:
+                    hand.status = STATUS_BLACKJACK
+                elif hand.hand_value == 21:
+                    hand.status = STATUS_STAND
+                else:
+                    return seat, hand
+            self.current_hand_index += 1
+        return None, None
+
+    def get_action(self, seat: Seat, hand: Hand) -> Action:
+        """Strategy action code for a hand; also remembered for adherence tracking."""
+        action = self._chart_action(seat, hand)
+        seat.last_recommendation = action
+        return action
+
+    def _chart_action(self, seat: Seat, hand: Hand, ignore_pairs: bool = False, allow_double: bool = True) -> Action:
+        """Look a hand up in the seat's playing strategy, or in the chart solved for this table's rules.
+
+        With index_plays set, the lookup is made at the current true count.
+        """
+        strategy = seat.get_playing_strategy()
+        if strategy == RULE_AWARE_STRATEGY:
+            strategy = get_rule_aware_strategy(self.rules, self.num_decks)
+        if self.index_plays:
+            # Built once per chart; a rules change hands back a new Rule-Aware chart, which misses
+            entry = self._indexed.get(id(strategy))
+            if entry is None or entry[0] is not strategy:
+                entry = self._indexed[id(strategy)] = (
+                    strategy, get_indexed_strategy(strategy, self.index_plays, self.insurance_index))
+            indexed = entry[1]
+            return indexed.lookup(hand.state, self.dealer.get_up_card_value(), self.true_count(), ignore_pairs,
+                                  allow_double)
+        return get_action(hand, self.dealer.get_up_card_value(), strategy, ignore_pairs, allow_double)
+
+    def true_count(self) -> float:
+        """True count as the players see it: a face-down hole card is still among the unseen cards."""
+        hidden = self.dealer.hole_card_hidden and len(self.dealer.hand) > 1
+        return self.card_counter.get_true_count(len(self.deck) + hidden)
+
+    def insurance_recommended(self) -> bool:
+        """Whether the count says to take the insurance on offer (never without insurance_index)."""
+        return self.insurance_index is not None and self.true_count() >= self.insurance_index
+
+    def get_recommendation(self, seat: Seat, hand: Hand) -> str:
+        """Strategy recommendation string for a hand, e.g. "Double Down"."""
+        return ACTION_LABELS[self.get_action(seat, hand)]
+
+    def action_ev_options(self, seat: Seat, hand: Hand) -> Dict[str, object]:
+        """Keyword arguments for ActionEVSolver.action_evs() describing what a hand may do right now."""
+        rules = self.rules
+        return dict(can_hit=self.hand_action_possible(seat, hand, 'hit'),
+                    can_double=self.hand_action_possible(seat, hand, 'double'),
+                    can_split=self.hand_action_possible(seat, hand, 'split'),
+                    can_surrender=self.hand_action_possible(seat, hand, 'surrender'),
+                    resplits=rules.max_splits - len(seat.hands), dealer_checked=rules.dealer_peeks_for_blackjack)
+
+    def get_action_evs(self, seat: Seat, hand: Hand) -> Dict[Action, float]:
+        """EV of each action a hand can take, per unit of its bet, from the cards players haven't seen."""
+        options = self.action_ev_options(seat, hand)
+        if self.ev_cache is not None:
+            return self.ev_cache.action_evs(hand.state, self.dealer.get_up_card_value(), **options)
+        return calculate_action_evs(hand.state, self.dealer.get_up_card_value(), self.unseen_composition(),
+                                    self.rules, **options)
+
+    def action_ev_request(self) -> Dict[str, object]:
+        """Everything table_action_evs() needs, copied now so it can be solved on another thread."""
+        if self.ev_cache is not None:
+            snapshot = self.ev_cache.snapshot()
+        else:
+            composition = self.unseen_composition()
+            snapshot = (composition_key(composition), composition)
+        hands = {(seat_index, hand_index): (hand.state, self.action_ev_options(seat, hand))
+                 for seat_index, seat in enumerate(self.seats)
+                 for hand_index, hand in enumerate(seat.hands)
+                 if hand.status == STATUS_ACTIVE and not hand.is_surrendered}
+        return dict(snapshot=snapshot, upcard=self.dealer.get_up_card_value(), hands=hands)
+
+    def table_action_evs(self, request: Optional[Dict[str, object]] = None
+                         ) -> Dict[Tuple[int, int], Dict[Action, float]]:
+        """Action EVs for every hand still in play, keyed by (seat index, hand index).
+
+        Every hand shares the shoe's solver for the upcard, so this stays cheap
+        enough to refresh after each card at a full table.
+
+        Args:
+            request: An earlier action_ev_request(), for solving off the thread
+                that plays the table (defaults to the table as it is now)
+        """
+        if request is None:
+            request = self.action_ev_request()
+        key, composition = request['snapshot']
+        if self.ev_cache is not None:
+            solver = self.ev_cache.solver(request['upcard'], request['snapshot'])
+        else:
+            solver = get_solver(request['upcard'], composition, self.rules, key)
+        return {hand_key: solver.action_evs(state, **options)
+                for hand_key, (state, options) in request['hands'].items()}
+
+    def is_action_possible(self, action: str) -> bool:
+        seat, hand = self.get_current_hand()
+        if not seat or not hand:
+            return False
+        return self.hand_action_possible(seat, hand, action)
+
+    def hand_action_possible(self, seat: Seat, hand: Hand, action: str) -> bool:
+        """Whether a hand could take an action if it were its turn."""
+        if hand.status != STATUS_ACTIVE:
+            return False
+        if hand.is_surrendered:
+            return False
+        if action in ('hit', 'double') and hand.is_split_aces():
+            return False  # Split aces receive one card only
+        if action == 'double':
+            if hand.is_split and not self.rules.double_after_split:
+                return False
+            return len(hand.cards) == 2 and seat.balance >= hand.bet
+        if action == 'split':
+            if len(seat.hands) > self.rules.max_splits:
+                return False
+            if hand.is_split_aces() and not self.rules.resplit_aces:
+                return False
+            return seat.can_split(hand) and seat.balance >= hand.bet
+        if action == 'surrender':
+            return (not hand.is_split and
+                    self.rules.can_surrender(len(hand.cards), self.dealer.get_up_card_value()) and
+                    not self.insurance_offered)  # Can't surrender if insurance was offered
+        return True
+
+    def choose_autoplay_action(self, seat: Seat, hand: Hand, recommendation: Action) -> Action:
+        """Pick the action an autoplaying seat takes, including skill-based mistakes.
+
+        Sets last_autoplay_mistake to the mistaken recommendation string, or None.
+        """
+        action = recommendation
+        self.last_autoplay_mistake = None
+        if seat.get_skill_level() < 1.0 and self.rng.random() > seat.get_skill_level():
+            action = Action.STAND if recommendation == Action.HIT else Action.HIT
+            self.last_autoplay_mistake = ACTION_LABELS[action]
+
+        ignore_pairs = False
+        if action == Action.SPLIT and not self.is_action_possible("split"):
+            ignore_pairs = True
+            action = self._chart_action(seat, hand, ignore_pairs=True)
+        if action in (Action.DOUBLE, Action.SURRENDER) and not self.is_action_possible(ACTION_NAMES[action]):
+            # The chart's fallback, e.g. stand for 'Ds' and split for 'Rp'
+            action = self._chart_action(seat, hand, ignore_pairs, allow_double=False)
+            if action == Action.SPLIT and not self.is_action_possible("split"):
+                action = self._chart_action(seat, hand, ignore_pairs=True, allow_double=False)
+        if action == Action.HIT and not self.is_action_possible("hit"):
+            action = Action.STAND
+        return action
+
+    def apply_action(self, action):
+        """Apply an Action code or engine action name ('hit', 'stand', 'double', 'split', 'surrender')."""
+        if isinstance(action, str):
+            action = ACTION_NAMES.index(action)
+        return (self.hit, self.stand, self.double_down, self.split, self.surrender)[action]()
+
+    def hit(self):
+        seat, hand = self.get_current_hand()
+        if not self.is_action_possible('hit'):
+            return None
+        card = self._draw()
+        hand.add_card(card)
+        seat.record_action("hit")
+        if hand.is_busted:
+            hand.status = STATUS_BUST
+        return card
+
+    def stand(self) -> bool:
+        seat, hand = self.get_current_hand()
+        if not seat or not hand or hand.status != STATUS_ACTIVE:
+            return False
+        hand.status = STATUS_STAND
+        seat.record_action("stand")
+        return True
+
+    def double_down(self):
+        if not self.is_action_possible('double'):
+            return None
+        seat, hand = self.get_current_hand()
+        seat.balance -= hand.bet
+        hand.bet *= 2
+        card = self._draw()
+        hand.add_card(card)
+        hand.status = STATUS_STAND if not hand.is_busted else STATUS_BUST
+        seat.record_action("double")
+        return card
+
+    def split(self) -> bool:
+        if not self.is_action_possible('split'):
+            return False
+        seat, hand = self.get_current_hand()
+        seat.balance -= hand.bet
+        hand.is_split = True
+        new_hand = Hand(hand.bet, is_split=True)
+        new_hand.add_card(hand.pop_card())
+        seat.hands.insert(self.current_hand_index + 1, new_hand)
+        hand.add_card(self._draw())
+        new_hand.add_card(self._draw())
+        seat.record_action("split")
+
+        if hand.is_split_aces():
+            # Split aces get one card each; a new pair of aces may be split again if allowed
+            for split_hand in (hand, new_hand):
+                if not (self.rules.resplit_aces and seat.can_split(split_hand)):
+                    split_hand.status = STATUS_STAND
+        return True
+
+    def surrender(self) -> bool:
+        if not self.is_action_possible('surrender'):
+            return False
+        seat, hand = self.get_current_hand()
+        hand.is_surrendered = True
+        hand.status = STATUS_STAND
+        seat.record_action("surrender")
+        return True
+
+    # --- Dealer play and settlement ---
+
+    def reveal_hole_card(self):
+        if self.dealer.hole_card_hidden:
+            self.dealer.reveal_hole_card()
+            self.card_counter.count_card(CARD_VALUES[self.dealer.hand[1]])
+            if self.ev_cache is not None:
+                self.ev_cache.card_seen(CARD_VALUES[self.dealer.hand[1]])
+
+    def dealer_should_hit(self) -> bool:
+        """Dealer draws only while some hand still depends on the dealer's total."""
+        live_hands = any(not hand.is_busted and not hand.is_surrendered and not hand.has_blackjack
+                         for seat in self.seats for hand in seat.hands)
+        if not live_hands or self.dealer.has_blackjack:
+            return False
+        return dealer_hits(self.dealer.state, self.rules.dealer_hits_soft_17)
+
+    def dealer_hit(self):
+        card = self._draw()
+        self.dealer.add_card(card)
+        return card
+
+    def play_dealer(self):
+        self.reveal_hole_card()
+        while self.dealer_should_hit():
+            self.dealer_hit()
+
+    def settle(self) -> float:
+        """Pay out every hand against the dealer's final total.
+
+        Returns:
+            Total net result for all seats this round, including insurance
+        """
+        dealer_total = self.dealer.get_hand_value()
+        dealer_busted = self.dealer.is_busted
+        dealer_has_blackjack = self.dealer.has_blackjack
+        blackjack_multiplier = self.rules.get_blackjack_payout_multiplier()
+        insurance_multiplier = self.rules.get_insurance_payout()
+        blackjack_text = "3:2" if self.rules.blackjack_pays_3to2 else "6:5"
+        total_net = 0.0
+
+        for seat in self.seats:
+            net = 0.0
+            for hand in seat.hands:
+                if hand.is_surrendered:
+                    # Surrendered hand - lose half bet
+                    seat.record_surrender(hand)
+                    net -= hand.bet / 2
+                    hand.result_text = "Surrendered (Lose 50%)"
+                    hand.result_color = YELLOW
+                elif hand.is_busted:
+                    seat.record_loss(hand)
+                    net -= hand.bet
+                    hand.result_text = "Bust! Lost"
+                    hand.result_color = RED
+                elif hand.has_blackjack:
+                    if dealer_has_blackjack:
+                        seat.record_push(hand)
+                        hand.result_text = "Push (Blackjack)"
+                        hand.result_color = BLUE
+                    else:
+                        seat.record_win(hand, payout_multiplier=blackjack_multiplier)
+                        net += hand.bet * blackjack_multiplier
+                        hand.result_text = f"Blackjack! Win ({blackjack_text})"
+                        hand.result_color = GREEN
+                elif dealer_has_blackjack:
+                    seat.record_loss(hand)
+                    net -= hand.bet
+                    hand.result_text = "Lost (Dealer Blackjack)"
+                    hand.result_color = RED
+                elif dealer_busted:
+                    seat.record_win(hand)
+                    net += hand.bet
+                    hand.result_text = "Win (Dealer Busts)"
+                    hand.result_color = GREEN
+                elif hand.hand_value > dealer_total:
+                    seat.record_win(hand)
+                    net += hand.bet
+                    hand.result_text = "Win"
+                    hand.result_color = GREEN
+                elif hand.hand_value < dealer_total:
+                    seat.record_loss(hand)
+                    net -= hand.bet
+                    hand.result_text = "Lost"
+                    hand.result_color = RED
+                else:  # Push
+                    seat.record_push(hand)
+                    hand.result_text = "Push"
+                    hand.result_color = BLUE
+
+                if hand.insurance_bet > 0:
+                    if dealer_has_blackjack:
+                        # Insurance pays 2:1
+                        seat.balance += hand.insurance_bet * (1 + insurance_multiplier)
+                        net += hand.insurance_bet * insurance_multiplier
+                        hand.result_text += " + Insurance Win"
+                    else:
+                        net -= hand.insurance_bet
+                        hand.result_text += " (Insurance Lost)"
+            seat.round_net = net
+            total_net += net
+
+        return total_net
+
+    # --- Headless play ---
+
+    def play_round(self) -> bool:
+        """Play one complete round with every seat on autoplay.
+
+        Insurance is declined, as basic strategy recommends, unless the true
+        count has reached insurance_index.
+
+        Returns:
+            False if the round couldn't start because a seat can't cover its bet
+        """
+        if not self.start_round():
+            return False
+        if self.insurance_offered:
+            if self.insurance_recommended():
+                for seat in self.seats:
+                    self.take_insurance(seat)
+            self.close_insurance()
+
+        seat, hand = self.next_decision()
+        while seat is not None:
+            recommendation = self.get_action(seat, hand)
+            self.apply_action(self.choose_autoplay_action(seat, hand, recommendation))
+            seat, hand = self.next_decision()
+
+        self.play_dealer()
+        self.settle()
+        return True
@@ -0,0 +1,23 @@
+"""Closed-form risk of ruin."""
+
+import math
+
+import pytest
+
+from bankroll_manager import BankrollManager
+
+
+@pytest.mark.parametrize("rtp", [0.995, 1.0])
+def test_no_edge_is_certain_ruin(rtp):
+    assert BankrollManager(1000).calculate_risk_of_ruin(10, rtp=rtp) == 100.0
+
+
+def test_positive_edge_uses_exponential_formula():
+    # exp(-2 * 1% * 100 units / 1.26)
+    ror = BankrollManager(1000).calculate_risk_of_ruin(10, rtp=1.01, variance=1.26)
+    assert ror == pytest.approx(100 * math.exp(-2 * 0.01 * 100 / 1.26))
+    assert BankrollManager(2000).calculate_risk_of_ruin(10, rtp=1.01, variance=1.26) == pytest.approx(ror ** 2 / 100)
+
+
+def test_betting_the_whole_bankroll():
+    assert BankrollManager(100).calculate_risk_of_ruin(100, rtp=1.5) == 100.0
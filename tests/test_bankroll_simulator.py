@@ -0,0 +1,41 @@
+"""Monte Carlo bankroll trajectories against the closed-form risk of ruin."""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from bankroll_simulator import simulate_bankroll
+from count_tables import NUM_BUCKETS, NUM_OUTCOMES, OUTCOME_LIMIT, OUTCOME_SCALE, TC_LIMIT, TrueCountStats
+
+
+def coin_flip_stats(win_probability):
+    """Every round at true count 0, winning or losing one unit."""
+    frequency, ev, variance = [0.0] * NUM_BUCKETS, [0.0] * NUM_BUCKETS, [0.0] * NUM_BUCKETS
+    outcomes = [[0.0] * NUM_OUTCOMES for _ in range(NUM_BUCKETS)]
+    edge = 2 * win_probability - 1
+    frequency[TC_LIMIT], ev[TC_LIMIT], variance[TC_LIMIT] = 1.0, edge, 1 - edge * edge
+    outcomes[TC_LIMIT][OUTCOME_LIMIT + OUTCOME_SCALE] = 1000 * win_probability
+    outcomes[TC_LIMIT][OUTCOME_LIMIT - OUTCOME_SCALE] = 1000 * (1 - win_probability)
+    return TrueCountStats("Coin", "synthetic", 1000, frequency, ev, variance, outcomes)
+
+
+def test_long_run_ruin_matches_formula():
+    # A 2% edge and 20 units: exp(-2 * 0.02 * 20 / 1) is about 45%; almost every ruin happens
+    # in the first few thousand hands, so 50,000 hands stands in for unlimited play
+    result = simulate_bankroll(coin_flip_stats(0.51), [1.0] * NUM_BUCKETS, 20, num_trajectories=20_000,
+                               num_hands=50_000, seed=1)
+    assert result['ev'] == pytest.approx(0.02)
+    assert result['formula_ror'] == pytest.approx(0.449, abs=0.001)
+    assert result['risk_of_ruin'] == pytest.approx(result['formula_ror'], abs=4 * result['ror_error'])
+
+
+def test_ruin_only_grows_with_time():
+    result = simulate_bankroll(coin_flip_stats(0.51), [1.0] * NUM_BUCKETS, 20, num_trajectories=5_000,
+                               num_hands=20_000, seed=2)
+    assert result['ruined'] == sorted(result['ruined'])
+    assert result['ruined'][-1] == pytest.approx(result['risk_of_ruin'])
+
+
+def test_bankroll_must_be_positive():
+    with pytest.raises(ValueError):
+        simulate_bankroll(coin_flip_stats(0.51), [1.0] * NUM_BUCKETS, 0)
@@ -0,0 +1,34 @@
+"""Count table cache keys and storage."""
+
+import pytest
+
+from casino_rules import CasinoRules
+from count_tables import NUM_BUCKETS, NUM_OUTCOMES, TC_LIMIT, TrueCountStats, count_table_key
+
+
+@pytest.mark.parametrize("field, value", [("penetration", 0.8), ("cut_card_decks", 1.5), ("cut_card_jitter", 20),
+                                          ("continuous_shuffle", True)])
+def test_key_changes_with_every_shoe_rule(field, value):
+    rules = CasinoRules()
+    key = count_table_key("Hi-Lo", rules, 6)
+    setattr(rules, field, value)
+    assert count_table_key("Hi-Lo", rules, 6) != key
+
+
+def test_save_load_round_trip(tmp_path):
+    outcomes = [[float((bucket * 7 + outcome) % 5) for outcome in range(NUM_OUTCOMES)] for bucket in range(NUM_BUCKETS)]
+    stats = TrueCountStats("Hi-Lo", "0123456789abcdef", 12345, [i / 100 for i in range(NUM_BUCKETS)],
+                           [(i - TC_LIMIT) / 200 for i in range(NUM_BUCKETS)], [1.3] * NUM_BUCKETS, outcomes)
+    path = str(tmp_path / "table.bin")
+    stats.save(path)
+    loaded = TrueCountStats.load(path)
+    assert (loaded.system_name, loaded.key, loaded.rounds) == ("Hi-Lo", "0123456789abcdef", 12345)
+    assert (loaded.frequency, loaded.ev, loaded.variance) == (stats.frequency, stats.ev, stats.variance)
+    assert [list(row) for row in loaded.outcomes] == outcomes
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "table.bin"
+    path.write_bytes(b"not a count table at all, just some text")
+    with pytest.raises(ValueError):
+        TrueCountStats.load(str(path))
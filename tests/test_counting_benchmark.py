@@ -0,0 +1,14 @@
+"""Counting benchmark checkpoint keys."""
+
+from casino_rules import CasinoRules
+from counting_benchmark import _setup_key
+from counting_systems import COUNTING_SYSTEMS
+
+
+def test_checkpoint_key_changes_with_cut_card_depth():
+    rules = CasinoRules()
+    setup = dict(rules=rules, systems=[COUNTING_SYSTEMS["Hi-Lo"]], num_decks=6, num_shoes=64)
+    key = _setup_key(setup, 1000, 4, 1)
+    rules.cut_card_decks = 2.0
+    assert _setup_key(setup, 1000, 4, 1) != key
+    assert _setup_key(setup, 1000, 4, 1) == _setup_key(setup, 1000, 4, 1)
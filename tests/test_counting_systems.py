@@ -0,0 +1,62 @@
+"""Counting-system tags, balance and true counts."""
+
+import pytest
+
+from counting_systems import COUNTING_SYSTEMS, CountingSystem, get_counting_system
+from deck import DECK_COMPOSITION
+
+# Published tags, listed ace, 2, ..., 9, ten
+PUBLISHED_TAGS = {
+    "Hi-Lo": (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1),
+    "KO": (-1, 1, 1, 1, 1, 1, 1, 0, 0, -1),
+    "Hi-Opt I": (0, 0, 1, 1, 1, 1, 0, 0, 0, -1),
+    "Hi-Opt II": (0, 1, 1, 2, 2, 1, 1, 0, 0, -2),
+    "Omega II": (0, 1, 1, 2, 2, 2, 1, 0, -1, -2),
+    "Zen": (-1, 1, 1, 2, 2, 2, 1, 0, 0, -2),
+}
+# Running count after one full deck, and the largest tag
+DECK_SUMS = {"Hi-Lo": 0, "KO": 4, "Hi-Opt I": 0, "Hi-Opt II": 0, "Omega II": 0, "Zen": 0}
+LEVELS = {"Hi-Lo": 1, "KO": 1, "Hi-Opt I": 1, "Hi-Opt II": 2, "Omega II": 2, "Zen": 2}
+
+
+@pytest.mark.parametrize("name", sorted(PUBLISHED_TAGS))
+def test_tags_match_published(name):
+    system = get_counting_system(name)
+    assert system.tags == PUBLISHED_TAGS[name]
+    assert system.level == LEVELS[name]
+
+
+@pytest.mark.parametrize("name", sorted(PUBLISHED_TAGS))
+def test_deck_sum_and_balance(name):
+    system = COUNTING_SYSTEMS[name]
+    assert system.running_count(DECK_COMPOSITION) == DECK_SUMS[name]
+    assert system.imbalance == DECK_SUMS[name]
+    assert system.balanced == (DECK_SUMS[name] == 0)
+
+
+@pytest.mark.parametrize("name", sorted(PUBLISHED_TAGS))
+def test_neutral_cards_give_zero_true_count(name):
+    # Two decks dealt in exact proportion from eight leave every system at a true count of 0
+    system = COUNTING_SYSTEMS[name]
+    seen = [2 * count for count in DECK_COMPOSITION]
+    assert system.true_count(system.running_count(seen), 104, 312) == pytest.approx(0.0)
+
+
+def test_unbalanced_true_count_matches_balanced_equivalent():
+    # Removing four low cards from a fresh shoe reads the same on KO and Hi-Lo
+    seen = [0, 0, 1, 1, 1, 1, 0, 0, 0, 0, 0]
+    hi_lo, ko = COUNTING_SYSTEMS["Hi-Lo"], COUNTING_SYSTEMS["KO"]
+    assert ko.true_count(ko.running_count(seen), 4, 412) == pytest.approx(
+        hi_lo.true_count(hi_lo.running_count(seen), 4, 412), abs=0.05)
+
+
+def test_insurance_side_count_is_balanced():
+    for system in COUNTING_SYSTEMS.values():
+        assert system.side_count("insurance", DECK_COMPOSITION) == 0
+
+
+def test_bad_tags_and_names_raise():
+    with pytest.raises(ValueError):
+        CountingSystem("Short", (1, 1, 1))
+    with pytest.raises(ValueError):
+        get_counting_system("No Such Count")
@@ -0,0 +1,35 @@
+"""Dealer final-total distribution against published bust rates."""
+
+import pytest
+
+from dealer_probabilities import BUST, dealer_probabilities
+from probability_calculator import FULL_SHOE_COMPOSITION
+
+# Infinite-deck dealer bust rates by upcard (ace ... 10), blackjacks included in the totals
+S17_BUST = [0.1153, 0.3536, 0.3739, 0.3945, 0.4164, 0.4232, 0.2623, 0.2447, 0.2284, 0.2121]
+H17_BUST = [0.1389, 0.3567, 0.3767, 0.3971, 0.4177, 0.4395, 0.2623, 0.2447, 0.2284, 0.2121]
+
+
+@pytest.mark.parametrize("hits_soft_17, expected", [(False, S17_BUST), (True, H17_BUST)])
+def test_bust_rates_by_upcard(hits_soft_17, expected):
+    # Eight decks are within a few hundredths of a percent of an infinite shoe
+    for upcard, bust in zip(range(1, 11), expected):
+        outcome = dealer_probabilities(upcard, FULL_SHOE_COMPOSITION, hits_soft_17)
+        assert outcome[BUST] == pytest.approx(bust, abs=0.001), upcard
+
+
+def test_six_upcard_busts_about_42_percent():
+    assert dealer_probabilities(6, FULL_SHOE_COMPOSITION, False)[BUST] == pytest.approx(0.423, abs=0.001)
+
+
+@pytest.mark.parametrize("no_blackjack", [False, True])
+def test_outcomes_sum_to_one(no_blackjack):
+    for upcard in range(1, 11):
+        assert sum(dealer_probabilities(upcard, FULL_SHOE_COMPOSITION, True, no_blackjack)) == pytest.approx(1.0)
+
+
+def test_depends_on_composition():
+    # Stripping the tens out of the shoe makes a 6 bust far less often
+    composition = list(FULL_SHOE_COMPOSITION)
+    composition[10] = 0
+    assert dealer_probabilities(6, composition, False)[BUST] < 0.3
@@ -0,0 +1,87 @@
+"""Action EVs against published full-shoe figures, and the live shoe cache."""
+
+import pytest
+
+from blackjack_strategy import Action
+from casino_rules import CasinoRules
+from dealer_probabilities import DEALER_BLACKJACK, dealer_probabilities
+from ev_engine import ShoeEVCache, calculate_action_evs
+from hand_states import state_after
+from probability_calculator import FULL_SHOE_COMPOSITION
+
+RULES = CasinoRules()  # S17, DAS, late surrender, dealer peeks
+
+
+def evs(cards, upcard, **legal):
+    return calculate_action_evs(state_after(cards), upcard, FULL_SHOE_COMPOSITION, RULES, **legal)
+
+
+def test_sixteen_vs_ten():
+    # Published: stand -0.540, hit -0.540, hitting a hair better for a total-dependent 16
+    result = evs([10, 6], 10, dealer_checked=True)
+    assert result[Action.STAND] == pytest.approx(-0.540, abs=0.002)
+    assert result[Action.HIT] == pytest.approx(-0.540, abs=0.002)
+    assert result[Action.HIT] > result[Action.STAND]
+    assert result[Action.SURRENDER] == -0.5
+
+
+def test_eleven_vs_six():
+    # Published: double +0.667, hit +0.333
+    result = evs([6, 5], 6, dealer_checked=True)
+    assert result[Action.DOUBLE] == pytest.approx(0.667, abs=0.002)
+    assert result[Action.HIT] == pytest.approx(0.333, abs=0.002)
+    assert result[Action.DOUBLE] == pytest.approx(2 * result[Action.HIT], abs=0.001)
+
+
+def test_split_eights_vs_ten():
+    # Published (DAS): split -0.48, well ahead of standing or hitting at about -0.54
+    result = evs([8, 8], 10, dealer_checked=True)
+    assert result[Action.SPLIT] == pytest.approx(-0.480, abs=0.003)
+    assert max(result, key=result.get) == Action.SPLIT
+
+
+@pytest.mark.parametrize("upcard", [1, 10])
+def test_unpeeked_evs_fold_in_dealer_blackjack(upcard):
+    # A peeking dealer's blackjack takes only the original bet, whatever the action
+    blackjack = dealer_probabilities(upcard, FULL_SHOE_COMPOSITION, RULES.dealer_hits_soft_17)[DEALER_BLACKJACK]
+    checked = evs([10, 6], upcard, dealer_checked=True)
+    unchecked = evs([10, 6], upcard, dealer_checked=False)
+    for action, ev in checked.items():
+        assert unchecked[action] == pytest.approx(-blackjack + (1 - blackjack) * ev)
+
+
+def test_early_surrender_ignores_the_peek():
+    rules = CasinoRules()
+    rules.surrender_type = "early"
+    result = calculate_action_evs(state_after([10, 6]), 1, FULL_SHOE_COMPOSITION, rules, dealer_checked=False)
+    assert result[Action.SURRENDER] == -0.5
+
+
+def test_illegal_actions_are_left_out():
+    result = evs([10, 6], 10, can_double=False, can_surrender=False, dealer_checked=True)
+    assert set(result) == {Action.STAND, Action.HIT}
+
+
+def test_cache_restores_key_and_evs_when_a_card_returns():
+    cache = ShoeEVCache(RULES, FULL_SHOE_COMPOSITION)
+    state = state_after([10, 6])
+    key, before = cache.key, cache.action_evs(state, 10, dealer_checked=True)
+    cache.card_seen(5)
+    assert cache.key != key
+    assert cache.action_evs(state, 10, dealer_checked=True) != before
+    cache.card_returned(5)
+    assert cache.key == key
+    assert list(cache.composition) == list(FULL_SHOE_COMPOSITION)
+    assert cache.action_evs(state, 10, dealer_checked=True) == before
+
+
+def test_cache_solves_an_old_snapshot_without_replacing_current_solvers():
+    cache = ShoeEVCache(RULES, FULL_SHOE_COMPOSITION)
+    snapshot = cache.snapshot()
+    cache.card_seen(10)
+    current = cache.solver(6)
+    old = cache.solver(6, snapshot)
+    assert old is not current
+    assert cache.solver(6) is current
+    assert old.action_evs(state_after([6, 5])) == calculate_action_evs(
+        state_after([6, 5]), 6, FULL_SHOE_COMPOSITION, RULES)
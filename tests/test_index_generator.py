@@ -0,0 +1,55 @@
+"""Crossover finding on synthetic gain curves."""
+
+import pytest
+
+from index_generator import crossover
+
+
+def _line(slope, root, counts=range(-6, 11), weight=100.0):
+    return [(tc, slope * (tc - root), weight) for tc in counts]
+
+
+@pytest.mark.parametrize("root", [-3.5, 0.0, 2.5, 6.2])
+def test_rising_line(root):
+    found, rising = crossover(_line(0.01, root))
+    assert found == pytest.approx(root)
+    assert rising
+
+
+def test_falling_line():
+    found, rising = crossover(_line(-0.02, 1.3))
+    assert found == pytest.approx(1.3)
+    assert not rising
+
+
+def test_no_sign_change():
+    assert crossover([(tc, -0.05 - 0.001 * tc, 10.0) for tc in range(-5, 6)]) is None
+    assert crossover([]) is None
+
+
+def test_unsorted_points_and_curvature():
+    # Only the buckets near the sign change shape the fit, so curvature far away doesn't pull the root
+    points = [(tc, 0.01 * (tc - 2) + (0.02 * (tc - 6) ** 2 if tc > 6 else 0.0), 50.0) for tc in range(-6, 13)]
+    found, rising = crossover(list(reversed(points)))
+    assert found == pytest.approx(2.0, abs=0.01)
+    assert rising
+
+
+def test_best_supported_change_wins():
+    # A spurious flip among thinly sampled high counts loses to the well-sampled one near 0
+    points = _line(0.01, 0.5, counts=range(-6, 8))
+    points += [(8, -0.01, 0.5), (9, 0.02, 0.5)]
+    found, rising = crossover(points)
+    assert found == pytest.approx(0.5)
+    assert rising
+
+
+def test_fit_disagreeing_with_the_flip_is_rejected():
+    # One noisy bucket crosses zero but the buckets around it trend the other way
+    points = [(0, -0.10, 1.0), (1, 0.01, 1.0), (2, -0.12, 1.0), (3, -0.13, 1.0), (4, -0.14, 1.0)]
+    assert crossover(points) is None
+
+
+def test_root_stays_between_the_bracketing_buckets():
+    found, _ = crossover([(0, -0.001, 1.0), (1, 0.5, 1.0), (2, 0.5, 1.0), (3, 0.5, 1.0)])
+    assert 0 <= found <= 1
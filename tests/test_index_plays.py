@@ -0,0 +1,80 @@
+"""IndexedStrategy lookups on either side of an index."""
+
+import random
+
+import pytest
+
+from blackjack_strategy import Action
+from hand_states import state_after
+from index_plays import (DEFAULT_INDEX_PLAYS, INSURANCE_INDEX, IndexedStrategy, format_index_play,
+                         parse_index_play)
+from table_engine import Seat, TableEngine
+
+
+@pytest.fixture(scope="module")
+def indexed():
+    return IndexedStrategy("Basic")
+
+
+@pytest.mark.parametrize("cards, upcard, index, below, at_or_above", [
+    ([10, 6], 10, 0, Action.HIT, Action.STAND),
+    ([10, 2], 3, 2, Action.HIT, Action.STAND),
+    ([10, 10], 6, 4, Action.STAND, Action.SPLIT),
+    ([6, 5], 1, 1, Action.HIT, Action.DOUBLE),
+    ([10, 5], 10, 0, Action.HIT, Action.SURRENDER),
+])
+def test_action_switches_exactly_at_index(indexed, cards, upcard, index, below, at_or_above):
+    state = state_after(cards)
+    assert indexed.lookup(state, upcard, index - 0.01) == below
+    assert indexed.lookup(state, upcard, index) == at_or_above
+    assert indexed.lookup(state, upcard, index + 5) == at_or_above
+
+
+def test_fallbacks_when_double_and_surrender_are_not_allowed(indexed):
+    # 11 vs A hits either side of its index without a double, and 15 vs 10 keeps its
+    # playing index (stand at +4) once surrender is unavailable
+    eleven, fifteen = state_after([6, 5]), state_after([10, 5])
+    assert indexed.lookup(eleven, 1, 3, allow_double=False) == Action.HIT
+    assert indexed.lookup(fifteen, 10, 3.99, allow_double=False) == Action.HIT
+    assert indexed.lookup(fifteen, 10, 4, allow_double=False) == Action.STAND
+
+
+def test_batch_lookup_matches_single_lookups(indexed):
+    np = pytest.importorskip("numpy")
+    states = [state_after(cards) for cards in ([10, 6], [10, 2], [10, 10], [6, 5], [10, 5], [8, 8])]
+    true_counts = np.array([-1, -0.01, 0, 1.99, 2, 4])
+    for upcard in range(1, 11):
+        for state in states:
+            batch = indexed.lookup_batch(np.full(len(true_counts), state), upcard, true_counts)
+            assert list(batch) == [indexed.lookup(state, upcard, tc) for tc in true_counts]
+
+
+def test_insurance_at_index(indexed):
+    assert not indexed.take_insurance(INSURANCE_INDEX - 0.01)
+    assert indexed.take_insurance(INSURANCE_INDEX)
+    assert not IndexedStrategy("Basic", insurance_index=None).take_insurance(10)
+
+
+def test_conflicting_plays_raise():
+    plays = [parse_index_play("16v10:S@0/H"), parse_index_play("12v3:S@2/H"), parse_index_play("16v10:D@3/S")]
+    IndexedStrategy("Basic", plays)  # The later 16 vs 10 play replaces the first
+    with pytest.raises(ValueError):
+        # Hit, then stand from 0, then surrender from +3 changes one cell twice
+        IndexedStrategy("Basic", [parse_index_play("16v10:S@0/H"), parse_index_play("16v10:R@3"),
+                                  parse_index_play("12v3:S@2/H")])
+
+
+def test_text_round_trip():
+    for play in DEFAULT_INDEX_PLAYS:
+        assert parse_index_play(format_index_play(play)) == play
+
+
+def test_engine_rebuilds_when_plays_change():
+    seat = Seat(0, 1000, 10, "Basic", "Flat", 1.0, track_history=False)
+    engine = TableEngine(seats=[seat], rng=random.Random(1))
+    engine.index_plays = [parse_index_play("16v10:S@0/H")]
+    engine.play_round()
+    engine.index_plays = [parse_index_play("16v10:S@10/H")]
+    engine.play_round()
+    _, indexed = next(iter(engine._indexed.values()))
+    assert indexed.lookup(state_after([10, 6]), 10, 5) == Action.HIT
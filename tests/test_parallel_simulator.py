@@ -0,0 +1,37 @@
+"""Sharded runs merge to the same result whatever the worker count."""
+
+import pytest
+
+from parallel_simulator import run_parallel_simulation
+
+RESULT_FIELDS = ("rounds", "hands", "total_net", "total_net_sq", "total_initial_bet", "stopped_early")
+SESSION_FIELDS = ("total_rounds", "total_pl", "winning_rounds", "losing_rounds", "push_rounds")
+
+
+def _run(workers):
+    return run_parallel_simulation(12_000, num_shards=4, workers=workers, seed=2024, num_players=2,
+                                   betting_strategy="Paroli", skill_level=0.9)
+
+
+@pytest.fixture(scope="module")
+def serial():
+    return _run(1)
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_merged_result_is_identical(serial, workers):
+    parallel = _run(workers)
+    for field in RESULT_FIELDS:
+        assert getattr(parallel, field) == getattr(serial, field), field
+    for field in SESSION_FIELDS:
+        assert getattr(parallel.session_stats, field) == getattr(serial.session_stats, field), field
+    assert len(parallel.seats) == len(serial.seats) == 2
+    for seat, serial_seat in zip(parallel.seats, serial.seats):
+        assert seat.balance == serial_seat.balance
+        assert vars(seat.stats) == vars(serial_seat.stats)
+
+
+def test_rounds_are_all_played(serial):
+    assert serial.rounds == 12_000 and not serial.stopped_early
+    assert serial.session_stats.total_rounds == 12_000
+    assert sum(seat.stats.total_hands for seat in serial.seats) >= serial.hands
@@ -0,0 +1,76 @@
+"""Generated charts against published 6-deck basic strategy (DAS, late surrender, dealer peeks)."""
+
+import pytest
+
+from casino_rules import CasinoRules
+from strategy_generator import UPCARDS, generate_strategy
+
+# Rows read against upcards 2-10 then ace; letters as in the generated chart
+# (Ds = double, else stand; Rs/Rp = surrender, else stand/split)
+S17_CHART = {
+    'hard': {
+        17: "S S S S S S S S S S",
+        16: "S S S S S H H R R R",
+        15: "S S S S S H H H R H",
+        14: "S S S S S H H H H H",
+        13: "S S S S S H H H H H",
+        12: "H H S S S H H H H H",
+        11: "D D D D D D D D D H",
+        10: "D D D D D D D D H H",
+        9: "H D D D D H H H H H",
+        8: "H H H H H H H H H H",
+    },
+    'soft': {
+        19: "S S S S S S S S S S",
+        18: "S Ds Ds Ds Ds S S H H H",
+        17: "H D D D D H H H H H",
+        16: "H H D D D H H H H H",
+        15: "H H D D D H H H H H",
+        14: "H H H D D H H H H H",
+        13: "H H H D D H H H H H",
+    },
+    'pairs': {
+        10: "S S S S S S S S S S",
+        9: "P P P P P S P P S S",
+        8: "P P P P P P P P P P",
+        7: "P P P P P P H H H H",
+        6: "P P P P P H H H H H",
+        5: "D D D D D D D D H H",
+        4: "H H H P P H H H H H",
+        3: "P P P P P P H H H H",
+        2: "P P P P P P H H H H",
+        1: "P P P P P P P P P P",
+    },
+}
+
+# H17 differs in a handful of cells
+H17_CHANGES = {
+    ('hard', 17): "S S S S S S S S S Rs",
+    ('hard', 15): "S S S S S H H H R R",
+    ('hard', 11): "D D D D D D D D D D",
+    ('soft', 19): "S S S S Ds S S S S S",
+    ('soft', 18): "Ds Ds Ds Ds Ds S S H H H",
+    ('pairs', 8): "P P P P P P P P P Rp",
+}
+
+
+def _published(hits_soft_17):
+    chart = {hand_type: dict(rows) for hand_type, rows in S17_CHART.items()}
+    if hits_soft_17:
+        for (hand_type, row), cells in H17_CHANGES.items():
+            chart[hand_type][row] = cells
+    return chart
+
+
+@pytest.mark.parametrize("hits_soft_17", [False, True], ids=["S17", "H17"])
+def test_six_deck_chart_matches_published(hits_soft_17):
+    rules = CasinoRules()
+    rules.dealer_hits_soft_17 = hits_soft_17
+    chart = generate_strategy(rules, 6, cache_dir=None)['chart']
+    mismatches = []
+    for hand_type, rows in _published(hits_soft_17).items():
+        for row, cells in rows.items():
+            for upcard, expected in zip(UPCARDS, cells.split()):
+                if chart[hand_type][row][upcard] != expected:
+                    mismatches.append(f"{hand_type} {row} vs {upcard}: {chart[hand_type][row][upcard]} != {expected}")
+    assert not mismatches, "\n".join(mismatches)
@@ -0,0 +1,36 @@
+"""The vectorized backend against the round-by-round engine."""
+
+import math
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from batch_simulator import run_simulation
+from casino_rules import CasinoRules
+from vectorized_simulator import run_vectorized_simulation
+
+
+@pytest.mark.parametrize("hits_soft_17", [False, True], ids=["S17", "H17"])
+def test_ev_agrees_with_engine(hits_soft_17):
+    rules = CasinoRules()
+    rules.dealer_hits_soft_17 = hits_soft_17
+    engine = run_simulation(100_000, rules=rules, seed=11)
+    vectorized = run_vectorized_simulation(1_000_000, num_shoes=20_000, rules=rules, seed=11)
+    # Independent estimates of the same EV: within four combined standard errors
+    tolerance = 4 * math.hypot(engine.get_standard_error(), vectorized.get_standard_error())
+    assert vectorized.get_ev_per_hand() == pytest.approx(engine.get_ev_per_hand(), abs=tolerance)
+    assert vectorized.rounds == vectorized.hands == 1_000_000
+
+
+def test_seeded_runs_repeat():
+    first = run_vectorized_simulation(40_000, num_shoes=2_000, seed=3)
+    second = run_vectorized_simulation(40_000, num_shoes=2_000, seed=3)
+    assert first.total_net == second.total_net
+
+
+def test_result_has_a_seat_with_the_final_balance():
+    result = run_vectorized_simulation(20_000, num_shoes=1_000, seed=5, starting_balance=5_000)
+    seat, = result.seats
+    assert seat.starting_balance == 5_000
+    assert seat.balance == 5_000 + result.total_net
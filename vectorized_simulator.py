@@ -0,0 +1,405 @@
+"""NumPy-vectorized many-shoe simulation backend.
+
+Plays thousands of independent shoes in lockstep. Each shoe is one row of an
+integer card array and every hand is a hand_states index in a (shoes x
+hand-slots) array, so dealing a card to thousands of hands is one gather
+from the transition table. Strategy decisions are array lookups into a
+compiled strategy chart and settlement is masked arithmetic.
+
+Each shoe seats a single player with flat bets who never takes insurance,
+which is what basic-strategy EV estimates need. Use TableEngine for betting
+strategies, multiple players or card counting.
+
+HandPlayoutSimulator reuses the same passes to play one known hand out many
+times from a given set of unseen cards, for Monte Carlo action EVs.
+"""
+
+import math
+import time
+from typing import Optional
+
+import numpy as np
+
+from blackjack_strategy import BASIC_STRATEGY, COMPILED_STRATEGIES, Action, CompiledStrategy
+from batch_simulator import DEFAULT_SIM_BALANCE, SimulationResult
+from cards import CARD_VALUES
+from casino_rules import CasinoRules
+from constants import DEFAULT_NUM_DECKS
+from hand_states import (
+    EMPTY, advance_states, STATE_TOTAL_ARRAY, STATE_BUST_ARRAY, STATE_BLACKJACK_ARRAY,
+    STATE_PAIR_VALUE_ARRAY, STATE_CAN_DOUBLE_ARRAY, STATE_CARD_COUNT_ARRAY, DEALER_HITS_S17_ARRAY,
+    DEALER_HITS_H17_ARRAY
+)
+from table_engine import Seat
+
+# Card values in one 52-card deck (ace = 1, tens and faces = 10)
+_DECK_VALUES = np.frombuffer(CARD_VALUES, dtype=np.uint8).astype(np.int8)
+
+
+class VectorizedSimulator:
+    """Plays one hand per shoe across many shoes at once."""
+
+    def __init__(self, num_shoes: int = 10000, num_decks: int = DEFAULT_NUM_DECKS,
+                 rules: Optional[CasinoRules] = None, strategy=BASIC_STRATEGY, seed=None):
+        self.num_shoes = num_shoes
+        self.num_decks = num_decks
+        self.rules = rules if rules is not None else CasinoRules()
+        self.rng = np.random.default_rng(seed)
+        self.strategy = CompiledStrategy(strategy)
+        self.max_hands = self.rules.max_splits + 1
+
+        self.num_cards = 52 * num_decks
+        self.shoes = np.tile(np.tile(_DECK_VALUES, num_decks), (num_shoes, 1))
+        self.rng.permuted(self.shoes, axis=1, out=self.shoes)
+        self.positions = np.zeros(num_shoes, dtype=np.int64)
+        self.lanes = np.arange(num_shoes)
+        self.cut_positions = np.empty(num_shoes, dtype=np.int64)
+        self._place_cut_cards(self.lanes)
+
+    # --- Shoe handling ---
+
+    def _place_cut_cards(self, rows):
+        """Set the deal position of the cut card in the listed shoes, following the rules' shoe settings."""
+        behind = self.rules.get_cut_card_position(self.num_cards)
+        jitter = self.rules.cut_card_jitter
+        if jitter:
+            behind = behind + self.rng.integers(-jitter, jitter + 1, size=len(rows))
+        self.cut_positions[rows] = self.num_cards - np.clip(behind, 0, self.num_cards)
+
+    def _reshuffle_depleted(self):
+        """Reshuffle every shoe whose cut card came out last round (every shoe under continuous shuffling).
+
+        A shoe that runs out mid-round keeps dealing from its own start,
+        which stands in for shuffling the discards back in.
+
+        Returns:
+            Indices of the reshuffled shoes
+        """
+        if self.rules.continuous_shuffle:
+            depleted = self.lanes
+        else:
+            depleted = np.flatnonzero(self.positions > self.cut_positions)
+        if depleted.size:
+            self.shoes[depleted] = self.rng.permuted(self.shoes[depleted], axis=1)
+            self.positions[depleted] = 0
+            self._place_cut_cards(depleted)
+        return depleted
+
+    def _draw(self, rows):
+        """Deal one card from each listed shoe."""
+        positions = self.positions[rows]
+        cards = self.shoes[rows, positions % self.num_cards]
+        self.positions[rows] = positions + 1
+        return cards.astype(np.int16)
+
+    def _draw_hands(self, rows, mask):
+        """Deal one card to each hand slot set in mask (rows x slots) of the listed shoes, in slot order."""
+        order = np.cumsum(mask, axis=1) - 1
+        positions = self.positions[rows]
+        cards = self.shoes[rows[:, None], (positions[:, None] + order) % self.num_cards]
+        self.positions[rows] = positions + mask.sum(axis=1)
+        return np.where(mask, cards, 0).astype(np.int16)
+
+    # --- One round on every shoe ---
+
+    def play_round(self):
+        """Play one round on every shoe.
+
+        Returns:
+            Net result per shoe in units of the initial bet
+        """
+        rules = self.rules
+        n, slots = self.num_shoes, self.max_hands
+        self._reshuffle_depleted()
+
+        hands = _new_hands(n, slots)
+        state, active = hands['state'], hands['active']
+        active[:, 0] = True
+
+        # Opening deal: two player cards, then dealer up card and hole card
+        _add_cards(hands, self._draw_hands(self.lanes, active))
+        _add_cards(hands, self._draw_hands(self.lanes, active))
+        upcard = self._draw(self.lanes)
+        dealer_state = advance_states(advance_states(EMPTY, upcard), self._draw(self.lanes))
+        dealer_blackjack = STATE_BLACKJACK_ARRAY.take(dealer_state)
+
+        player_blackjack = STATE_BLACKJACK_ARRAY.take(state[:, 0])
+        active[:, 0] &= ~player_blackjack
+        if rules.dealer_peeks_for_blackjack:
+            active[:, 0] &= ~dealer_blackjack
+        return self._play_out(hands, upcard, dealer_state, player_blackjack, dealer_blackjack)
+
+    def _play_out(self, hands, upcard, dealer_state, player_blackjack, dealer_blackjack):
+        """Play every active hand to the end, then the dealer, and settle.
+
+        Returns:
+            Net result per shoe in units of the initial bet
+        """
+        rules = self.rules
+        slots = self.max_hands
+        state, stake, active = hands['state'], hands['stake'], hands['active']
+
+        # Each pass only touches shoes that still have a hand to play
+        while True:
+            rows = np.flatnonzero(active.any(axis=1))
+            if rows.size == 0:
+                break
+            subset = {key: array[rows] for key, array in hands.items()}
+            self._decision_pass(subset, rows, upcard[rows, None])
+            for key, array in hands.items():
+                array[rows] = subset[key]
+
+        # Dealer plays out only where some hand still depends on the dealer's total
+        used = np.arange(slots)[None, :] < hands['num_hands'][:, None]
+        surrendered = hands['surrendered']
+        player_bust = STATE_BUST_ARRAY.take(state)
+        live = (used & ~player_bust & ~surrendered).any(axis=1) & ~player_blackjack & ~dealer_blackjack
+        dealer_hits = DEALER_HITS_H17_ARRAY if rules.dealer_hits_soft_17 else DEALER_HITS_S17_ARRAY
+        while True:
+            rows = np.flatnonzero(live & dealer_hits.take(dealer_state))
+            if rows.size == 0:
+                break
+            dealer_state[rows] = advance_states(dealer_state[rows], self._draw(rows))
+        dealer_total = STATE_TOTAL_ARRAY.take(dealer_state)[:, None]
+        dealer_bust = STATE_BUST_ARRAY.take(dealer_state)[:, None]
+
+        # Settlement in units of the initial bet
+        total = STATE_TOTAL_ARRAY.take(state)
+        settled = used & ~surrendered
+        wins = settled & ~player_bust & (dealer_bust | (total > dealer_total))
+        losses = settled & (player_bust | (~dealer_bust & (total < dealer_total)))
+        net = (stake * (wins.astype(np.int8) - losses.astype(np.int8))).sum(axis=1).astype(np.float64)
+        net -= 0.5 * surrendered[:, 0]  # Only an unsplit first hand can surrender
+
+        blackjack_payout = rules.get_blackjack_payout_multiplier()
+        # Dealer blackjack takes every stake except a player blackjack, which pushes
+        dealer_wins = -(stake * used).sum(axis=1)
+        net = np.where(dealer_blackjack, np.where(player_blackjack, 0.0, dealer_wins), net)
+        net = np.where(player_blackjack & ~dealer_blackjack, blackjack_payout, net)
+        return net
+
+    def _strategy_lookup(self, rows):
+        """The batch lookup for this pass's decisions on the given shoes, called like CompiledStrategy.lookup_batch()."""
+        return self.strategy.lookup_batch
+
+    def _decision_pass(self, hands, rows, up):
+        """Make one decision for every active hand on the given shoes, updating hands in place."""
+        rules = self.rules
+        slots = self.max_hands
+        state, split_card = hands['state'], hands['split_card']
+        stake, active, num_hands = hands['stake'], hands['active'], hands['num_hands']
+        split_aces = split_card == 1
+
+        # Split hands hold one card until their second card is dealt
+        needs_card = active & (STATE_CARD_COUNT_ARRAY.take(state) == 1)
+        if needs_card.any():
+            _add_cards(hands, self._draw_hands(rows, needs_card))
+            aces_pair = STATE_PAIR_VALUE_ARRAY.take(state) == 1
+            resplittable = aces_pair & rules.resplit_aces & (num_hands[:, None] < slots)
+            active &= ~(needs_card & split_aces & ~resplittable)
+
+        total = STATE_TOTAL_ARRAY.take(state)
+        active &= total < 21  # 21 stands automatically
+
+        pair_value = STATE_PAIR_VALUE_ARRAY.take(state)
+        pair = active & (pair_value > 0)
+        can_split = pair & (num_hands[:, None] < slots) & ~(split_aces & ~rules.resplit_aces)
+        can_double = (STATE_CAN_DOUBLE_ARRAY.take(state) & ~split_aces &
+                      ((split_card == 0) | rules.double_after_split))
+        can_surrender = (STATE_CAN_DOUBLE_ARRAY.take(state) & (num_hands[:, None] == 1) &
+                         rules.surrender_available)
+
+        lookup = self._strategy_lookup(rows)
+        action = lookup(state, up)
+        # A split that isn't allowed falls back to the chart for the hand total
+        action = np.where((action == Action.SPLIT) & ~can_split, lookup(state, up, ignore_pairs=True), action)
+        # So does a double or surrender that isn't allowed, e.g. 'Ds' stands and 'Rp' splits
+        restricted = (((action == Action.DOUBLE) & ~can_double) |
+                      ((action == Action.SURRENDER) & ~can_surrender))
+        if restricted.any():
+            fallback = np.where(can_split, lookup(state, up, allow_double=False),
+                                lookup(state, up, ignore_pairs=True, allow_double=False))
+            action = np.where(restricted, fallback, action)
+        action = np.where(split_aces & (action != Action.SPLIT), Action.STAND, action)
+
+        surrendering = active & (action == Action.SURRENDER)
+        if surrendering.any():
+            hands['surrendered'] |= surrendering
+            active &= ~surrendering
+
+        # Only the first splitting hand on each shoe splits this pass
+        splitting = active & (action == Action.SPLIT)
+        splitting &= np.cumsum(splitting, axis=1) == 1
+
+        hitting = active & ((action == Action.HIT) | (action == Action.DOUBLE))
+        if hitting.any():
+            _add_cards(hands, self._draw_hands(rows, hitting))
+        stake[hitting & (action == Action.DOUBLE)] = 2
+        active &= action != Action.STAND
+        active &= ~(hitting & (action == Action.DOUBLE))
+        active &= ~STATE_BUST_ARRAY.take(state)
+
+        if splitting.any():
+            lanes, old_slots = np.nonzero(splitting)
+            new_slots = num_hands[lanes]
+            card = pair_value[lanes, old_slots]
+            for slot_array in (old_slots, new_slots):
+                state[lanes, slot_array] = advance_states(EMPTY, card)
+                split_card[lanes, slot_array] = card
+                stake[lanes, slot_array] = 1
+                active[lanes, slot_array] = True
+            num_hands[lanes] += 1
+
+
+class HandPlayoutSimulator(VectorizedSimulator):
+    """Plays one hand out from its first action many times at once, from a known set of unseen cards.
+
+    Each row of a preallocated shoe buffer holds the next cards of an
+    independent shuffle of the composition. deal_shoes() refills it in place,
+    and play_action() replays the same deals for every first action, so the
+    differences between actions are much less noisy than the EVs themselves.
+    """
+
+    def __init__(self, composition, num_samples: int = 4096, rules: Optional[CasinoRules] = None,
+                 strategy=None, seed=None, depth: int = 40):
+        """
+        Args:
+            composition: Unseen cards by value, indexed 1 (ace) to 10; includes the dealer's hole card
+            num_samples: Deals per batch
+            rules: Casino rules
+            strategy: Strategy chart or CompiledStrategy for the decisions after the first (defaults to Basic)
+            seed: Seed for the random generator
+            depth: Cards dealt into each row; a round that needs more wraps to the row's start
+        """
+        # The shoe buffer stands in for VectorizedSimulator's full shuffled shoes
+        self.num_shoes = num_samples
+        self.rules = rules if rules is not None else CasinoRules()
+        self.rng = np.random.default_rng(seed)
+        if strategy is None:
+            strategy = COMPILED_STRATEGIES["Basic"]
+        self.strategy = strategy if isinstance(strategy, CompiledStrategy) else CompiledStrategy(strategy)
+        self.max_hands = 1
+
+        self._counts = np.array(composition[1:11], dtype=np.int64)
+        self._total = int(self._counts.sum())
+        self.num_cards = min(depth, self._total)
+        self.shoes = np.empty((num_samples, self.num_cards), dtype=np.int8)
+        self._remaining = np.empty((num_samples, 10), dtype=np.int64)
+        self.positions = np.zeros(num_samples, dtype=np.int64)
+        self.lanes = np.arange(num_samples)
+
+    def deal_shoes(self):
+        """Refill the shoe buffer, one column of cards at a time across every row, without replacement."""
+        remaining = self._remaining
+        remaining[:] = self._counts
+        for column in range(self.num_cards):
+            cumulative = np.cumsum(remaining, axis=1)
+            picks = self.rng.integers(0, self._total - column, size=self.num_shoes)
+            values = (cumulative <= picks[:, None]).sum(axis=1)
+            remaining[self.lanes, values] -= 1
+            self.shoes[:, column] = values + 1
+
+    def play_action(self, state: int, upcard: int, first_action: Action, resplits: Optional[int] = None,
+                    dealer_checked: bool = False):
+        """Play the hand out on every row of the buffer, taking first_action and then following the strategy.
+
+        Args:
+            state: The hand's hand_states index
+            upcard: Dealer upcard value (1 = ace ... 10)
+            first_action: Action taken first
+            resplits: Further splits allowed after splitting (defaults to the rules' limit less one)
+            dealer_checked: The dealer has peeked and has no blackjack, so those deals don't count
+
+        Returns:
+            (net, counted): net result per row in units of the hand's bet, and a mask of the rows that count
+        """
+        rules = self.rules
+        n = self.num_shoes
+        if resplits is None:
+            resplits = rules.max_splits - 1
+        self.max_hands = 2 + max(resplits, 0) if first_action == Action.SPLIT else 1
+        self.positions[:] = 0
+
+        hands = _new_hands(n, self.max_hands)
+        hands['state'][:, 0] = state
+        up = np.full(n, upcard, dtype=np.int16)
+        dealer_state = advance_states(advance_states(EMPTY, up), self._draw(self.lanes))
+        dealer_blackjack = STATE_BLACKJACK_ARRAY.take(dealer_state)
+        # A peeking dealer's blackjack ends the hand before the player acts
+        rows = np.flatnonzero(~dealer_blackjack) if rules.dealer_peeks_for_blackjack else self.lanes
+
+        if first_action == Action.SPLIT:
+            card = STATE_PAIR_VALUE_ARRAY[state]
+            hands['state'][rows, :2] = advance_states(EMPTY, card)
+            hands['split_card'][rows, :2] = card
+            hands['active'][rows, :2] = True
+            hands['num_hands'][rows] = 2
+        elif first_action in (Action.HIT, Action.DOUBLE):
+            hands['state'][rows, 0] = advance_states(hands['state'][rows, 0], self._draw(rows))
+            if first_action == Action.DOUBLE:
+                hands['stake'][rows, 0] = 2
+            else:
+                hands['active'][rows, 0] = ~STATE_BUST_ARRAY.take(hands['state'][rows, 0])
+        elif first_action == Action.SURRENDER:
+            hands['surrendered'][rows, 0] = True
+
+        net = self._play_out(hands, up, dealer_state, np.zeros(n, dtype=bool), dealer_blackjack)
+        if first_action == Action.SURRENDER and rules.surrender_type == "early":
+            net[:] = -0.5  # Given up before the dealer checks for blackjack
+        counted = ~dealer_blackjack if dealer_checked else np.ones(n, dtype=bool)
+        return net, counted
+
+
+def _new_hands(n, slots):
+    """Per-hand state: hand_states index, value of the split card (0 if not split), stake in bets."""
+    return {
+        'state': np.full((n, slots), EMPTY, dtype=np.int16),
+        'split_card': np.zeros((n, slots), dtype=np.int16),
+        'stake': np.ones((n, slots), dtype=np.int8),
+        'active': np.zeros((n, slots), dtype=bool),
+        'num_hands': np.ones(n, dtype=np.int16),
+        'surrendered': np.zeros((n, slots), dtype=bool),
+    }
+
+
+def _add_cards(hands, cards):
+    """Advance every hand by its dealt card (0 = no card leaves the state unchanged)."""
+    state = hands['state']
+    state[...] = advance_states(state, cards)
+
+
+def run_vectorized_simulation(num_rounds: int, num_shoes: int = 10000, num_decks: int = DEFAULT_NUM_DECKS,
+                              rules: Optional[CasinoRules] = None, default_bet: float = 10,
+                              strategy=BASIC_STRATEGY, seed=None,
+                              starting_balance: float = DEFAULT_SIM_BALANCE) -> SimulationResult:
+    """Estimate the EV of a playing strategy chart by playing num_rounds rounds across num_shoes shoes.
+
+    Every shoe plays the same number of rounds, so the total is rounded up to
+    a multiple of num_shoes. The result has one seat whose final balance is
+    starting_balance plus the total net; shoes play side by side, so the
+    balance isn't checked between rounds.
+    """
+    num_shoes = max(1, min(num_shoes, num_rounds))
+    simulator = VectorizedSimulator(num_shoes, num_decks, rules, strategy, seed=seed)
+    result = SimulationResult()
+    seat = Seat(0, starting_balance, default_bet, track_history=False)
+    result.seats = [seat]
+
+    start = time.perf_counter()
+    for _ in range(math.ceil(num_rounds / num_shoes)):
+        net = simulator.play_round() * default_bet
+        result.rounds += num_shoes
+        result.hands += num_shoes
+        result.total_net += float(net.sum())
+        result.total_net_sq += float((net * net).sum())
+        result.total_initial_bet += default_bet * num_shoes
+
+        session = result.session_stats
+        session.total_rounds += num_shoes
+        session.total_pl += float(net.sum())
+        session.winning_rounds += int((net > 0).sum())
+        session.losing_rounds += int((net < 0).sum())
+        session.push_rounds += int((net == 0).sum())
+    seat.balance += result.total_net
+    result.elapsed = time.perf_counter() - start
+    return result